@@ -2,7 +2,13 @@ import numpy as np
 import pandas as pd
 from scipy.stats import ttest_ind_from_stats
 
-def compute_group_summaries(dataframes, groups):
+from testbench_core.perf import timed
+from testbench_core.schemas import ELECTRICAL_STATS
+
+@timed()
+def compute_group_summaries(dataframes, groups, stats=None):
+    if stats is not None:
+        return _group_summaries_from_stats(groups, stats)
     order_params = sorted({p for df in dataframes for p in df["Order Parameter"].dropna()})
     group_ids = sorted(set(groups))
     group_summary = {g: {} for g in group_ids}
@@ -22,8 +28,9 @@ def compute_group_summaries(dataframes, groups):
     return order_params, group_ids, group_summary
 
 
-def compute_pvalue_tables(dataframes, groups, group_tags):
-    order_params, group_ids, group_summary = compute_group_summaries(dataframes, groups)
+@timed()
+def compute_pvalue_tables(dataframes, groups, group_tags, stats=None):
+    order_params, group_ids, group_summary = compute_group_summaries(dataframes, groups, stats)
     tables = {}
     if len(group_ids) < 2:
         return tables
@@ -53,7 +60,10 @@ def compute_pvalue_tables(dataframes, groups, group_tags):
 
 
 
-def compute_mean_tables(dataframes, groups, group_tags):
+@timed()
+def compute_mean_tables(dataframes, groups, group_tags, stats=None):
+    if stats is not None:
+        return _mean_tables_from_stats(groups, group_tags, stats)
     order_params, group_ids, _ = compute_group_summaries(dataframes, groups)
     mean_tables = {}
 
@@ -78,12 +88,15 @@ def compute_mean_tables(dataframes, groups, group_tags):
         mean_tables[f"Group {g}: {label}"] = pd.DataFrame(rows)
     return mean_tables
 
-def compute_group_cv_tables(dataframes, groups, group_tags):
+@timed()
+def compute_group_cv_tables(dataframes, groups, group_tags, stats=None):
     """
     Compute Group %CV directly from the input data, without using summaries.
     CV = (Population STD / Mean) * 100
     Works on Mean, Min, and Max columns for each Order Parameter.
     """
+    if stats is not None:
+        return _group_cv_tables_from_stats(groups, group_tags, stats)
 
     group_ids = sorted(set(groups))
     cv_tables = {}
@@ -129,13 +142,16 @@ def compute_group_cv_tables(dataframes, groups, group_tags):
 
     return cv_tables
 
-def compute_drift_first_last_tables(dataframes, groups, group_tags):
+@timed()
+def compute_drift_first_last_tables(dataframes, groups, group_tags, stats=None):
     """
     Computes % Drift (First–Last) for each statistic:
     Mean, %CV, Min, Max
     
     Drift = (last - first) / last * 100
     """
+    if stats is not None:
+        return _drift_tables_from_stats(groups, group_tags, stats, min_max=False)
 
     group_ids = sorted(set(groups))
     drift_tables = {}
@@ -180,13 +196,16 @@ def compute_drift_first_last_tables(dataframes, groups, group_tags):
 
     return drift_tables
 
-def compute_drift_min_max_tables(dataframes, groups, group_tags):
+@timed()
+def compute_drift_min_max_tables(dataframes, groups, group_tags, stats=None):
     """
     Computes % Drift (Min–Max) for each statistic:
     Mean, %CV, Min, Max
     
     Drift = (min_val - max_val) / max_val * 100
     """
+    if stats is not None:
+        return _drift_tables_from_stats(groups, group_tags, stats, min_max=True)
 
     group_ids = sorted(set(groups))
     drift_tables = {}
@@ -231,4 +250,89 @@ def compute_drift_min_max_tables(dataframes, groups, group_tags):
         label = next((t for i, t in enumerate(group_tags) if groups[i] == g), str(g))
         drift_tables[f"Group {g}: {label}"] = pd.DataFrame(rows)
 
-    return drift_tables
\ No newline at end of file
+    return drift_tables
+
+
+# ---------- the same tables from streaming accumulators ----------
+# `stats` is a testbench_core.streaming.GroupStats fed with
+# schemas.electrical_stat_rows for every frame, so each table costs the
+# same however many files are loaded (used by the folder watch).
+
+def _group_label(g, groups, group_tags):
+    return next((t for i, t in enumerate(group_tags) if groups[i] == g), str(g))
+
+
+def _group_summaries_from_stats(groups, stats):
+    order_params = sorted(stats.keys())
+    group_ids = sorted(set(groups))
+    group_summary = {}
+    for g in group_ids:
+        rs = stats[g]
+        group_summary[g] = {}
+        for param, row in zip(order_params, rs.get_mean(order_params)):
+            means = dict(zip(ELECTRICAL_STATS, row))
+            std_est = abs(means["Mean"] * (means["%CV"] / 100.0)) if not np.isnan(means["%CV"]) else np.nan
+            group_summary[g][param] = {**means, "n": rs.files, "std": std_est}
+    return order_params, group_ids, group_summary
+
+
+def _mean_tables_from_stats(groups, group_tags, stats):
+    order_params = sorted(stats.keys())
+    mean_tables = {}
+    for g in sorted(set(groups)):
+        rows = []
+        for param, row in zip(order_params, stats[g].get_mean(order_params)):
+            rows.append({"Order Parameter": param, **{col: float(v) for col, v in zip(ELECTRICAL_STATS, row)}})
+        mean_tables[f"Group {g}: {_group_label(g, groups, group_tags)}"] = pd.DataFrame(rows)
+    return mean_tables
+
+
+def _group_cv_tables_from_stats(groups, group_tags, stats):
+    order_params = sorted(stats.keys())
+    cols = ["Mean", "Min", "Max"]
+    idx = [ELECTRICAL_STATS.index(c) for c in cols]
+    cv_tables = {}
+    for g in sorted(set(groups)):
+        rs = stats[g]
+        counts = rs.count(order_params)
+        means = rs.get_mean(order_params)[:, idx]
+        stds = rs.get_std(order_params, ddof=0)[:, idx]
+        rows = []
+        for p, param in enumerate(order_params):
+            row = {"Order Parameter": param}
+            for c, col in enumerate(cols):
+                if counts[p] > 1:
+                    mean_val = means[p, c]
+                    cv = (stds[p, c] / mean_val) * 100 if mean_val != 0 else np.nan
+                else:
+                    cv = np.nan
+                row[f"{col} (Group %CV)"] = round(cv, 3) if not np.isnan(cv) else ""
+            rows.append(row)
+        cv_tables[f"Group {g}: {_group_label(g, groups, group_tags)}"] = pd.DataFrame(rows)
+    return cv_tables
+
+
+def _drift_tables_from_stats(groups, group_tags, stats, min_max):
+    order_params = sorted(stats.keys())
+    drift_tables = {}
+    for g in sorted(set(groups)):
+        rs = stats[g]
+        files = rs.file_count(order_params)
+        if min_max:
+            ends, base = rs.get_min(order_params), rs.get_max(order_params)
+        else:
+            ends, base = rs.get_first(order_params), rs.get_last(order_params)
+        rows = []
+        for p, param in enumerate(order_params):
+            row = {"Order Parameter": param}
+            for c, col in enumerate(ELECTRICAL_STATS):
+                drift = float("nan")
+                if files[p] >= 2:
+                    a, b = float(ends[p, c]), float(base[p, c])
+                    if b != 0:
+                        # (min - max) / max, or (last - first) / last
+                        drift = (a - b) / b * 100 if min_max else (b - a) / b * 100
+                row[col] = drift
+            rows.append(row)
+        drift_tables[f"Group {g}: {_group_label(g, groups, group_tags)}"] = pd.DataFrame(rows)
+    return drift_tables
@@ -1,14 +1,27 @@
+import time
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk, simpledialog
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import pandas as pd
 
-from file_io import load_data_folder, clear_all_data
+from file_io import load_data_folder, load_new_files, clear_all_data
 #from analysis import compute_pvalue_tables, compute_variance_tables, compute_mean_tables
-from analysis import compute_pvalue_tables, compute_mean_tables, compute_group_cv_tables, compute_drift_min_max_tables, compute_drift_first_last_tables
-from plotting import plot_parameter
-from config_utils import load_last_path, save_last_path
+from testbench_core.config import load_last_path, save_last_path
+from testbench_core.lazy import lazy_import
+from testbench_core import perf
+from testbench_core.perf_window import show_performance_window
+from testbench_core.loader import CACHE
+from testbench_core.memory import DatasetFrames
+from testbench_core.memory_window import show_memory_window
+from testbench_core.schemas import ELECTRICAL_COLUMNS, electrical_stat_rows
+from testbench_core.streaming import GroupStats
+from testbench_core.watch import FolderWatcher
+
+# Heavy modules (pandas / SciPy / pyplot) load on first use; main.py
+# preloads them in the background once the window is up.
+analysis = lazy_import("analysis")
+plotting = lazy_import("plotting")
+PRELOAD = ("pandas", "scipy.stats", "analysis", "plotting")
 
 
 class DataPlotApp:
@@ -19,8 +32,17 @@ class DataPlotApp:
 
         # Data containers
         self.current_path = tk.StringVar(value=load_last_path())
-        self.dataframes, self.file_names, self.groups = [], [], []
+        self.dataframes = DatasetFrames(keep=ELECTRICAL_COLUMNS)  # one data set per added folder
+        self.file_names, self.groups = [], []
         self.original_groups, self.group_tags, self.group_folders = [], [], []
+        # running per-group statistics by order parameter, kept in step with the frames
+        self.stats = GroupStats(electrical_stat_rows, 4)
+        # loaded folders, polled for new files while watching;
+        # folder -> [[row of the newest file, data set name], ...], one per time the folder was added
+        self.watcher = FolderWatcher()
+        self.watch_targets = {}
+        self.tables_popup = None
+        self.plotted_param = None   # redrawn when watched folders get new files
 
         self.create_widgets()
 
@@ -36,6 +58,11 @@ class DataPlotApp:
         data_frame.pack(fill="x", padx=10, pady=5)
         ttk.Button(data_frame, text="Add Data Set (Folder)", command=self.add_data_set).pack(side="left", padx=5)
         ttk.Button(data_frame, text="Clear All Data", command=self.clear_all_data_gui).pack(side="left", padx=5)
+        self.watching = tk.BooleanVar(value=False)
+        ttk.Checkbutton(data_frame, text="Watch Folders", variable=self.watching,
+                        command=self.toggle_watch).pack(side="left", padx=15)
+        self.watch_status = ttk.Label(data_frame, foreground="gray")
+        self.watch_status.pack(side="left", padx=5)
 
         table_frame = ttk.LabelFrame(self.root, text="Loaded Files / Groups")
         table_frame.pack(fill="both", expand=False, padx=15, pady=5)
@@ -64,9 +91,11 @@ class DataPlotApp:
         ttk.Button(param_frame, text="Plot Parameter", command=self.plot_parameter_gui).pack(side="left", padx=5)
         ttk.Button(param_frame, text="Reset Tags", command=self.reset_tags).pack(side="left", padx=15)
         ttk.Button(param_frame, text="Reset Group #s", command=self.reset_groups).pack(side="left", padx=5)
+        ttk.Button(param_frame, text="Performance", command=lambda: show_performance_window(self.root)).pack(side="right", padx=5)
+        ttk.Button(param_frame, text="Memory", command=self.show_memory).pack(side="right", padx=5)
 
-        self.figure = plt.Figure(figsize=(9, 4.5), dpi=100)
-        self.canvas = FigureCanvasTkAgg(self.figure, master=self.root)
+        self.figure = Figure(figsize=(9, 4.5), dpi=100)
+        self.canvas = perf.instrument_canvas(FigureCanvasTkAgg(self.figure, master=self.root))
         self.canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=(10, 10))
 
     # ---------- GUI actions ----------
@@ -77,10 +106,19 @@ class DataPlotApp:
             save_last_path(folder)
 
     def add_data_set(self):
-        result = load_data_folder(self.root, self.current_path.get(), len(set(self.groups)) + 1)
+        # lean data sets are converted copies, so the parsed files need not be cached as well
+        cache = None if self.dataframes.lean else CACHE
+        result = load_data_folder(self.root, self.current_path.get(), len(set(self.groups)) + 1, cache=cache,
+                                  watcher=self.watcher)
         if result:
-            dfs, fnames, groups, tags, folders = result
-            self.dataframes += dfs
+            dfs, fnames, groups, tags, folders, folder = result
+            if not dfs:
+                return
+            self.dataframes.add_dataset(f"{folders[0]} ({tags[0]})", dfs)
+            for df, g in zip(dfs, groups):
+                self.stats.add(df, g)
+            self.watch_targets.setdefault(folder, []).append([len(self.file_names) + len(dfs) - 1,
+                                                              f"{folders[0]} ({tags[0]})"])
             self.file_names += fnames
             self.groups += groups
             self.original_groups += groups
@@ -95,19 +133,33 @@ class DataPlotApp:
             self.tree.delete(r)
         self.param_combo["values"] = []
         self.selected_param.set("")
+        self.plotted_param = None
+        self._update_watch_status()
+
+    def show_memory(self):
+        show_memory_window(
+            self.root, self.dataframes,
+            labels=lambda: [f"{g}: {t}" for g, t in zip(self.groups, self.group_tags)],
+            figures=lambda: {"Parameter plot": self.figure},
+        )
 
     def update_parameters_from_dataframes(self):
-        params = set()
-        for df in self.dataframes:
-            params.update(df["Order Parameter"].dropna().tolist())
-        self.param_combo["values"] = sorted(params)
+        # every order parameter of every loaded file, as collected by the running statistics
+        self.param_combo["values"] = sorted(self.stats.keys())
 
+    @perf.timed()
     def populate_table(self):
         for r in self.tree.get_children():
             self.tree.delete(r)
         for fname, grp, tag, folder in zip(self.file_names, self.groups, self.group_tags, self.group_folders):
             self.tree.insert("", "end", values=(fname, grp, tag, folder))
 
+    def append_table_rows(self, start):
+        """Add rows for the files from index `start` on (the table already shows the earlier ones)."""
+        for i in range(start, len(self.file_names)):
+            self.tree.insert("", "end", values=(self.file_names[i], self.groups[i], self.group_tags[i],
+                                                self.group_folders[i]))
+
     def on_tree_double_click(self, event):
         region = self.tree.identify_region(event.x, event.y)
         if region != "cell":
@@ -130,6 +182,8 @@ class DataPlotApp:
                     self.groups[row_idx] = int(combo.get())
                 except Exception:
                     pass
+                else:
+                    self.stats.rebuild(self.dataframes, self.groups)
                 combo.destroy()
                 self.populate_table()
 
@@ -163,6 +217,7 @@ class DataPlotApp:
         if not self.original_groups:
             return
         self.groups = self.original_groups.copy()
+        self.stats.rebuild(self.dataframes, self.groups)
         self.populate_table()
 
     def plot_parameter_gui(self):
@@ -171,21 +226,96 @@ class DataPlotApp:
             messagebox.showwarning("No Selection", "Select an order parameter.")
             return
 
-        plot_parameter(self.figure, self.dataframes, self.groups, self.group_tags, param)
-        self.canvas.draw()
-        self.open_tables_popout()
+        with perf.action("Plot Parameter"):
+            plotting.plot_parameter(self.figure, self.dataframes, self.groups, self.group_tags, param)
+            self.canvas.draw()
+            self.plotted_param = param
+            self.open_tables_popout()
+            self.tables_popup.lift()
+
+    # ---------- folder watch ----------
+    def toggle_watch(self):
+        if self.watching.get():
+            self.watcher.start(self.root, self.add_new_files)
+        else:
+            self.watcher.stop()
+        self._update_watch_status()
+
+    def _update_watch_status(self, text=""):
+        if self.watching.get():
+            text = f"Watching {len(self.watcher.folders())} folder(s)" + (f"; {text}" if text else "")
+        self.watch_status.configure(text=text)
+
+    @perf.timed_action("Add New Files")
+    def add_new_files(self, ready):
+        """
+        Watcher callback: load the new files into the current group and tag
+        of their folder's newest file, then update the table and plot.
+        """
+        cache = None if self.dataframes.lean else CACHE
+        start = len(self.file_names)
+        added, failed = 0, 0
+        for folder, paths in ready.items():
+            loaded = load_new_files(folder, paths, cache=cache)
+            added += len(loaded)
+            failed += len(loaded.errors)
+            if not loaded.files:
+                continue
+            # a folder added more than once feeds every group it was added as
+            for target in self.watch_targets[folder]:
+                row, dataset = target
+                group, tag, name = self.groups[row], self.group_tags[row], self.group_folders[row]
+                original = self.original_groups[row]
+                self.dataframes.append_frames(dataset, [df for _f, df in loaded.files])
+                for fname, df in loaded.files:
+                    self.stats.add(df, group)
+                    self.file_names.append(fname)
+                    self.groups.append(group)
+                    self.original_groups.append(original)
+                    self.group_tags.append(tag)
+                    self.group_folders.append(name)
+                target[0] = len(self.file_names) - 1
+        note = f"{added} new file(s) at {time.strftime('%H:%M:%S')}"
+        if failed:
+            note += f", {failed} unreadable"
+        self._update_watch_status(note)
+        if added:
+            self.update_parameters_from_dataframes()
+            self.append_table_rows(start)
+            self.refresh_plots()
 
+    def refresh_plots(self):
+        """Redraw the parameter plot and the Analysis Tables if they are showing, without dialogs."""
+        if not self.plotted_param:
+            return
+        try:
+            plotting.plot_parameter(self.figure, self.dataframes, self.groups, self.group_tags, self.plotted_param)
+            self.canvas.draw()
+            if self.tables_popup is not None and self.tables_popup.winfo_exists():
+                self.open_tables_popout()
+        except Exception as e:
+            self._update_watch_status(f"plot not refreshed: {e}")
+
+    @perf.timed("Analysis Tables popup")
     def open_tables_popout(self):
-        p_tables = compute_pvalue_tables(self.dataframes, self.groups, self.group_tags)
-        m_tables = compute_mean_tables(self.dataframes, self.groups, self.group_tags)
-        cv_tables = compute_group_cv_tables(self.dataframes, self.groups, self.group_tags)
-        fl_drift_tables = compute_drift_first_last_tables(self.dataframes, self.groups, self.group_tags)
-        mm_drift_tables = compute_drift_min_max_tables(self.dataframes, self.groups, self.group_tags)      
+        p_tables = analysis.compute_pvalue_tables(self.dataframes, self.groups, self.group_tags, stats=self.stats)
+        m_tables = analysis.compute_mean_tables(self.dataframes, self.groups, self.group_tags, stats=self.stats)
+        cv_tables = analysis.compute_group_cv_tables(self.dataframes, self.groups, self.group_tags, stats=self.stats)
+        fl_drift_tables = analysis.compute_drift_first_last_tables(self.dataframes, self.groups, self.group_tags,
+                                                                   stats=self.stats)
+        mm_drift_tables = analysis.compute_drift_min_max_tables(self.dataframes, self.groups, self.group_tags,
+                                                                stats=self.stats)
         #diff_tables = compute_minmax_diff_tables(self.dataframes, self.groups, self.group_tags)
 
-        popup = tk.Toplevel(self.root)
-        popup.title("Analysis Tables")
-        popup.geometry("900x400")
+        # reuse the open tables window (its contents are rebuilt) instead of stacking another one
+        popup = self.tables_popup
+        if popup is not None and popup.winfo_exists():
+            for child in popup.winfo_children():
+                child.destroy()
+        else:
+            popup = self.tables_popup = tk.Toplevel(self.root)
+            popup.title("Analysis Tables")
+            popup.geometry("900x400")
 
         nb = ttk.Notebook(popup)
         nb.pack(fill="both", expand=True, padx=10, pady=10)
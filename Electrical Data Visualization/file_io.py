@@ -1,9 +1,12 @@
 import os
-import pandas as pd
 from tkinter import messagebox, simpledialog, filedialog
 
+from testbench_core import perf
+from testbench_core.loader import CACHE, list_csv_files, load_folder
+from testbench_core.schemas import ELECTRICAL_COLUMNS
 
-def load_data_folder(root, initial_path, next_group_id):
+
+def load_data_folder(root, initial_path, next_group_id, cache=CACHE, watcher=None):
     folder = filedialog.askdirectory(initialdir=initial_path, title="Select Data Set Folder")
     if not folder:
         return None
@@ -14,29 +17,39 @@ def load_data_folder(root, initial_path, next_group_id):
         tag = f"{next_group_id}"
 
     new_group_id = next_group_id
-    csv_files = [f for f in os.listdir(folder) if f.lower().endswith(".csv")]
+    csv_files = list_csv_files(folder)
     if not csv_files:
         messagebox.showwarning("No CSVs", f"No CSV files found in {folder}")
         return None
 
+    with perf.action("Add Data Set"):
+        loaded = load_folder(folder, ELECTRICAL_COLUMNS, paths=csv_files, cache=cache)
+    for fname, e in loaded.errors:
+        messagebox.showerror("Error", f"Failed to load {fname}\n\n{e}")
+    if watcher is not None and loaded.files:
+        watcher.watch(folder, known=[os.path.basename(p) for p in csv_files])
+
     dfs, fnames, groups, tags, folders = [], [], [], [], []
-    for fname in csv_files:
-        try:
-            df = pd.read_csv(os.path.join(folder, fname))
-            if set(["Order Parameter", "Mean", "%CV", "Min", "Max"]).issubset(df.columns):
-                dfs.append(df)
-                fnames.append(fname)
-                groups.append(new_group_id)
-                tags.append(tag)
-                folders.append(os.path.basename(folder))
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load {fname}\n\n{e}")
+    for fname, df in loaded.files:
+        dfs.append(df)
+        fnames.append(fname)
+        groups.append(new_group_id)
+        tags.append(tag)
+        folders.append(os.path.basename(folder))
+
+    return dfs, fnames, groups, tags, folders, folder
+
 
-    return dfs, fnames, groups, tags, folders
+def load_new_files(folder, paths, cache=CACHE):
+    """Read files that appeared in a watched folder; returns the FolderLoad (errors are not shown)."""
+    return load_folder(folder, ELECTRICAL_COLUMNS, paths=paths, cache=cache)
 
 
 def clear_all_data(app):
     app.dataframes.clear()
+    app.stats.clear()
+    app.watcher.clear()
+    app.watch_targets.clear()
     app.file_names.clear()
     app.groups.clear()
     app.original_groups.clear()
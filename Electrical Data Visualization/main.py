@@ -1,7 +1,18 @@
-from app_gui import DataPlotApp
+import os
+import sys
+
+# testbench_core (shared loaders and views) lives at the repository root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir)))
+
+from app_gui import DataPlotApp, PRELOAD
+from testbench_core import perf
+from testbench_core.lazy import preload
 import tkinter as tk
 
 if __name__ == "__main__":
     root = tk.Tk()
+    perf.attach_tk(root)  # actions include the redraws they schedule
     app = DataPlotApp(root)
+    # warm up the deferred imports once the window is on screen
+    root.after(100, preload, *PRELOAD)
     root.mainloop()
\ No newline at end of file
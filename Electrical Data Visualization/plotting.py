@@ -3,7 +3,10 @@ import matplotlib.pyplot as plt
 from itertools import cycle
 from tkinter import messagebox
 
+from testbench_core.perf import timed
 
+
+@timed()
 def plot_parameter(figure, dataframes, groups, group_tags, param):
     x_pts, means, cvs, mins, maxs, errors, tags = [], [], [], [], [], [], []
     for df, grp, tag in zip(dataframes, groups, group_tags):
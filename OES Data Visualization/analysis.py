@@ -3,11 +3,19 @@ import numpy as np
 from itertools import combinations
 from scipy.stats import ttest_ind_from_stats
 
-def calculate_group_means(dataframes, groups, wavelengths):
+from testbench_core.perf import timed
+
+# column of the normalized mean in schemas.oes_stat_rows
+NORMALIZED = 3
+
+@timed()
+def calculate_group_means(dataframes, groups, wavelengths, stats=None):
     """
     Returns a dictionary:
       group_id -> {wavelength -> {'mean': ..., 'std_dev': ..., 'cv_percent': ...}}
     """
+    if stats is not None:
+        return _group_means_from_stats(groups, wavelengths, stats)
     result = {}
     for g in sorted(set(groups)):
         group_dfs = [df for df, grp in zip(dataframes, groups) if grp == g]
@@ -33,11 +41,14 @@ def calculate_group_means(dataframes, groups, wavelengths):
                 result[g][wl] = {"mean": np.nan, "std_dev": np.nan, "cv_percent": np.nan}
     return result
 
-def calculate_group_cv(dataframes, groups, wavelengths):
+@timed()
+def calculate_group_cv(dataframes, groups, wavelengths, stats=None):
     """
     Returns a dictionary:
       group_id -> {wavelength -> CV% of mean values in the group}
     """
+    if stats is not None:
+        return _group_cv_from_stats(groups, wavelengths, stats, column=0)
     result = {}
     for g in sorted(set(groups)):
         group_dfs = [df for df, grp in zip(dataframes, groups) if grp == g]
@@ -54,12 +65,15 @@ def calculate_group_cv(dataframes, groups, wavelengths):
                 result[g][wl] = np.nan
     return result
 
-def calculate_group_cv_normalized(dataframes, groups, wavelengths):
+@timed()
+def calculate_group_cv_normalized(dataframes, groups, wavelengths, stats=None):
     """
     Normalizes each dataset by the sum of all its means across wavelengths, then computes CV%.
     Returns:
       group_id -> {wavelength -> CV%}
     """
+    if stats is not None:
+        return _group_cv_from_stats(groups, wavelengths, stats, column=NORMALIZED)
     result = {}
     for g in sorted(set(groups)):
         group_dfs = [df for df, grp in zip(dataframes, groups) if grp == g]
@@ -81,12 +95,15 @@ def calculate_group_cv_normalized(dataframes, groups, wavelengths):
                 result[g][wl] = np.nan
     return result
 
-def calculate_group_pvalues(dataframes, groups, wavelengths):
+@timed()
+def calculate_group_pvalues(dataframes, groups, wavelengths, stats=None):
     """
     Returns a nested dictionary:
       (group1, group2) -> {wavelength -> p-value}
     Uses t-test with means and std of normalized data.
     """
+    if stats is not None:
+        return _group_pvalues_from_stats(groups, wavelengths, stats, column=NORMALIZED)
     group_norm_means = {g: {} for g in sorted(set(groups))}
 
     # Precompute normalized means
@@ -118,12 +135,15 @@ def calculate_group_pvalues(dataframes, groups, wavelengths):
                 pvalues[(g1, g2)][wl] = p_val
     return pvalues
 
-def calculate_group_pvalues_raw(dataframes, groups, wavelengths):
+@timed()
+def calculate_group_pvalues_raw(dataframes, groups, wavelengths, stats=None):
     """
     Calculates p-values using raw mean values for each wavelength.
     Returns a nested dictionary:
       (group1, group2) -> {wavelength -> p-value}
     """
+    if stats is not None:
+        return _group_pvalues_from_stats(groups, wavelengths, stats, column=0)
     # Organize data per group
     group_means = {g: {} for g in sorted(set(groups))}
     for g in sorted(set(groups)):
@@ -149,6 +169,7 @@ def calculate_group_pvalues_raw(dataframes, groups, wavelengths):
                 pvalues[(g1,g2)][wl] = pv
     return pvalues
 
+@timed()
 def calculate_signal_to_noise(dataframes, groups, group_tags, peak_wavelengths):
     """
     For each requested peak_wavelength, compute average signal-to-noise ratio per group:
@@ -198,6 +219,7 @@ def calculate_signal_to_noise(dataframes, groups, group_tags, peak_wavelengths):
 
     return results
 
+@timed()
 def calculate_group_std_and_rsd_by_wavelength(dataframes, groups, dataset_tags, peak_wavelengths):
     """
     For each group and requested peak_wavelength, compute both:
@@ -277,6 +299,7 @@ def calculate_group_std_and_rsd_by_wavelength(dataframes, groups, dataset_tags,
 
     return results
 
+@timed()
 def calculate_group_drift_first_last(dataframes, groups, dataset_tags, peak_wavelengths):
     """
     For each group and requested peak_wavelength, compute the percent drift
@@ -341,6 +364,7 @@ def calculate_group_drift_first_last(dataframes, groups, dataset_tags, peak_wave
 
     return results
 
+@timed()
 def calculate_group_drift_min_max(dataframes, groups, dataset_tags, peak_wavelengths):
     """
     For each group and requested peak_wavelength, compute the percent drift
@@ -400,4 +424,49 @@ def calculate_group_drift_min_max(dataframes, groups, dataset_tags, peak_wavelen
 
         results[group_label] = group_result
 
-    return results
\ No newline at end of file
+    return results
+
+
+# ---------- the same results from streaming accumulators ----------
+# `stats` is a testbench_core.streaming.GroupStats fed with
+# schemas.oes_stat_rows (first row per wavelength) for every frame, so
+# these cost the same however many files are loaded (used by the folder
+# watch).
+
+def _group_means_from_stats(groups, wavelengths, stats):
+    result = {}
+    for g in sorted(set(groups)):
+        means = stats[g].get_mean(wavelengths)
+        result[g] = {wl: {"mean": row[0], "std_dev": row[1], "cv_percent": row[2]}
+                     for wl, row in zip(wavelengths, means)}
+    return result
+
+
+def _group_cv_from_stats(groups, wavelengths, stats, column):
+    result = {}
+    for g in sorted(set(groups)):
+        rs = stats[g]
+        means = rs.get_mean(wavelengths)[:, column]
+        stds = rs.get_std(wavelengths, ddof=1)[:, column]
+        result[g] = {wl: (std_val / mean_val) * 100 if mean_val != 0 else np.nan
+                     for wl, mean_val, std_val in zip(wavelengths, means, stds)}
+    return result
+
+
+def _group_pvalues_from_stats(groups, wavelengths, stats, column):
+    summary = {}
+    for g in sorted(set(groups)):
+        rs = stats[g]
+        summary[g] = (rs.get_mean(wavelengths)[:, column], rs.get_std(wavelengths, ddof=1)[:, column],
+                      rs.count(wavelengths))
+    pvalues = {}
+    for g1, g2 in combinations(sorted(set(groups)), 2):
+        (mean1, std1, n1), (mean2, std2, n2) = summary[g1], summary[g2]
+        pvalues[(g1, g2)] = {}
+        for i, wl in enumerate(wavelengths):
+            if n1[i] < 2 or n2[i] < 2:
+                pvalues[(g1, g2)][wl] = np.nan
+            else:
+                _, pv = ttest_ind_from_stats(mean1[i], std1[i], n1[i], mean2[i], std2[i], n2[i])
+                pvalues[(g1, g2)][wl] = pv
+    return pvalues
@@ -1,13 +1,24 @@
 import tkinter as tk
-from tkinter import filedialog, messagebox, ttk, simpledialog, Toplevel
+from tkinter import filedialog, messagebox, ttk, simpledialog
 import os
+import time
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib import colormaps
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from data_manager import load_last_path, save_last_path
+from testbench_core.config import load_last_path, save_last_path
 from data_manager import DataManager
-from plotter import plot_oes_data
-from analysis import calculate_group_means, calculate_group_cv, calculate_group_cv_normalized, calculate_group_pvalues_raw, calculate_signal_to_noise, calculate_group_std_and_rsd_by_wavelength, calculate_group_drift_first_last, calculate_group_drift_min_max
+from testbench_core.lazy import lazy_import
+from testbench_core import perf
+from testbench_core.perf_window import show_performance_window
+from testbench_core.memory_window import show_memory_window
+from testbench_core.figures import FigurePopup
+
+# Heavy modules (pandas / SciPy / pyplot) load on first use; main.py
+# preloads them in the background once the window is up.
+analysis = lazy_import("analysis")
+plotter = lazy_import("plotter")
+PRELOAD = ("pandas", "scipy.stats", "analysis", "plotter")
 # from itertools import combinations
 
 class DataPlotApp:
@@ -19,9 +30,12 @@ class DataPlotApp:
         self.current_path = tk.StringVar(value=load_last_path())
         self.data_mgr = DataManager()
 
-        # Matplotlib canvas holder (will be created when plotting)
+        # One figure / canvas, redrawn by every plot
         self.figure = None
         self.canvas = None
+        self.analysis_popup = None
+        self.plotted_wavelengths = None   # redrawn when watched folders get new files
+        self.norm_popup = FigurePopup(self.root, "Normalized Intensity vs Wavelength", "1000x700", figsize=(10, 6))
 
         self.create_widgets()
 
@@ -37,6 +51,11 @@ class DataPlotApp:
         data_frame.pack(fill="x", padx=10, pady=5)
         ttk.Button(data_frame, text="Add Data Set (Folder)", command=self.add_data_set).pack(side="left", padx=5)
         ttk.Button(data_frame, text="Clear All Data", command=self.clear_all_data).pack(side="left", padx=5)
+        self.watching = tk.BooleanVar(value=False)
+        ttk.Checkbutton(data_frame, text="Watch Folders", variable=self.watching,
+                        command=self.toggle_watch).pack(side="left", padx=15)
+        self.watch_status = ttk.Label(data_frame, foreground="gray")
+        self.watch_status.pack(side="left", padx=5)
 
         table_frame = ttk.LabelFrame(self.root, text="Loaded Files and Groups")
         table_frame.pack(fill="x", padx=15, pady=5)
@@ -66,11 +85,11 @@ class DataPlotApp:
         ttk.Button(control_frame, text="Reset Tags", command=self.reset_tags).pack(side="left", padx=10)
         ttk.Button(control_frame, text="Reset Groups", command=self.reset_groups).pack(side="left", padx=10)
         ttk.Button(control_frame, text="Plot Normalized Intensity", command=self.show_normalized_intensity_popup).pack(side="left", padx=10)
+        ttk.Button(control_frame, text="Performance", command=lambda: show_performance_window(self.root)).pack(side="right", padx=10)
+        ttk.Button(data_frame, text="Memory", command=self.show_memory).pack(side="right", padx=5)
 
-        # Placeholder figure initially
-        import matplotlib.pyplot as plt
-        self.figure = plt.Figure(figsize=(10, 8), dpi=100)
-        self.canvas = FigureCanvasTkAgg(self.figure, master=self.root)
+        self.figure = Figure(figsize=(10, 8), dpi=100)
+        self.canvas = perf.instrument_canvas(FigureCanvasTkAgg(self.figure, master=self.root))
         self.canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
 
     # ---------- Config and folder selection ----------
@@ -90,17 +109,79 @@ class DataPlotApp:
             tag = f"Group {len(set(self.data_mgr.groups)) + 1}"
         group_id = len(set(self.data_mgr.groups)) + 1
 
-        loaded = self.data_mgr.add_data_set_from_folder(folder, tag=tag, group_id=group_id)
+        with perf.action("Add Data Set"):
+            loaded = self.data_mgr.add_data_set_from_folder(folder, tag=tag, group_id=group_id)
         if loaded == 0:
             messagebox.showwarning("No CSVs", f"No CSV files found or valid in {folder}")
             return
         self.populate_table()
         # messagebox.showinfo("Loaded", f"Loaded {loaded} files from:\n{folder}")
 
+    def show_memory(self):
+        def figures():
+            figs = {"Main plot": self.figure}
+            if self.norm_popup.is_open():
+                figs["Normalized intensity"] = self.norm_popup.figure
+            return figs
+
+        show_memory_window(
+            self.root, self.data_mgr.dataframes,
+            labels=lambda: [f"{g}: {t}" for g, t in zip(self.data_mgr.groups, self.data_mgr.group_tags)],
+            figures=figures,
+        )
+
     def clear_all_data(self):
         self.data_mgr.clear_all()
+        self.plotted_wavelengths = None
         self.populate_table()
-
+        self._update_watch_status()
+
+    # ---------- Folder watch ----------
+    def toggle_watch(self):
+        if self.watching.get():
+            self.data_mgr.watcher.start(self.root, self.add_new_files)
+        else:
+            self.data_mgr.watcher.stop()
+        self._update_watch_status()
+
+    def _update_watch_status(self, text=""):
+        if self.watching.get():
+            folders = len(self.data_mgr.watcher.folders())
+            text = f"Watching {folders} folder(s)" + (f"; {text}" if text else "")
+        self.watch_status.configure(text=text)
+
+    @perf.timed_action("Add New Files")
+    def add_new_files(self, ready):
+        """Watcher callback: load the new files, then update the table and any open plot."""
+        start = len(self.data_mgr.file_names)
+        added, failed = 0, 0
+        for folder, paths in ready.items():
+            result = self.data_mgr.add_new_files(folder, paths)
+            added += len(result)
+            failed += len(result.errors)
+        note = f"{added} new file(s) at {time.strftime('%H:%M:%S')}"
+        if failed:
+            note += f", {failed} unreadable"
+        self._update_watch_status(note)
+        if added:
+            self.append_table_rows(start)
+            self.refresh_plots()
+
+    def refresh_plots(self):
+        """Redraw the plots that are showing, without dialogs (the watch calls this)."""
+        if self.plotted_wavelengths:
+            try:
+                plotter.plot_oes_data(self.data_mgr.dataframes, self.data_mgr.groups, self.data_mgr.group_tags,
+                                      self.plotted_wavelengths, figure=self.figure)
+                self.canvas.draw()
+                if self.analysis_popup is not None and self.analysis_popup.winfo_exists():
+                    self.show_analysis_popup(self.plotted_wavelengths)
+            except Exception as e:
+                self._update_watch_status(f"plot not refreshed: {e}")
+        if self.norm_popup.is_open():
+            self.show_normalized_intensity_popup(lift=False)
+
+    @perf.timed()
     def populate_table(self):
         for r in self.tree.get_children():
             self.tree.delete(r)
@@ -108,6 +189,13 @@ class DataPlotApp:
                                           self.data_mgr.group_tags, self.data_mgr.group_folders):
             self.tree.insert("", "end", values=(name, grp, tag, os.path.basename(folder)))
 
+    def append_table_rows(self, start):
+        """Add rows for the files from index `start` on (the table already shows the earlier ones)."""
+        dm = self.data_mgr
+        for i in range(start, len(dm.file_names)):
+            self.tree.insert("", "end", values=(dm.file_names[i], dm.groups[i], dm.group_tags[i],
+                                                os.path.basename(dm.group_folders[i])))
+
     def on_tree_double_click(self, event):
         region = self.tree.identify_region(event.x, event.y)
         if region != "cell":
@@ -148,6 +236,8 @@ class DataPlotApp:
             self.data_mgr.groups[row_i] = int(combo.get())
         except Exception:
             pass
+        else:
+            self.data_mgr.groups_changed()
         combo.destroy()
         self.populate_table()
 
@@ -160,6 +250,7 @@ class DataPlotApp:
         self.populate_table()
 
     # ---------- Plot ----------
+    @perf.timed_action("Plot Data")
     def plot_data(self):
         if not self.data_mgr.dataframes:
             messagebox.showwarning("No Data", "Add at least one dataset first.")
@@ -174,31 +265,27 @@ class DataPlotApp:
             return
 
         try:
-            main_fig = plot_oes_data(
+            plotter.plot_oes_data(
                 self.data_mgr.dataframes,
                 self.data_mgr.groups,
                 self.data_mgr.group_tags,
-                wavelengths
+                wavelengths,
+                figure=self.figure
             )
         except Exception as e:
+            self.figure.clear()
+            self.canvas.draw_idle()
+            self.plotted_wavelengths = None
             messagebox.showerror("Plot Error", f"Failed to create plot:\n{e}")
             return
-
-        # Replace main canvas with new figure
-        if self.canvas:
-            try:
-                self.canvas.get_tk_widget().pack_forget()
-            except Exception:
-                pass
-
-        self.figure = main_fig
-        self.canvas = FigureCanvasTkAgg(self.figure, master=self.root)
-        self.canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
         self.canvas.draw()
+        self.plotted_wavelengths = wavelengths
 
         # Show analysis popup
         self.show_analysis_popup(wavelengths)
+        self.analysis_popup.lift()
 
+    @perf.timed("Analysis popup")
     def show_analysis_popup(self, wavelengths):
         import numpy as np
         from tkinter import Toplevel, ttk
@@ -219,16 +306,14 @@ class DataPlotApp:
             elif v <= 10: return "#ffd699"
             else: return "#ff9999"
 
-        # Close existing popup
-        if hasattr(self, 'analysis_popup') and self.analysis_popup:
-            try:
-                self.analysis_popup.destroy()
-            except Exception:
-                pass
-
-        self.analysis_popup = Toplevel(self.root)
-        self.analysis_popup.title("Data Analysis")
-        self.analysis_popup.geometry("1200x800")
+        # Reuse the open popup (its tables are rebuilt) so refreshes do not stack windows
+        if self.analysis_popup is not None and self.analysis_popup.winfo_exists():
+            for child in self.analysis_popup.winfo_children():
+                child.destroy()
+        else:
+            self.analysis_popup = Toplevel(self.root)
+            self.analysis_popup.title("Data Analysis")
+            self.analysis_popup.geometry("1200x800")
 
         main_notebook = ttk.Notebook(self.analysis_popup)
         main_notebook.pack(fill="both", expand=True)
@@ -303,7 +388,8 @@ class DataPlotApp:
                 tab.grid_columnconfigure(len(headers)-1, weight=1)
 
         # ---------- 1. Mean Tab (no color) ----------
-        group_means = calculate_group_means(self.data_mgr.dataframes, self.data_mgr.groups, wavelengths)
+        group_means = analysis.calculate_group_means(self.data_mgr.dataframes, self.data_mgr.groups, wavelengths,
+                                                     stats=self.data_mgr.stats)
         mean_tables = {}
         mean_headers = {}
         for g, data in group_means.items():
@@ -317,8 +403,10 @@ class DataPlotApp:
         add_label_table(main_notebook, mean_tables, "Mean", headers_override=mean_headers, cell_color_callback=None)
 
         # ---------- 2. Group %CV Tab ----------
-        group_cv_raw = calculate_group_cv(self.data_mgr.dataframes, self.data_mgr.groups, wavelengths)
-        group_cv_norm = calculate_group_cv_normalized(self.data_mgr.dataframes, self.data_mgr.groups, wavelengths)
+        group_cv_raw = analysis.calculate_group_cv(self.data_mgr.dataframes, self.data_mgr.groups, wavelengths,
+                                                   stats=self.data_mgr.stats)
+        group_cv_norm = analysis.calculate_group_cv_normalized(self.data_mgr.dataframes, self.data_mgr.groups, wavelengths,
+                                                               stats=self.data_mgr.stats)
         cv_tables = {}
         cv_headers = {}
         for g in sorted(set(self.data_mgr.groups)):
@@ -340,7 +428,8 @@ class DataPlotApp:
         add_label_table(main_notebook, cv_tables, "Group %CV", headers_override=cv_headers, cell_color_callback=cv_cell_color)
 
         # ---------- 3. P-Values Tab (Raw) ----------
-        pvalues_raw = calculate_group_pvalues_raw(self.data_mgr.dataframes, self.data_mgr.groups, wavelengths)
+        pvalues_raw = analysis.calculate_group_pvalues_raw(self.data_mgr.dataframes, self.data_mgr.groups, wavelengths,
+                                                           stats=self.data_mgr.stats)
         pval_tables = {}
         pval_headers = {}
         for (g1, g2), vals in pvalues_raw.items():
@@ -370,7 +459,7 @@ class DataPlotApp:
         # ---------- Group (STD) Tab ----------
         peak_wavelengths = [float(w.strip()) for w in self.wavelength_entry.get().split(",") if w.strip()]
 
-        group_std_rsd_results = calculate_group_std_and_rsd_by_wavelength(
+        group_std_rsd_results = analysis.calculate_group_std_and_rsd_by_wavelength(
             self.data_mgr.dataframes,
             self.data_mgr.groups,
             self.data_mgr.group_tags,
@@ -400,7 +489,7 @@ class DataPlotApp:
             )
 
         # ---------- Signal to Noise Ratio Tab ----------
-        snr_info = calculate_signal_to_noise(
+        snr_info = analysis.calculate_signal_to_noise(
             self.data_mgr.dataframes,
             self.data_mgr.groups,
             self.data_mgr.group_tags,
@@ -432,14 +521,14 @@ class DataPlotApp:
         peak_wavelengths = [float(w.strip()) for w in self.wavelength_entry.get().split(",") if w.strip()]
 
         # Calculate both drift types
-        drift_first_last = calculate_group_drift_first_last(
+        drift_first_last = analysis.calculate_group_drift_first_last(
             self.data_mgr.dataframes,
             self.data_mgr.groups,
             self.data_mgr.group_tags,
             peak_wavelengths
         )
 
-        drift_min_max = calculate_group_drift_min_max(
+        drift_min_max = analysis.calculate_group_drift_min_max(
             self.data_mgr.dataframes,
             self.data_mgr.groups,
             self.data_mgr.group_tags,
@@ -484,48 +573,29 @@ class DataPlotApp:
                 cell_color_callback=None
             )
 
-    def show_normalized_intensity_popup(self):
+    @perf.timed_action("Plot Normalized Intensity")
+    def show_normalized_intensity_popup(self, lift=True):
         if not self.data_mgr.dataframes:
             messagebox.showwarning("No Data", "Add at least one dataset first.")
             return
 
-        # Close existing popup if present
-        if hasattr(self, 'norm_intensity_popup') and self.norm_intensity_popup:
-            try:
-                self.norm_intensity_popup.destroy()
-            except Exception:
-                pass
-
-        self.norm_intensity_popup = Toplevel(self.root)
-        self.norm_intensity_popup.title("Normalized Intensity vs Wavelength")
-        self.norm_intensity_popup.geometry("1000x700")
-
-        # Prepare figure
-        fig = plt.Figure(figsize=(10, 6), dpi=100)
+        # Reuse the popup (and its canvas) if it is already open
+        fig = self.norm_popup.show(lift=lift)
         ax = fig.add_subplot(111)
 
         # Get all unique groups
         groups = sorted(set(self.data_mgr.groups))
-        colors = plt.cm.tab10.colors
+        colors = colormaps["tab10"].colors
 
         for i, g in enumerate(groups):
-            # Get indices of dataframes in this group
-            idxs = [j for j, grp in enumerate(self.data_mgr.groups) if grp == g]
             tag = next((t for j, t in enumerate(self.data_mgr.group_tags) if self.data_mgr.groups[j] == g),
                     f"Group {g}")
 
-            # Combine the dataframes for this group
-            group_dfs = [self.data_mgr.dataframes[j] for j in idxs]
-            # Merge mean values by wavelength index
-            wl_values = sorted(set(np.concatenate([df['wavelength_index'].values for df in group_dfs])))
-            mean_vals = []
-            for wl in wl_values:
-                vals = [df.loc[df['wavelength_index'] == wl, 'mean'].values[0]
-                        for df in group_dfs if wl in df['wavelength_index'].values]
-                if vals:
-                    mean_vals.append(np.mean(vals))
-                else:
-                    mean_vals.append(np.nan)
+            # Mean of each wavelength's value over the group's files, from the running statistics
+            with perf.span("group mean spectrum"):
+                stats = self.data_mgr.stats[g]
+                wl_values = sorted(stats.keys())
+                mean_vals = stats.get_mean(wl_values)[:, 0]
 
             # Normalize by total sum of mean values
             mean_vals = np.array(mean_vals)
@@ -552,7 +622,4 @@ class DataPlotApp:
         ax.grid(True)
         fig.tight_layout()
 
-        # Add canvas to popup
-        canvas = FigureCanvasTkAgg(fig, master=self.norm_intensity_popup)
-        canvas.get_tk_widget().pack(fill="both", expand=True)
-        canvas.draw()
+        self.norm_popup.draw()
@@ -1,23 +1,10 @@
-import pandas as pd
-import os, json
+import os
 
-CONFIG_FILE = "settings.json"
-
-def load_last_path():
-    if os.path.exists(CONFIG_FILE):
-        try:
-            with open(CONFIG_FILE, "r") as f:
-                return json.load(f).get("last_path", os.getcwd())
-        except Exception:
-            pass
-    return os.getcwd()
-
-def save_last_path(path):
-    try:
-        with open(CONFIG_FILE, "w") as f:
-            json.dump({"last_path": path}, f)
-    except Exception:
-        pass
+from testbench_core.loader import CACHE, load_folder
+from testbench_core.memory import DatasetFrames
+from testbench_core.schemas import OES_COLUMNS, clean_oes_frame, has_columns, oes_stat_rows
+from testbench_core.streaming import GroupStats
+from testbench_core.watch import FolderWatcher
 
 class DataManager:
     """
@@ -25,19 +12,32 @@ class DataManager:
     """
 
     def __init__(self):
-        self.dataframes = []      # list of pd.DataFrame
+        self.dataframes = DatasetFrames(keep=OES_COLUMNS)  # pd.DataFrames, one data set per folder
         self.file_names = []      # parallel list of filenames
         self.groups = []          # integer group id per dataframe
         self.group_tags = []      # human-friendly tag per group (parallel to dataframes)
         self.group_folders = []   # folder each dataframe came from
         self.original_groups = []
         self.original_tags = []
+        # running per-group statistics by wavelength, kept in step with the frames
+        self.stats = GroupStats(oes_stat_rows, 4, duplicates=False)
+        # loaded folders, polled for new files while watching;
+        # folder -> [[row of the newest file, data set name], ...], one per time the folder was added
+        self.watcher = FolderWatcher()
+        self.watch_targets = {}
 
     def clear_all(self):
-        self.__init__()
+        # keep the same DatasetFrames so lean mode and the memory budget carry over
+        self.dataframes.clear()
+        self.stats.clear()
+        self.watcher.clear()
+        self.watch_targets.clear()
+        for values in (self.file_names, self.groups, self.group_tags, self.group_folders,
+                       self.original_groups, self.original_tags):
+            values.clear()
 
     def _valid_df(self, df):
-        return {"wavelength_index", "mean", "std_dev", "cv_percent"}.issubset(df.columns)
+        return has_columns(df.columns, OES_COLUMNS)
 
     def add_data_set_from_folder(self, folder, tag=None, group_id=None):
         """
@@ -47,32 +47,72 @@ class DataManager:
         loaded = 0
         if group_id is None:
             group_id = len(set(self.groups)) + 1
-        csv_files = [f for f in os.listdir(folder) if f.lower().endswith('.csv')]
-        for f in csv_files:
-            path = os.path.join(folder, f)
-            try:
-                df = pd.read_csv(path)
-                if self._valid_df(df):
-                    df['wavelength_index'] = pd.to_numeric(df['wavelength_index'], errors='coerce')
-                    df = df.dropna(subset=['wavelength_index']).copy()
-                    self.dataframes.append(df)
-                    self.file_names.append(f)
-                    self.groups.append(group_id)
-                    self.group_tags.append(tag if tag is not None else f"Group {group_id}")
-                    self.group_folders.append(folder)
-                    loaded += 1
-            except Exception:
-                # caller (GUI) should show error messages to user if necessary
-                continue
+        if tag is None:
+            tag = f"Group {group_id}"
+        # lean data sets are converted copies, so the parsed files need not be cached as well
+        cache = None if self.dataframes.lean else CACHE
+        # unreadable files are skipped; the caller (GUI) reports an empty load
+        result = load_folder(folder, OES_COLUMNS, clean=clean_oes_frame, cache=cache)
+        files = result.files
+        if files:
+            self.dataframes.add_dataset(self._dataset_name(folder, tag), [df for _f, df in files])
+            self.watch_targets.setdefault(folder, []).append([len(self.file_names) + len(files) - 1,
+                                                              self._dataset_name(folder, tag)])
+            self.watcher.watch(folder, known=[f for f, _df in files] + result.skipped
+                               + [f for f, _e in result.errors])
+        for f, df in files:
+            self.stats.add(df, group_id)
+            self.file_names.append(f)
+            self.groups.append(group_id)
+            self.group_tags.append(tag)
+            self.group_folders.append(folder)
+            loaded += 1
         if loaded > 0:
             self.original_groups.extend([group_id] * loaded)
-            self.original_tags.extend([tag if tag is not None else f"Group {group_id}"] * loaded)
+            self.original_tags.extend([tag] * loaded)
         return loaded
 
+    def add_new_files(self, folder, paths):
+        """
+        Load files that appeared in an already loaded `folder` (see
+        FolderWatcher) into the current group and tag of the folder's
+        newest file, so regrouping and retagging carry over; a folder added
+        more than once feeds every one of its groups. Returns the
+        FolderLoad; only the new files are read, once.
+        """
+        cache = None if self.dataframes.lean else CACHE
+        result = load_folder(folder, OES_COLUMNS, clean=clean_oes_frame, cache=cache, paths=paths)
+        if not result.files:
+            return result
+        for target in self.watch_targets[folder]:
+            row, name = target
+            group_id, tag = self.groups[row], self.group_tags[row]
+            original = self.original_groups[row], self.original_tags[row]
+            self.dataframes.append_frames(name, [df for _f, df in result.files])
+            for f, df in result.files:
+                self.stats.add(df, group_id)
+                self.file_names.append(f)
+                self.groups.append(group_id)
+                self.group_tags.append(tag)
+                self.group_folders.append(folder)
+                self.original_groups.append(original[0])
+                self.original_tags.append(original[1])
+            target[0] = len(self.file_names) - 1
+        return result
+
+    def groups_changed(self):
+        """Call after files move between groups: the running statistics are rebuilt."""
+        self.stats.rebuild(self.dataframes, self.groups)
+
     def reset_tags(self):
         self.group_tags = [f"Group {g}" for g in self.groups]
 
     def reset_groups(self):
         if self.original_groups:
             self.groups = self.original_groups.copy()
-            self.group_tags = self.original_tags.copy()
\ No newline at end of file
+            self.group_tags = self.original_tags.copy()
+            self.groups_changed()
+
+    @staticmethod
+    def _dataset_name(folder, tag):
+        return f"{os.path.basename(folder)} ({tag})"
\ No newline at end of file
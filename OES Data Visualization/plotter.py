@@ -3,7 +3,11 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
 
-def plot_oes_data(dataframes, groups, group_tags, wavelengths):
+from testbench_core.perf import timed
+
+@timed()
+def plot_oes_data(dataframes, groups, group_tags, wavelengths, figure=None):
+    """Intensity and CV% at `wavelengths`, drawn into `figure` (cleared first) or a new figure."""
     if not dataframes:
         raise ValueError("No dataframes provided")
 
@@ -20,7 +24,11 @@ def plot_oes_data(dataframes, groups, group_tags, wavelengths):
     jitter = 0.05
 
     # ---- Main figure (OES intensity + CV%)
-    main_fig = Figure(figsize=(10, 8), dpi=100)
+    if figure is None:
+        main_fig = Figure(figsize=(10, 8), dpi=100)
+    else:
+        main_fig = figure
+        main_fig.clear()
     ax1, ax2 = main_fig.subplots(1, 2)
 
     plotted_tags = set()
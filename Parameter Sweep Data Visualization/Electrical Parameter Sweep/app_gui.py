@@ -1,11 +1,20 @@
 import tkinter as tk
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from tkinter import messagebox, filedialog, ttk
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import pandas as pd
 import numpy as np
-from scipy.stats import ttest_ind_from_stats
-from file_io import load_last_path, load_data_folder_auto, save_last_path, clear_all_data
+from file_io import load_data_folder_auto, clear_all_data
+from testbench_core.config import load_last_path, save_last_path
+from testbench_core.heatmap_view import HeatmapView
+from testbench_core.lazy import lazy_import
+from testbench_core import perf
+from testbench_core.perf_window import show_performance_window
+
+# pandas and SciPy load on first use; main.py preloads them in the
+# background once the window is up.
+pd = lazy_import("pandas")
+stats = lazy_import("scipy.stats")
+PRELOAD = ("pandas", "scipy.stats")
 
 class DataPlotApp:
     def __init__(self, root):
@@ -95,10 +104,12 @@ class DataPlotApp:
 
         ttk.Button(param_frame, text="Plot Heatmap", command=self.plot_heatmap_gui).pack(side="left", padx=12)
         ttk.Button(param_frame, text="Plot P-Values", command=self.plot_pvalue_gui).pack(side="left", padx=6)
+        ttk.Button(param_frame, text="Performance", command=lambda: show_performance_window(self.root)).pack(side="right", padx=6)
 
-        self.figure = plt.Figure(figsize=(10, 5), dpi=100)
-        self.canvas = FigureCanvasTkAgg(self.figure, master=self.root)
+        self.figure = Figure(figsize=(10, 5), dpi=100)
+        self.canvas = perf.instrument_canvas(FigureCanvasTkAgg(self.figure, master=self.root))
         self.canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=(10,10))
+        self.heatmap_view = HeatmapView(self.figure, self.canvas)
 
     # ---------- GUI Actions ----------
     def select_folder(self):
@@ -145,9 +156,10 @@ class DataPlotApp:
         self.param_combo["values"] = []
         self.selected_param.set("")
         self.update_folder_combo()
-        self.figure.clf()
+        self.heatmap_view.reset()
         self.canvas.draw()
 
+    @perf.timed()
     def update_parameters_from_dataframes(self):
         params = set()
         for df in self.dataframes:
@@ -172,6 +184,7 @@ class DataPlotApp:
             if self.compare_selection.get() not in options:
                 self.compare_selection.set(options[0])
 
+    @perf.timed()
     def populate_table(self):
         for r in self.tree.get_children():
             self.tree.delete(r)
@@ -189,6 +202,7 @@ class DataPlotApp:
             return (1,str(s))
 
     # ---------- Heatmap ----------
+    @perf.timed()
     def build_heatmap_dataframe(self, order_param, stat_column, folder_filter=None):
         if not self.dataframes:
             return None
@@ -222,6 +236,7 @@ class DataPlotApp:
             heat_df.at[p,f] = float(np.mean(numeric_vals)) if numeric_vals else np.nan
         return heat_df
 
+    @perf.timed_action("Plot Heatmap")
     def plot_heatmap_gui(self):
         order_param = self.selected_param.get()
         stat_col = self.selected_stat.get()
@@ -235,25 +250,15 @@ class DataPlotApp:
             messagebox.showwarning("No data", f"No files found for folder '{folder}'.")
             return
 
-        self.figure.clf()
-        ax = self.figure.add_subplot(111)
-        data = heat_df.values.astype(float)
-        cmap = plt.get_cmap("cividis").copy()
-        cmap.set_bad(color='white')
-        im = ax.imshow(data, interpolation='nearest', aspect='auto', cmap=cmap)
-        ax.set_yticks(np.arange(len(heat_df.index)))
-        ax.set_yticklabels([str(x) for x in heat_df.index])
-        ax.set_xticks(np.arange(len(heat_df.columns)))
-        ax.set_xticklabels([str(x) for x in heat_df.columns], rotation=45, ha="right")
-        ax.invert_yaxis()   # ← FIXES Y-AXIS ORDER
-        ax.set_xlabel("Frequency")
-        ax.set_ylabel("Power")
-        ax.set_title(f"{order_param} — {stat_col} (Power vs Frequency)")
-        cbar = self.figure.colorbar(im, ax=ax)
-        cbar.set_label(stat_col)
-        self.canvas.draw()
+        self.heatmap_view.show(
+            heat_df.values.astype(float), heat_df.index, heat_df.columns,
+            cmap="cividis", bad_color="white", xtick_rotation=45,
+            title=f"{order_param} — {stat_col} (Power vs Frequency)",
+            cbar_label=stat_col,
+        )
 
     # ---------- P-Value Calculation ----------
+    @perf.timed()
     def calculate_pvalue_dataframe(self, order_param, stat_col, folderA, folderB):
         # Filter indices by folder
         idxA = [i for i,f in enumerate(self.group_folders) if f==folderA]
@@ -294,8 +299,8 @@ class DataPlotApp:
                         # ttest using means, std
                         meanA, stdA, nA = np.mean(valsA), np.std(valsA, ddof=1), len(valsA)
                         meanB, stdB, nB = np.mean(valsB), np.std(valsB, ddof=1), len(valsB)
-                        t_stat, p_value = ttest_ind_from_stats(mean1=meanA, std1=stdA, nobs1=nA,
-                                                              mean2=meanB, std2=stdB, nobs2=nB, equal_var=False)
+                        t_stat, p_value = stats.ttest_ind_from_stats(mean1=meanA, std1=stdA, nobs1=nA,
+                                                                    mean2=meanB, std2=stdB, nobs2=nB, equal_var=False)
                         pval_df.at[p,f] = p_value
                     else:
                         pval_df.at[p,f] = np.nan
@@ -303,6 +308,7 @@ class DataPlotApp:
                     pval_df.at[p,f] = np.nan
         return pval_df
 
+    @perf.timed_action("Plot P-Values")
     def plot_pvalue_gui(self):
         order_param = self.selected_param.get()
         stat_col = self.selected_stat.get()
@@ -320,20 +326,9 @@ class DataPlotApp:
             messagebox.showwarning("No data", f"No matching data between {folderA} and {folderB}.")
             return
 
-        self.figure.clf()
-        ax = self.figure.add_subplot(111)
-        data = pval_df.values.astype(float)
-        cmap = plt.get_cmap("plasma_r").copy()
-        cmap.set_bad(color='white')
-        im = ax.imshow(data, interpolation='nearest', aspect='auto', cmap=cmap, vmin=0, vmax=0.05)
-        ax.set_yticks(np.arange(len(pval_df.index)))
-        ax.set_yticklabels([str(x) for x in pval_df.index])
-        ax.set_xticks(np.arange(len(pval_df.columns)))
-        ax.set_xticklabels([str(x) for x in pval_df.columns], rotation=45, ha="right")
-        ax.invert_yaxis()   # ← FIX HERE TOO
-        ax.set_xlabel("Frequency")
-        ax.set_ylabel("Power")
-        ax.set_title(f"P-Values — {order_param} ({stat_col}) — {folderA} vs {folderB}")
-        cbar = self.figure.colorbar(im, ax=ax)
-        cbar.set_label("P-Value")
-        self.canvas.draw()
\ No newline at end of file
+        self.heatmap_view.show(
+            pval_df.values.astype(float), pval_df.index, pval_df.columns,
+            cmap="plasma_r", vmin=0, vmax=0.05, bad_color="white", xtick_rotation=45,
+            title=f"P-Values — {order_param} ({stat_col}) — {folderA} vs {folderB}",
+            cbar_label="P-Value",
+        )
\ No newline at end of file
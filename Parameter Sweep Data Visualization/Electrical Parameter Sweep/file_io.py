@@ -1,39 +1,10 @@
-import os, json, re
-import pandas as pd
+import os
 from tkinter import messagebox, simpledialog, filedialog
 
-CONFIG_FILE = "settings.json"
-
-def load_last_path():
-    if os.path.exists(CONFIG_FILE):
-        try:
-            with open(CONFIG_FILE, "r") as f:
-                return json.load(f).get("last_path", os.getcwd())
-        except Exception:
-            pass
-    return os.getcwd()
-
-def save_last_path(path):
-    try:
-        with open(CONFIG_FILE, "w") as f:
-            json.dump({"last_path": path}, f)
-    except Exception:
-        pass
-
-def parse_power_freq_from_filename(fname):
-    """
-    Parse filename for numeric tokens -> return (power_str, freq_str)
-    Example: 20251015_125714-Al_Spot-3min-T1-2000-18-2.5.tdms_summary.csv
-             -> ("2000", "18")
-    Heuristic: use numeric tokens; prefer tokens[-3], tokens[-2] for power/freq.
-    """
-    tokens = re.findall(r'\d+(?:\.\d+)?', fname)
-    if len(tokens) >= 3:
-        return tokens[-3], tokens[-2]
-    elif len(tokens) >= 2:
-        return tokens[-2], tokens[-1]
-    else:
-        return None, None
+from testbench_core import perf
+from testbench_core.filenames import parse_power_freq_from_filename
+from testbench_core.loader import list_csv_files, load_folder
+from testbench_core.schemas import ELECTRICAL_COLUMNS
 
 def load_data_folder_auto(initial_path):
     """Load CSV files automatically; no dialogs or tag prompts."""
@@ -41,32 +12,30 @@ def load_data_folder_auto(initial_path):
     if not folder:
         return None
 
-    csv_files = [f for f in os.listdir(folder) if f.lower().endswith(".csv")]
+    csv_files = list_csv_files(folder)
     if not csv_files:
         messagebox.showwarning("No CSVs", f"No CSV files found in {folder}")
         return None
 
+    with perf.action("Add Data Set"):
+        loaded = load_folder(folder, ELECTRICAL_COLUMNS, paths=csv_files)
+    for fname in loaded.skipped:
+        messagebox.showwarning("Skipped", f"{fname} missing required columns — skipped.")
+    for fname, e in loaded.errors:
+        messagebox.showerror("Error", f"Failed to load {fname}\n\n{e}")
+
     dfs, fnames = [], []
     powers, freqs = [], []
     tags, folders = [], []
-    for fname in csv_files:
-        fullpath = os.path.join(folder, fname)
-        try:
-            df = pd.read_csv(fullpath)
-            # expected columns in your reference
-            if set(["Order Parameter", "Mean", "%CV", "Min", "Max"]).issubset(df.columns):
-                p, f = parse_power_freq_from_filename(fname)
-                tag = f"P{p}_F{f}" if (p and f) else "Unknown"
-                dfs.append(df)
-                fnames.append(fname)
-                powers.append(p)
-                freqs.append(f)
-                tags.append(tag)
-                folders.append(os.path.basename(folder))
-            else:
-                messagebox.showwarning("Skipped", f"{fname} missing required columns — skipped.")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load {fname}\n\n{e}")
+    for fname, df in loaded.files:
+        p, f = parse_power_freq_from_filename(fname)
+        tag = f"P{p}_F{f}" if (p and f) else "Unknown"
+        dfs.append(df)
+        fnames.append(fname)
+        powers.append(p)
+        freqs.append(f)
+        tags.append(tag)
+        folders.append(os.path.basename(folder))
 
     return dfs, fnames, powers, freqs, tags, folders
 
@@ -0,0 +1,136 @@
+import csv
+import heapq
+import json
+import os
+
+import numpy as np
+
+
+def as_intervals(starts, ends):
+    """Float arrays of (start, end) with each pair ordered start <= end."""
+    starts = np.asarray(starts, dtype=float).ravel()
+    ends = np.asarray(ends, dtype=float).ravel()
+    return np.minimum(starts, ends), np.maximum(starts, ends)
+
+
+def coverage(starts, ends):
+    """
+    Coverage depth of a set of closed intervals.
+    Returns (edges, depth): depth[i] is how many intervals cover the segment
+    [edges[i], edges[i + 1]], so len(depth) == len(edges) - 1.
+    """
+    starts, ends = as_intervals(starts, ends)
+    if starts.size == 0:
+        return np.empty(0), np.empty(0, dtype=int)
+    points = np.concatenate([starts, ends])
+    changes = np.concatenate([np.ones(starts.size, dtype=int), -np.ones(ends.size, dtype=int)])
+    order = np.argsort(points, kind="stable")
+    points, changes = points[order], changes[order]
+    edges, first = np.unique(points, return_index=True)
+    depth = np.cumsum(np.add.reduceat(changes, first))[:-1]
+    return edges, depth
+
+
+def runs(edges, mask):
+    """Merge consecutive segments where mask is True into (start, end) pairs."""
+    mask = np.asarray(mask, dtype=bool)
+    if mask.size == 0:
+        return []
+    padded = np.diff(np.concatenate(([0], mask.astype(int), [0])))
+    first = np.flatnonzero(padded == 1)
+    last = np.flatnonzero(padded == -1)
+    return [(float(edges[a]), float(edges[b])) for a, b in zip(first, last)]
+
+
+def max_overlap_segments(starts, ends):
+    """
+    Regions covered by the largest number of intervals, merged into runs.
+    Empty when no two intervals overlap.
+    """
+    edges, depth = coverage(starts, ends)
+    if depth.size == 0 or depth.max() < 2:
+        return []
+    return runs(edges, depth == depth.max())
+
+
+def depth_regions(starts, ends):
+    """{depth: [(start, end), ...]} for every depth >= 1 that occurs."""
+    edges, depth = coverage(starts, ends)
+    if depth.size == 0:
+        return {}
+    # one run per stretch of constant depth, then group the runs by depth
+    first = np.flatnonzero(np.r_[True, depth[1:] != depth[:-1]])
+    last = np.r_[first[1:], depth.size]
+    run_depth = depth[first]
+    regions = {}
+    for i in np.argsort(run_depth, kind="stable"):
+        d = int(run_depth[i])
+        if d > 0:
+            regions.setdefault(d, []).append((float(edges[first[i]]), float(edges[last[i]])))
+    return regions
+
+
+def assign_lanes(starts, ends):
+    """
+    Greedy interval-graph colouring: the lane of each interval such that
+    intervals sharing a lane never overlap. Uses the fewest lanes possible.
+    """
+    starts, ends = as_intervals(starts, ends)
+    lanes = np.zeros(starts.size, dtype=int)
+    free = []    # (end, lane) of the last interval in each lane
+    n_lanes = 0
+    for i in np.argsort(starts, kind="stable"):
+        if free and free[0][0] < starts[i]:
+            _, lane = heapq.heappop(free)
+        else:
+            lane = n_lanes
+            n_lanes += 1
+        lanes[i] = lane
+        heapq.heappush(free, (ends[i], lane))
+    return lanes
+
+
+# ---------- import ----------
+def load_ranges(path):
+    """
+    Read a ranges file into {"unit", "start", "end", "tick_interval", "bars"},
+    where bars is a list of {"label", "start", "end"}. Axis fields are None
+    when the file does not set them.
+
+    JSON: the Optimal Settings Finder window export, or a bare list of bars.
+    CSV: one bar per row with start/end columns (case-insensitive) and an
+    optional label column; other columns are ignored.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        doc = {"bars": _read_csv_bars(path)}
+    else:
+        with open(path, "r") as f:
+            doc = json.load(f)
+        if isinstance(doc, list):
+            doc = {"bars": doc}
+    bars = [
+        {"label": str(b.get("label", "")), "start": float(b["start"]), "end": float(b["end"])}
+        for b in doc.get("bars", [])
+    ]
+    return {
+        "unit": doc.get("unit"),
+        "start": doc.get("start"),
+        "end": doc.get("end"),
+        "tick_interval": doc.get("tick_interval"),
+        "bars": bars,
+    }
+
+
+def _read_csv_bars(path):
+    with open(path, "r", newline="") as f:
+        reader = csv.DictReader(f)
+        fields = {name.strip().lower(): name for name in (reader.fieldnames or [])}
+        if "start" not in fields or "end" not in fields:
+            raise ValueError("CSV ranges need 'start' and 'end' columns")
+        label = fields.get("label")
+        return [
+            {"label": row[label] if label else "", "start": row[fields["start"]], "end": row[fields["end"]]}
+            for row in reader
+            if row[fields["start"]].strip() and row[fields["end"]].strip()
+        ]
@@ -0,0 +1,205 @@
+from matplotlib.collections import PatchCollection
+from matplotlib.ticker import MaxNLocator
+import matplotlib.patches as patches
+import numpy as np
+
+import intervals
+
+ONE_ROW_PER_BAR = 20     # above this, bars are packed into shared lanes
+MAX_LABELLED_BARS = 50   # above this, bar labels are not drawn
+FIGSIZE = (15, 3)
+
+# Muted color palette
+COLOR_PALETTE = np.array([
+    (0.5, 0.7, 1.0),
+    (0.4, 0.8, 0.9),
+    (0.6, 0.6, 1.0),
+    (0.5, 0.8, 0.8),
+    (0.7, 0.7, 0.9),
+    (0.6, 0.7, 0.85)
+])
+
+
+def nice_tick_interval(lo, hi, n=10):
+    """A round tick spacing giving roughly n ticks between lo and hi."""
+    ticks = MaxNLocator(n).tick_values(lo, hi)
+    return float(ticks[1] - ticks[0]) if len(ticks) > 1 else 1.0
+
+
+def frange(start, end, step):
+    x = start
+    while x <= end:
+        yield round(x, 5)
+        x += step
+
+
+def draw_number_bar(ax, spec):
+    """
+    Draw one number line bar on `ax` (cleared first). Needs no Tk, so it also
+    backs the headless batch renderer.
+
+    spec: {"start", "end", "unit", "tick_interval",
+           "bars": [{"label", "start", "end"}], "depth": bool (optional)}
+    """
+    start = float(spec["start"])
+    end = float(spec["end"])
+    unit = spec.get("unit") or ""
+    tick_interval = float(spec["tick_interval"])
+    bars = spec.get("bars", [])
+
+    ax.clear()
+
+    total_height = (end - start) / 25.0
+    visible_width = end - start
+    rounding = max(0.05, min(visible_width * 0.02, (end - start) / 10.0))
+    y_center = 0
+    bottom_edge = y_center - total_height / 2
+
+    # Primary bar
+    primary_bar = patches.FancyBboxPatch(
+        (start, bottom_edge),
+        end - start,
+        total_height,
+        boxstyle=f"round,pad=0.02,rounding_size={rounding}",
+        facecolor="lightgray",
+        edgecolor="gray",
+        zorder=1
+    )
+    ax.add_patch(primary_bar)
+
+    starts, ends = intervals.as_intervals([b["start"] for b in bars], [b["end"] for b in bars])
+    labels = [b.get("label", "") for b in bars]
+    num_bars = starts.size
+    if num_bars == 0:
+        return
+
+    # One row per bar for a handful of bars; otherwise pack non-overlapping
+    # bars into shared lanes so thousands of ranges stay readable.
+    if num_bars <= ONE_ROW_PER_BAR:
+        lanes = np.arange(num_bars)
+    else:
+        lanes = intervals.assign_lanes(starts, ends)
+    num_lanes = int(lanes.max()) + 1
+    row_height = total_height / num_lanes
+    bar_height = row_height * 0.8  # spacing between bars
+    bottoms = bottom_edge + lanes * row_height + (row_height - bar_height) / 2
+    colors = COLOR_PALETTE[np.arange(num_bars) % len(COLOR_PALETTE)]
+
+    # --- Deepest overlap regions ---
+    overlap_segments = intervals.max_overlap_segments(starts, ends)
+    if overlap_segments:
+        ax.add_collection(PatchCollection(
+            [patches.FancyBboxPatch(
+                (seg_start, bottom_edge),
+                seg_end - seg_start,
+                total_height,
+                boxstyle=f"round,pad=0.02,rounding_size={rounding}"
+            ) for seg_start, seg_end in overlap_segments],
+            facecolor=(0.1, 0.2, 0.5),
+            edgecolor="none",
+            alpha=0.4,
+            zorder=0
+        ))
+
+    # --- Secondary bars, drawn as a single collection ---
+    if num_bars <= ONE_ROW_PER_BAR:
+        boxstyle = f"round,pad=0.02,rounding_size={rounding}"
+        bar_patches = [
+            patches.FancyBboxPatch((s, b), e - s, bar_height, boxstyle=boxstyle)
+            for s, e, b in zip(starts, ends, bottoms)
+        ]
+    else:
+        bar_patches = [
+            patches.Rectangle((s, b), e - s, bar_height)
+            for s, e, b in zip(starts, ends, bottoms)
+        ]
+    ax.add_collection(PatchCollection(
+        bar_patches,
+        facecolors=colors,
+        edgecolors=colors,
+        alpha=0.5,
+        zorder=2
+    ))
+
+    # Label centered in each bar
+    if num_bars <= MAX_LABELLED_BARS:
+        for s, e, b, label_text in zip(starts, ends, bottoms, labels):
+            ax.text(
+                (s + e) / 2,
+                b + bar_height / 2,
+                label_text,
+                ha="center",
+                va="center",
+                fontsize=12 if num_lanes <= ONE_ROW_PER_BAR else 8,
+                color="black",
+                weight="bold",
+                zorder=3
+            )
+
+    # Dashed overlap lines (bounded to primary bar height)
+    if overlap_segments:
+        ax.vlines(
+            x=np.ravel(overlap_segments),
+            ymin=bottom_edge,
+            ymax=y_center + total_height / 2,
+            colors="gray",
+            linestyles="--",
+            linewidth=1.5,
+            alpha=0.8,
+            zorder=4
+        )
+
+    # Coverage depth strip above the primary bar
+    if spec.get("depth"):
+        draw_depth_strip(ax, starts, ends, y_center + total_height * 0.65, total_height * 0.3)
+
+    # Axis formatting
+    ax.set_xlim(start - tick_interval, end + tick_interval)
+    ax.set_ylim(-total_height * 1.5, total_height * 1.5)
+    ax.set_yticks([])
+
+    ticks = [x for x in frange(start, end, tick_interval)]
+    tick_labels = [f"{x:g}" for x in ticks]
+    ax.set_xticks(ticks)
+    ax.set_xticklabels(tick_labels)
+
+    baseline_y = -total_height * 0.55
+    ax.spines['bottom'].set_visible(True)
+    ax.spines['bottom'].set_position(('data', baseline_y))
+    for s in ('top', 'left', 'right'):
+        ax.spines[s].set_visible(False)
+    ax.xaxis.set_ticks_position('bottom')
+    ax.tick_params(axis='x', which='both', pad=2, labelsize=14)
+
+    # Unit label
+    if unit.strip():
+        ax.text(
+            0.5, 0.15, unit,
+            ha='center', va='top',
+            transform=ax.transAxes, fontsize=16
+        )
+
+    ax.margins(y=0)
+    ax.grid(False)
+    ax.figure.subplots_adjust(bottom=0.18, top=0.95)
+
+
+def draw_depth_strip(ax, starts, ends, bottom, height):
+    """Shade every segment by how many bars cover it."""
+    edges, depth = intervals.coverage(starts, ends)
+    covered = np.flatnonzero(depth > 0)
+    if covered.size == 0:
+        return
+    strip = PatchCollection(
+        [patches.Rectangle((edges[i], bottom), edges[i + 1] - edges[i], height) for i in covered],
+        cmap="Blues",
+        edgecolor="none",
+        zorder=1
+    )
+    strip.set_array(depth[covered])
+    strip.set_clim(0, depth.max())
+    ax.add_collection(strip)
+    ax.text(
+        edges[-1], bottom + height / 2, f"  max depth {depth.max()}",
+        ha="left", va="center", fontsize=10, color="gray"
+    )
@@ -0,0 +1,201 @@
+"""
+Headless batch renderer for number line bars.
+
+    python render.py SPEC [SPEC ...] [-o OUTDIR] [-f png svg pdf] [-j WORKERS]
+
+Each SPEC is a JSON or CSV file describing one or more bar sets:
+
+  JSON  {"figures": [FIGURE, ...]} (top-level keys other than "figures" are
+        defaults for every figure), a bare list of FIGUREs, or a single
+        FIGURE such as an Optimal Settings Finder window export.
+        FIGURE = {"name", "start", "end", "unit", "tick_interval", "depth",
+                  "bars": [{"label", "start", "end"}]  or  "ranges": PATH}
+        where PATH is a ranges JSON/CSV (relative to the spec file).
+  CSV   one bar per row: start, end and optional label columns; a figure
+        (or name) column groups rows into figures, and optional unit,
+        axis_start, axis_end, tick_interval and depth columns set the axis
+        (first non-empty value per figure).
+
+Missing axis fields default to a round tick spacing and the span of the
+bars widened to whole ticks. Figures are laid out by layout.draw_number_bar, the same code the
+GUI uses, and rendered on the Agg backend in a process pool.
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.figure import Figure
+
+import intervals
+import layout
+
+FORMATS = ("png", "svg", "pdf")
+AXIS_COLUMNS = {"unit": "unit", "axis_start": "start", "axis_end": "end",
+                "tick_interval": "tick_interval", "depth": "depth"}
+
+
+# ---------- spec reading ----------
+def read_spec(path):
+    """List of figure dicts (name, start, end, unit, tick_interval, depth, bars) from one spec file."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if os.path.splitext(path)[1].lower() == ".csv":
+        figures = _read_csv_spec(path, stem)
+    else:
+        with open(path, "r") as f:
+            doc = json.load(f)
+        if isinstance(doc, list):
+            figures = doc
+        elif "figures" in doc:
+            defaults = {k: v for k, v in doc.items() if k != "figures"}
+            figures = [{**defaults, **fig} for fig in doc["figures"]]
+        else:
+            figures = [doc]
+
+    base = os.path.dirname(os.path.abspath(path))
+    out = []
+    for i, fig in enumerate(figures, start=1):
+        name = fig.get("name") or (stem if len(figures) == 1 else f"{stem}_{i:03d}")
+        out.append(complete_figure(_resolve_ranges(fig, base), name))
+    return out
+
+
+def _resolve_ranges(fig, base):
+    if "ranges" not in fig:
+        return fig
+    ranges = intervals.load_ranges(os.path.join(base, fig["ranges"]))
+    merged = {k: v for k, v in ranges.items() if v is not None}
+    merged.update({k: v for k, v in fig.items() if k != "ranges"})
+    return merged
+
+
+def _read_csv_spec(path, stem):
+    with open(path, "r", newline="") as f:
+        reader = csv.DictReader(f)
+        fields = {name.strip().lower(): name for name in (reader.fieldnames or [])}
+        if "start" not in fields or "end" not in fields:
+            raise ValueError("CSV spec needs 'start' and 'end' columns")
+        group = fields.get("figure") or fields.get("name")
+        label = fields.get("label")
+        figures = {}
+        for row in reader:
+            if not row[fields["start"]].strip() or not row[fields["end"]].strip():
+                continue
+            name = row[group].strip() if group else stem
+            fig = figures.setdefault(name, {"name": name, "bars": []})
+            for column, key in AXIS_COLUMNS.items():
+                value = row.get(fields.get(column, ""), "") or ""
+                if value.strip() and key not in fig:
+                    fig[key] = value.strip()
+            fig["bars"].append({
+                "label": row[label] if label else "",
+                "start": row[fields["start"]],
+                "end": row[fields["end"]],
+            })
+    return list(figures.values())
+
+
+def complete_figure(fig, name):
+    """Normalise a figure dict and fill missing axis fields from its bars."""
+    bars = [
+        {"label": str(b.get("label", "")), "start": float(b["start"]), "end": float(b["end"])}
+        for b in fig.get("bars", [])
+    ]
+    starts, ends = intervals.as_intervals([b["start"] for b in bars], [b["end"] for b in bars])
+    given_start = fig.get("start") not in (None, "")
+    given_end = fig.get("end") not in (None, "")
+    start = float(fig["start"]) if given_start else (float(starts.min()) if bars else 0.0)
+    end = float(fig["end"]) if given_end else (float(ends.max()) if bars else 10.0)
+    tick = fig.get("tick_interval")
+    tick = float(tick) if tick not in (None, "", 0) else layout.nice_tick_interval(start, end)
+    # Defaulted ends snap outwards to the tick grid so the labels are round numbers
+    if not given_start:
+        start = round(math.floor(start / tick + 1e-9) * tick, 10)
+    if not given_end:
+        end = round(math.ceil(end / tick - 1e-9) * tick, 10)
+    depth = fig.get("depth", False)
+    if isinstance(depth, str):
+        depth = depth.strip().lower() in ("1", "true", "yes", "y")
+    return {
+        "name": safe_name(name),
+        "start": start,
+        "end": end,
+        "unit": str(fig.get("unit") or ""),
+        "tick_interval": tick,
+        "depth": bool(depth),
+        "bars": bars,
+    }
+
+
+def safe_name(name):
+    return re.sub(r"[^\w.-]+", "_", str(name)).strip("_") or "figure"
+
+
+# ---------- rendering ----------
+def render_figure(job):
+    """Worker: draw one figure and save it in every format. Returns (name, paths, error)."""
+    spec, outdir, formats, dpi = job
+    try:
+        fig = Figure(figsize=layout.FIGSIZE)
+        layout.draw_number_bar(fig.add_subplot(111), spec)
+        paths = []
+        for fmt in formats:
+            path = os.path.join(outdir, f"{spec['name']}.{fmt}")
+            fig.savefig(path, format=fmt, dpi=dpi)
+            paths.append(path)
+        return spec["name"], paths, None
+    except Exception as e:
+        return spec["name"], [], f"{type(e).__name__}: {e}"
+
+
+def render_all(figures, outdir, formats=("png",), workers=None, dpi=150):
+    """Render every figure; returns [(name, paths, error), ...] in input order."""
+    os.makedirs(outdir, exist_ok=True)
+    jobs = [(spec, outdir, tuple(formats), dpi) for spec in figures]
+    if workers == 1 or len(jobs) <= 1:
+        return [render_figure(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(render_figure, jobs))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render number line bars from spec files without the GUI.")
+    parser.add_argument("specs", nargs="+", help="JSON or CSV spec files")
+    parser.add_argument("-o", "--outdir", default="numberbars", help="output folder (default: numberbars)")
+    parser.add_argument("-f", "--format", nargs="+", choices=FORMATS, default=["png"], dest="formats")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--dpi", type=int, default=150)
+    args = parser.parse_args(argv)
+
+    figures, names = [], set()
+    for path in args.specs:
+        try:
+            specs = read_spec(path)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"{path}: could not read spec ({e})", file=sys.stderr)
+            return 1
+        for spec in specs:
+            # keep output names unique across spec files
+            base, k = spec["name"], 2
+            while spec["name"] in names:
+                spec["name"] = f"{base}_{k}"
+                k += 1
+            names.add(spec["name"])
+            figures.append(spec)
+
+    results = render_all(figures, args.outdir, args.formats, args.workers, args.dpi)
+    failed = [(name, error) for name, _paths, error in results if error]
+    for name, error in failed:
+        print(f"{name}: {error}", file=sys.stderr)
+    print(f"Rendered {len(results) - len(failed)} of {len(results)} figures to {args.outdir}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
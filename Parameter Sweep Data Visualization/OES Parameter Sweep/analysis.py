@@ -0,0 +1,108 @@
+import numpy as np
+from scipy.stats import t as t_dist
+
+from testbench_core.perf import timed
+
+
+@timed()
+def cell_moments(spectra, cells, n_cells):
+    """
+    Per-cell mean, sample variance and count of aligned spectra.
+      spectra: (n_files, n_wavelengths) array, NaN where missing
+      cells:   (n_files,) integer cell index of each file
+    Returns three (n_cells, n_wavelengths) arrays; NaN values are skipped.
+    """
+    spectra = np.asarray(spectra, dtype=float)
+    cells = np.asarray(cells, dtype=int)
+    valid = ~np.isnan(spectra)
+    filled = np.where(valid, spectra, 0.0)
+
+    shape = (n_cells, spectra.shape[1])
+    counts = np.zeros(shape)
+    sums = np.zeros(shape)
+    np.add.at(counts, cells, valid)
+    np.add.at(sums, cells, filled)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = sums / counts
+        sq = np.zeros(shape)
+        np.add.at(sq, cells, np.where(valid, spectra - means[cells], 0.0) ** 2)
+        variances = np.where(counts > 1, sq / (counts - 1), np.nan)
+    return means, variances, counts
+
+
+@timed()
+def welch_pvalues(mean1, var1, n1, mean2, var2, n2):
+    """
+    Vectorised two-sided Welch t-test from summary statistics, matching
+    ttest_ind_from_stats(..., equal_var=False). Cells with fewer than two
+    samples on either side are NaN.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        se1 = var1 / n1
+        se2 = var2 / n2
+        se = se1 + se2
+        t_stat = (mean1 - mean2) / np.sqrt(se)
+        dof = se ** 2 / (se1 ** 2 / (n1 - 1) + se2 ** 2 / (n2 - 1))
+        pvals = 2.0 * t_dist.sf(np.abs(t_stat), dof)
+    return np.where((n1 > 1) & (n2 > 1), pvals, np.nan)
+
+
+@timed()
+def fdr_bh(pvalues, axis=-1):
+    """
+    Benjamini-Hochberg adjusted p-values (q-values) along `axis`.
+    NaN entries are left out of the family and stay NaN.
+    """
+    p = np.moveaxis(np.asarray(pvalues, dtype=float), axis, -1)
+    m = (~np.isnan(p)).sum(axis=-1, keepdims=True)
+    order = np.argsort(np.where(np.isnan(p), np.inf, p), axis=-1, kind="stable")
+    ranked = np.take_along_axis(p, order, axis=-1)
+    ranks = np.arange(1, p.shape[-1] + 1)
+    with np.errstate(invalid="ignore"):
+        scaled = np.where(np.isnan(ranked), np.inf, ranked * m / ranks)
+    # enforce monotonicity from the largest p-value down
+    q_sorted = np.minimum.accumulate(scaled[..., ::-1], axis=-1)[..., ::-1]
+    q_sorted = np.where(np.isnan(ranked), np.nan, np.minimum(q_sorted, 1.0))
+    q = np.empty_like(q_sorted)
+    np.put_along_axis(q, order, q_sorted, axis=-1)
+    return np.moveaxis(q, -1, axis)
+
+
+@timed()
+def significance_spectrum(spectra1, cells1, spectra2, cells2, n_cells):
+    """
+    Welch p-values for every (cell, wavelength) between two folders, plus
+    q-values with FDR correction across wavelengths within each cell.
+    Returns (pvals, qvals), both shaped (n_cells, n_wavelengths).
+    """
+    m1, v1, n1 = cell_moments(spectra1, cells1, n_cells)
+    m2, v2, n2 = cell_moments(spectra2, cells2, n_cells)
+    pvals = welch_pvalues(m1, v1, n1, m2, v2, n2)
+    return pvals, fdr_bh(pvals, axis=1)
+
+
+@timed()
+def significant_regions(wavelengths, qvals, alpha=0.05):
+    """
+    Contiguous wavelength runs where at least one cell has q < alpha.
+    Returns a list of dicts: start, end, points, cells (significant in the run), min_q.
+    """
+    with np.errstate(invalid="ignore"):
+        sig = qvals < alpha
+    any_sig = sig.any(axis=0)
+    if not any_sig.any():
+        return []
+
+    edges = np.diff(np.concatenate(([0], any_sig.astype(int), [0])))
+    starts = np.flatnonzero(edges == 1)
+    stops = np.flatnonzero(edges == -1)
+    regions = []
+    for a, b in zip(starts, stops):
+        regions.append({
+            "start": float(wavelengths[a]),
+            "end": float(wavelengths[b - 1]),
+            "points": int(b - a),
+            "cells": int(sig[:, a:b].any(axis=1).sum()),
+            "min_q": float(np.nanmin(qvals[:, a:b])),
+        })
+    return regions
@@ -2,13 +2,28 @@ import os
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from scipy.stats import ttest_ind_from_stats
-from data_manager import DataManager, load_last_path, save_last_path
+from data_manager import DataManager
+from testbench_core.config import load_last_path, save_last_path
+from testbench_core.figures import FigurePopup
+from testbench_core.filenames import numeric_sort_key
+from testbench_core.heatmap_view import HeatmapView
+from testbench_core.lazy import lazy_import
+from testbench_core import perf
+from testbench_core.perf_window import show_performance_window
+
+# SciPy (and analysis, which needs it) load on first use; main.py
+# preloads them in the background once the window is up.
+stats = lazy_import("scipy.stats")
+analysis = lazy_import("analysis")
+PRELOAD = ("pandas", "scipy.stats", "analysis")
 
 
 class DataPlotApp:
+    PLAY_INTERVAL_MS = 40
+    STAT_COLUMNS = {"Mean": "mean", "Standard Deviation": "std_dev", "% CV": "cv_percent"}
+
     def __init__(self, root):
         self.root = root
         self.root.title("OES Data Visualization")
@@ -19,6 +34,9 @@ class DataPlotApp:
 
         self.figure = None
         self.canvas = None
+        self._scrubbing = False
+        self._play_job = None
+        self.significance_popup = FigurePopup(self.root, "Significance Spectrum", "1200x800", figsize=(11, 5))
 
         self.create_widgets()
 
@@ -80,11 +98,31 @@ class DataPlotApp:
 
         ttk.Button(control_frame, text="Plot Heatmap", command=self.plot_heatmap).pack(side="left", padx=10)
         ttk.Button(control_frame, text="Plot P-Values", command=self.plot_pvalues).pack(side="left", padx=10)
+        ttk.Button(control_frame, text="Significance Spectrum", command=self.plot_significance_spectrum).pack(side="left", padx=10)
+        ttk.Button(control_frame, text="Performance", command=lambda: show_performance_window(self.root)).pack(side="right", padx=10)
+
+        self.folder_combo.bind("<<ComboboxSelected>>", self.update_scrubber)
+
+        # ---- Wavelength Scrubber ----
+        scrub_frame = ttk.LabelFrame(self.root, text="Wavelength Scrubber")
+        scrub_frame.pack(fill="x", padx=10, pady=5)
+        self.play_button = ttk.Button(scrub_frame, text="Play", command=self.toggle_play)
+        self.play_button.pack(side="left", padx=5)
+        self.scrub_var = tk.IntVar(value=0)
+        self.scrub_scale = tk.Scale(
+            scrub_frame, variable=self.scrub_var, from_=0, to=0, orient="horizontal",
+            showvalue=False, command=self.on_scrub
+        )
+        self.scrub_scale.pack(side="left", fill="x", expand=True, padx=5)
+        ttk.Label(scrub_frame, text="Wavelength:").pack(side="left", padx=5)
+        self.scrub_label = ttk.Label(scrub_frame, text="—", width=10)
+        self.scrub_label.pack(side="left", padx=5)
 
         # ---- Matplotlib Figure ----
-        self.figure = plt.Figure(figsize=(10, 8), dpi=100)
-        self.canvas = FigureCanvasTkAgg(self.figure, master=self.root)
+        self.figure = Figure(figsize=(10, 8), dpi=100)
+        self.canvas = perf.instrument_canvas(FigureCanvasTkAgg(self.figure, master=self.root))
         self.canvas.get_tk_widget().pack(fill="both", expand=True, padx=10, pady=10)
+        self.heatmap_view = HeatmapView(self.figure, self.canvas)
 
     # ---------- Data Management ----------
     def select_folder(self):
@@ -97,18 +135,25 @@ class DataPlotApp:
         folder = filedialog.askdirectory(initialdir=self.current_path.get(), title="Select Data Folder")
         if not folder:
             return
-        loaded = self.data_mgr.add_data_set_from_folder_auto(folder)
+        with perf.action("Add Data Set"):
+            loaded = self.data_mgr.add_data_set_from_folder_auto(folder)
         if loaded == 0:
             messagebox.showwarning("No CSVs", f"No valid CSVs found in {folder}")
             return
+        self.data_mgr.build_cubes()
         self.populate_table()
         self.update_folder_dropdown()
+        self.update_scrubber()
 
     def clear_all_data(self):
+        if self._play_job is not None:
+            self.toggle_play()
         self.data_mgr.clear_all()
         self.populate_table()
         self.update_folder_dropdown()
+        self.update_scrubber()
 
+    @perf.timed()
     def populate_table(self):
         for r in self.tree.get_children():
             self.tree.delete(r)
@@ -134,6 +179,7 @@ class DataPlotApp:
             self.compare_var.set(compare_options[0])
 
     # ---------- Plotting ----------
+    @perf.timed_action("Plot Heatmap")
     def plot_heatmap(self):
         try:
             wl = float(self.wavelength_entry.get())
@@ -147,81 +193,94 @@ class DataPlotApp:
             messagebox.showwarning("No Folder", "No folder selected.")
             return
 
-        # Filter datasets by folder name
-        filtered_data = [(df, p, f) for df, p, f, folder in zip(
-            self.data_mgr.dataframes, self.data_mgr.groups_power,
-            self.data_mgr.groups_freq, self.data_mgr.group_folders
-        ) if os.path.basename(folder) == selected_folder_name]
-
-        if not filtered_data:
+        cube = self.data_mgr.wavelength_cube(selected_folder_name)
+        if cube is None:
             messagebox.showwarning("No Data", f"No data found for folder {selected_folder_name}.")
             return
 
-        # Aggregate (Power, Freq) -> values
-        data_dict = {}
-        for df, power, freq in filtered_data:
-            try:
-                idx = (np.abs(df['wavelength_index'] - wl)).idxmin()
-            except Exception:
-                continue
-
-            if statistic in ["Mean", "Standard Deviation", "% CV"]:
-                if statistic == "Mean":
-                    val = df.at[idx, "mean"]
-                elif statistic == "Standard Deviation":
-                    val = df.at[idx, "std_dev"]
-                elif statistic == "% CV":
-                    val = df.at[idx, "cv_percent"]
-
-                key = (power, freq)
-                data_dict.setdefault(key, []).append(val)
-
-            elif statistic == "SNR":
-                key = (power, freq)
-                mean_val = df.at[idx, "mean"]
-                std_val = df.at[idx, "std_dev"]
-                data_dict.setdefault(key, []).append((mean_val, std_val))
-
-        powers_sorted = sorted(set([k[0] for k in data_dict.keys()]))
-        freqs_sorted = sorted(set([k[1] for k in data_dict.keys()]))
-
-        heatmap_data = np.full((len(powers_sorted), len(freqs_sorted)), np.nan)
-        for i, p in enumerate(powers_sorted):
-            for j, f in enumerate(freqs_sorted):
-                vals = data_dict.get((p, f), [])
-                if not vals:
-                    continue
-
-                if statistic == "SNR":
-                    means = [v[0] for v in vals]
-                    stds = [v[1] for v in vals if v[1] != 0]
-                    if stds and np.mean(stds) != 0:
-                        heatmap_data[i, j] = abs(np.mean(means) / np.mean(stds))
-                else:
-                    heatmap_data[i, j] = np.mean(vals)
+        # Nearest wavelength of the precomputed cube -> one array slice
+        k = cube.nearest_index(wl)
+        self._set_scrubber(k)
 
         # ---- Plot Heatmap ----
-        self.figure.clf()
-        ax = self.figure.add_subplot(111)
-        c = ax.imshow(
-            heatmap_data,
-            aspect='auto',
-            origin='lower',
-            interpolation='nearest',
-            cmap='cividis'
+        self.heatmap_view.show(
+            cube.frame(k, statistic), cube.powers, cube.freqs,
+            cmap="cividis",
+            title=f"Heatmap — {statistic} at Wavelength {wl}",
+            cbar_label=statistic,
+        )
+
+    # ---------- Wavelength Scrubber ----------
+    def _current_cube(self):
+        folder_name = self.folder_var.get()
+        return self.data_mgr.wavelength_cube(folder_name) if folder_name else None
+
+    def update_scrubber(self, event=None):
+        cube = self._current_cube()
+        n = len(cube.wavelengths) if cube is not None else 1
+        self._scrubbing = True
+        self.scrub_scale.configure(to=max(n - 1, 0))
+        if self.scrub_var.get() > n - 1:
+            self.scrub_var.set(0)
+        self._scrubbing = False
+        self.scrub_label.configure(
+            text=f"{cube.wavelengths[self.scrub_var.get()]:g}" if cube is not None else "—"
         )
 
-        ax.set_xticks(np.arange(len(freqs_sorted)))
-        ax.set_yticks(np.arange(len(powers_sorted)))
-        ax.set_xticklabels(freqs_sorted)
-        ax.set_yticklabels(powers_sorted)
-        ax.set_xlabel("Frequency")
-        ax.set_ylabel("Power")
-        ax.set_title(f"Heatmap — {statistic} at Wavelength {wl}")
+    def _set_scrubber(self, index):
+        self._scrubbing = True
+        self.scrub_var.set(index)
+        self._scrubbing = False
+        cube = self._current_cube()
+        if cube is not None:
+            self.scrub_label.configure(text=f"{cube.wavelengths[index]:g}")
+
+    @perf.timed_action("Scrub Wavelength")
+    def on_scrub(self, value=None):
+        if self._scrubbing:
+            return
+        cube = self._current_cube()
+        if cube is None:
+            return
+        k = min(int(float(self.scrub_var.get())), len(cube.wavelengths) - 1)
+        statistic = self.statistic_var.get()
+        wl = cube.wavelengths[k]
+        self.scrub_label.configure(text=f"{wl:g}")
+        self.wavelength_entry.delete(0, "end")
+        self.wavelength_entry.insert(0, f"{wl:g}")
+
+        # Fixed colour scale across the spectrum keeps every frame on the blit path
+        vmin, vmax = cube.clim(statistic)
+        self.heatmap_view.show(
+            cube.frame(k, statistic), cube.powers, cube.freqs,
+            cmap="cividis", vmin=vmin, vmax=vmax,
+            title=f"Heatmap — {statistic} at Wavelength {wl:g}",
+            cbar_label=statistic,
+        )
 
-        self.figure.colorbar(c, ax=ax, label=statistic)
-        self.canvas.draw()
+    def toggle_play(self):
+        if self._play_job is not None:
+            self.root.after_cancel(self._play_job)
+            self._play_job = None
+            self.play_button.configure(text="Play")
+            return
+        if self._current_cube() is None:
+            messagebox.showwarning("No Data", "Load a folder before scrubbing wavelengths.")
+            return
+        self.play_button.configure(text="Pause")
+        self._play_step()
+
+    def _play_step(self):
+        cube = self._current_cube()
+        if cube is None:
+            self._play_job = None
+            self.play_button.configure(text="Play")
+            return
+        self.scrub_var.set((self.scrub_var.get() + 1) % len(cube.wavelengths))
+        self.on_scrub()
+        self._play_job = self.root.after(self.PLAY_INTERVAL_MS, self._play_step)
 
+    @perf.timed_action("Plot P-Values")
     def plot_pvalues(self):
         try:
             wl = float(self.wavelength_entry.get())
@@ -237,36 +296,31 @@ class DataPlotApp:
 
         folder1_name, folder2_name = [x.strip() for x in compare_text.split("vs")]
 
-        folder1_data = [(df, p, f) for df, p, f, folder in zip(
-            self.data_mgr.dataframes, self.data_mgr.groups_power,
-            self.data_mgr.groups_freq, self.data_mgr.group_folders
-        ) if os.path.basename(folder) == folder1_name]
-
-        folder2_data = [(df, p, f) for df, p, f, folder in zip(
-            self.data_mgr.dataframes, self.data_mgr.groups_power,
-            self.data_mgr.groups_freq, self.data_mgr.group_folders
-        ) if os.path.basename(folder) == folder2_name]
+        folder1_data = self.data_mgr.folder_indices(folder1_name)
+        folder2_data = self.data_mgr.folder_indices(folder2_name)
 
         if not folder1_data or not folder2_data:
             messagebox.showwarning("No Data", "One or both folders have no data.")
             return
 
         def compute_stats(folder_data):
+            # Per-file cache: nearest row per wavelength and whole-spectrum moments
             stats_dict = {}
-            for df, power, freq in folder_data:
-                idx = (np.abs(df['wavelength_index'] - wl)).idxmin()
+            for i in folder_data:
+                fs = self.data_mgr.file_stats(i)
+                row = fs.nearest_row(wl)
                 if statistic == "Mean":
-                    val = df.at[idx, "mean"]
-                    std = df.at[idx, "std_dev"]
+                    val = fs.value(row, "mean")
+                    std = fs.value(row, "std_dev")
                 elif statistic == "Standard Deviation":
-                    val = df.at[idx, "std_dev"]
+                    val = fs.value(row, "std_dev")
                     std = 0
                 elif statistic == "% CV":
-                    val = df.at[idx, "cv_percent"]
-                    std = df["cv_percent"].std()
+                    val = fs.value(row, "cv_percent")
+                    std = fs.std("cv_percent")
                 else:
                     val, std = np.nan, np.nan
-                key = (power, freq)
+                key = (self.data_mgr.groups_power[i], self.data_mgr.groups_freq[i])
                 if key not in stats_dict:
                     stats_dict[key] = []
                 stats_dict[key].append((val, std))
@@ -275,8 +329,8 @@ class DataPlotApp:
         stats1 = compute_stats(folder1_data)
         stats2 = compute_stats(folder2_data)
 
-        powers = sorted(set([k[0] for k in stats1.keys()] + [k[0] for k in stats2.keys()]))
-        freqs = sorted(set([k[1] for k in stats1.keys()] + [k[1] for k in stats2.keys()]))
+        powers = sorted(set([k[0] for k in stats1.keys()] + [k[0] for k in stats2.keys()]), key=numeric_sort_key)
+        freqs = sorted(set([k[1] for k in stats1.keys()] + [k[1] for k in stats2.keys()]), key=numeric_sort_key)
 
         heatmap_data = np.full((len(powers), len(freqs)), np.nan)
 
@@ -288,28 +342,97 @@ class DataPlotApp:
                     if len(v1) > 1 and len(v2) > 1:
                         mean1, std1, n1 = np.mean(v1), np.std(v1, ddof=1), len(v1)
                         mean2, std2, n2 = np.mean(v2), np.std(v2, ddof=1), len(v2)
-                        _, pval = ttest_ind_from_stats(mean1, std1, n1, mean2, std2, n2, equal_var=False)
+                        _, pval = stats.ttest_ind_from_stats(mean1, std1, n1, mean2, std2, n2, equal_var=False)
                         heatmap_data[i, j] = pval
 
-        self.figure.clf()
-        ax = self.figure.add_subplot(111)
-        c = ax.imshow(
-            heatmap_data,
-            aspect='auto',
-            origin='lower',
-            interpolation='nearest',
-            cmap='plasma_r',
-            vmin=0,
-            vmax=0.05
+        self.heatmap_view.show(
+            heatmap_data, powers, freqs,
+            cmap="plasma_r", vmin=0, vmax=0.05,
+            title=f"P-Values — {folder1_name} vs {folder2_name} at Wavelength {wl}",
+            cbar_label="P-Value",
         )
 
-        ax.set_xticks(np.arange(len(freqs)))
-        ax.set_yticks(np.arange(len(powers)))
-        ax.set_xticklabels(freqs)
-        ax.set_yticklabels(powers)
-        ax.set_xlabel("Frequency")
-        ax.set_ylabel("Power")
-        ax.set_title(f"P-Values — {folder1_name} vs {folder2_name} at Wavelength {wl}")
+    # ---------- Significance Spectrum ----------
+    @perf.timed_action("Significance Spectrum")
+    def plot_significance_spectrum(self):
+        statistic = self.statistic_var.get()
+        column = self.STAT_COLUMNS.get(statistic)
+        if column is None:
+            messagebox.showwarning("Invalid Statistic", "P-values are available for Mean, Standard Deviation and % CV.")
+            return
+
+        compare_text = self.compare_var.get()
+        if "vs" not in compare_text:
+            messagebox.showwarning("Invalid Comparison", "Please select two folders to compare.")
+            return
+        folder1_name, folder2_name = [x.strip() for x in compare_text.split("vs")]
+
+        idx1 = self.data_mgr.folder_indices(folder1_name)
+        idx2 = self.data_mgr.folder_indices(folder2_name)
+        if not idx1 or not idx2:
+            messagebox.showwarning("No Data", "One or both folders have no data.")
+            return
 
-        self.figure.colorbar(c, ax=ax, label="P-Value")
-        self.canvas.draw()
+        # Align every file on the union wavelength grid, then test all cells at once
+        wavelengths = np.unique(np.concatenate([self.data_mgr.file_stats(i).wavelengths for i in idx1 + idx2]))
+        keys = sorted(
+            {(self.data_mgr.groups_power[i], self.data_mgr.groups_freq[i]) for i in idx1 + idx2},
+            key=lambda k: (numeric_sort_key(k[0]), numeric_sort_key(k[1]))
+        )
+        cell_of = {k: n for n, k in enumerate(keys)}
+        cells1 = [cell_of[(self.data_mgr.groups_power[i], self.data_mgr.groups_freq[i])] for i in idx1]
+        cells2 = [cell_of[(self.data_mgr.groups_power[i], self.data_mgr.groups_freq[i])] for i in idx2]
+
+        _, qvals = analysis.significance_spectrum(
+            self.data_mgr.aligned_spectra(idx1, column, wavelengths), cells1,
+            self.data_mgr.aligned_spectra(idx2, column, wavelengths), cells2,
+            len(keys)
+        )
+        regions = analysis.significant_regions(wavelengths, qvals)
+        self.show_significance_popup(
+            f"{folder1_name} vs {folder2_name} — {statistic}", wavelengths, keys, qvals, regions
+        )
+
+    @perf.timed("Significance popup")
+    def show_significance_popup(self, title, wavelengths, keys, qvals, regions, alpha=0.05):
+        # the open popup (and its canvas) is reused; its footer is rebuilt below
+        fig = self.significance_popup.show(f"Significance Spectrum — {title}")
+        footer = self.significance_popup.footer
+        ax = fig.add_subplot(111)
+        im = ax.imshow(
+            qvals,
+            aspect="auto",
+            origin="lower",
+            interpolation="nearest",
+            cmap="plasma_r",
+            vmin=0,
+            vmax=alpha,
+            extent=[wavelengths[0], wavelengths[-1], -0.5, len(keys) - 0.5]
+        )
+        ax.set_yticks(np.arange(len(keys)))
+        ax.set_yticklabels([f"P{p} F{f}" for p, f in keys])
+        ax.set_xlabel("Wavelength")
+        ax.set_ylabel("Power / Frequency")
+        ax.set_title(f"FDR q-Values — {title}")
+        fig.colorbar(im, ax=ax, label="q-Value (BH)")
+        fig.tight_layout()
+
+        self.significance_popup.draw()
+
+        with np.errstate(invalid="ignore"):
+            n_sig = int((qvals < alpha).sum())
+        n_tested = int((~np.isnan(qvals)).sum())
+        ttk.Label(
+            footer,
+            text=f"{n_sig} of {n_tested} cell-wavelength tests significant at q < {alpha} "
+                 f"({len(regions)} spectral region(s))"
+        ).pack(anchor="w", padx=10)
+
+        columns = ("start", "end", "points", "cells", "min_q")
+        tree = ttk.Treeview(footer, columns=columns, show="headings", height=8)
+        for c, t in zip(columns, ["Start", "End", "Wavelengths", "Cells Differing", "Min q-Value"]):
+            tree.heading(c, text=t)
+            tree.column(c, width=150, anchor="center")
+        for r in regions:
+            tree.insert("", "end", values=(f"{r['start']:g}", f"{r['end']:g}", r["points"], r["cells"], f"{r['min_q']:.3g}"))
+        tree.pack(fill="x", padx=10, pady=10)
@@ -1,32 +1,42 @@
-import pandas as pd
-import os, json, re
-
-CONFIG_FILE = "settings.json"
-
-def load_last_path():
-    if os.path.exists(CONFIG_FILE):
-        try:
-            with open(CONFIG_FILE, "r") as f:
-                return json.load(f).get("last_path", os.getcwd())
-        except Exception:
-            pass
-    return os.getcwd()
-
-def save_last_path(path):
-    try:
-        with open(CONFIG_FILE, "w") as f:
-            json.dump({"last_path": path}, f)
-    except Exception:
-        pass
-
-def parse_power_freq_from_filename(fname):
-    tokens = re.findall(r'\d+(?:\.\d+)?', fname)
-    if len(tokens) >= 3:
-        return tokens[-3], tokens[-2]
-    elif len(tokens) >= 2:
-        return tokens[-2], tokens[-1]
-    else:
-        return None, None
+import numpy as np
+import os
+
+from testbench_core.filenames import parse_power_freq_from_filename, numeric_sort_key
+from testbench_core.loader import load_folder
+from testbench_core.perf import timed
+from testbench_core.schemas import OES_COLUMNS, clean_oes_frame, has_columns
+from testbench_core.stores import FileStats, nearest_rows
+
+
+class WavelengthCube:
+    """
+    Per-folder power x frequency x wavelength x statistic averages.
+    Statistics follow STATISTICS; SNR is |mean of means| / mean of non-zero std devs
+    per (power, freq) cell, exactly as the single-wavelength heatmap computes it.
+    """
+    STATISTICS = ["Mean", "Standard Deviation", "% CV", "SNR"]
+
+    def __init__(self, powers, freqs, wavelengths, values):
+        self.powers = powers            # sorted power labels (rows)
+        self.freqs = freqs              # sorted frequency labels (columns)
+        self.wavelengths = wavelengths  # sorted 1-D float array
+        self.values = values            # shape (powers, freqs, wavelengths, statistics)
+        self._clims = {}
+
+    def nearest_index(self, wl):
+        return int(nearest_rows(self.wavelengths, [wl])[0])
+
+    def frame(self, wl_index, statistic):
+        return self.values[:, :, wl_index, self.STATISTICS.index(statistic)]
+
+    def clim(self, statistic):
+        """Colour limits over the whole spectrum, so scrubbing keeps one scale."""
+        if statistic not in self._clims:
+            vals = self.values[..., self.STATISTICS.index(statistic)]
+            finite = vals[np.isfinite(vals)]
+            self._clims[statistic] = (float(finite.min()), float(finite.max())) if finite.size else (0.0, 1.0)
+        return self._clims[statistic]
+
 
 class DataManager:
     def __init__(self):
@@ -36,32 +46,91 @@ class DataManager:
         self.groups_freq = []
         self.auto_tags = []
         self.group_folders = []
+        self._cubes = {}       # folder basename -> WavelengthCube
+        self._file_stats = {}  # dataframe index -> FileStats
 
     def clear_all(self):
         self.__init__()
 
     def _valid_df(self, df):
-        return {"wavelength_index", "mean", "std_dev", "cv_percent"}.issubset(df.columns)
+        return has_columns(df.columns, OES_COLUMNS)
 
     def add_data_set_from_folder_auto(self, folder):
+        self._cubes.pop(os.path.basename(folder), None)
         loaded = 0
-        csv_files = [f for f in os.listdir(folder) if f.lower().endswith(".csv")]
-        for f in csv_files:
-            path = os.path.join(folder, f)
-            try:
-                df = pd.read_csv(path)
-                if self._valid_df(df):
-                    p, freq = parse_power_freq_from_filename(f)
-                    tag = f"P{p}_F{freq}" if (p and freq) else "Unknown"
-                    df['wavelength_index'] = pd.to_numeric(df['wavelength_index'], errors='coerce')
-                    df = df.dropna(subset=['wavelength_index']).copy()
-                    self.dataframes.append(df)
-                    self.file_names.append(f)
-                    self.groups_power.append(p)
-                    self.groups_freq.append(freq)
-                    self.auto_tags.append(tag)
-                    self.group_folders.append(folder)
-                    loaded += 1
-            except Exception:
-                continue
-        return loaded
\ No newline at end of file
+        for f, df in load_folder(folder, OES_COLUMNS, clean=clean_oes_frame).files:
+            p, freq = parse_power_freq_from_filename(f)
+            tag = f"P{p}_F{freq}" if (p and freq) else "Unknown"
+            self.dataframes.append(df)
+            self.file_names.append(f)
+            self.groups_power.append(p)
+            self.groups_freq.append(freq)
+            self.auto_tags.append(tag)
+            self.group_folders.append(folder)
+            loaded += 1
+        return loaded
+
+    def file_stats(self, i):
+        stats = self._file_stats.get(i)
+        if stats is None:
+            stats = self._file_stats[i] = FileStats(self.dataframes[i])
+        return stats
+
+    @timed()
+    def aligned_spectra(self, indices, column, wavelengths):
+        """(files x wavelengths) values of `column` at each file's nearest rows."""
+        c = FileStats.COLUMNS.index(column)
+        out = np.empty((len(indices), len(wavelengths)))
+        for n, i in enumerate(indices):
+            fs = self.file_stats(i)
+            out[n] = fs.values[nearest_rows(fs.wavelengths, wavelengths), c]
+        return out
+
+    def folder_indices(self, folder_name):
+        return [i for i, folder in enumerate(self.group_folders) if os.path.basename(folder) == folder_name]
+
+    @timed()
+    def wavelength_cube(self, folder_name):
+        """Build (once) and return the WavelengthCube for a folder basename, or None."""
+        if folder_name in self._cubes:
+            return self._cubes[folder_name]
+        indices = self.folder_indices(folder_name)
+        if not indices:
+            return None
+
+        wavelengths = np.unique(np.concatenate([self.file_stats(i).wavelengths for i in indices]))
+        powers = sorted(set(self.groups_power[i] for i in indices), key=numeric_sort_key)
+        freqs = sorted(set(self.groups_freq[i] for i in indices), key=numeric_sort_key)
+        p_idx = {p: n for n, p in enumerate(powers)}
+        f_idx = {f: n for n, f in enumerate(freqs)}
+
+        shape = (len(powers), len(freqs), len(wavelengths))
+        sums = np.zeros(shape + (3,))           # mean, std_dev, cv_percent
+        counts = np.zeros(shape[:2])
+        std_sums = np.zeros(shape)              # non-zero std devs only (SNR)
+        std_counts = np.zeros(shape)
+        for i in indices:
+            fs = self.file_stats(i)
+            spectra = fs.values[nearest_rows(fs.wavelengths, wavelengths)]
+            cell = (p_idx[self.groups_power[i]], f_idx[self.groups_freq[i]])
+            sums[cell] += spectra
+            counts[cell] += 1
+            nonzero = spectra[:, 1] != 0
+            std_sums[cell] += np.where(nonzero, spectra[:, 1], 0.0)
+            std_counts[cell] += nonzero
+
+        values = np.full(shape + (4,), np.nan)
+        filled = counts > 0
+        values[filled, :, :3] = sums[filled] / counts[filled][:, None, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            mean_std = np.where(std_counts > 0, std_sums / std_counts, np.nan)
+            snr = np.abs(values[..., 0] / mean_std)
+        values[..., 3] = np.where(mean_std != 0, snr, np.nan)
+
+        cube = WavelengthCube(powers, freqs, wavelengths, values)
+        self._cubes[folder_name] = cube
+        return cube
+
+    def build_cubes(self):
+        for folder_name in sorted(set(os.path.basename(f) for f in self.group_folders)):
+            self.wavelength_cube(folder_name)
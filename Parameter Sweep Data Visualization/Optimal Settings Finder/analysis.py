@@ -1,19 +1,15 @@
-import numpy as np
-import pandas as pd
-
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 
-def is_electrical_df(df):
-    cols = [c.strip().lower() for c in df.columns]
-    return ("order parameter" in cols) and ("mean" in cols)
+import numpy as np
 
+from testbench_core.lazy import lazy_import
+from testbench_core.perf import timed
+from testbench_core.schemas import ELECTRICAL_STATS, OES_STATS
 
-def is_oes_df(df):
-    cols = [c.strip().lower() for c in df.columns]
-    return (
-        ("wavelength_index" in cols)
-        or ("wavelength index" in cols)
-        or (len(df.columns) >= 1)
-    ) and ("mean" in cols)
+# only needed by the response surface and optimal windows
+ndimage = lazy_import("scipy.ndimage")
+linalg = lazy_import("scipy.linalg")
 
 
 def normalize_dict_values_absolute(d):
@@ -32,136 +28,725 @@ def normalize_dict_values_absolute(d):
     return {k: abs(v) / denom for k, v in d.items()}
 
 
-def process_data(gui, wavelengths):
+class GroupAverager:
     """
-    This is the logic from DataLoaderGUI.find_optimal_range, but pulled out so
-    the GUI method just parses wavelengths and calls this.
-    Operates on gui.electrical_groups, gui.oes_groups, and fills:
-        gui.electrical_averaged
-        gui.electrical_normalized
-        gui.oes_averaged
-        gui.oes_normalized
-    """
-    # ---------- Electrical averaging ----------
-    gui.electrical_averaged.clear()
-    for key, dfs in gui.electrical_groups.items():
-        canonical_dfs = []
-        for df in dfs:
-            cols_map = {c.strip().lower(): c for c in df.columns}
-            if "order parameter" not in cols_map:
+    Running per-(power, freq) averages over a growing label axis (order
+    parameters or wavelength indices). Files are added once, at load time;
+    means are sums / counts with NaNs skipped, like groupby().mean().
+    `version` changes whenever data is added so callers can skip rework.
+    """
+
+    def __init__(self, n_stats):
+        self.n_stats = n_stats
+        self.clear()
+
+    def clear(self):
+        self.labels = []
+        self._label_idx = {}
+        self._last = (None, None)  # (labels, indices) of the previous file
+        self._sums = {}
+        self._counts = {}
+        self._seen = {}
+        self.version = 0
+
+    def _indices(self, labels):
+        last_labels, last_idx = self._last
+        if last_labels is not None and np.array_equal(labels, last_labels):
+            return last_idx  # files of one campaign share the same label axis
+        idx = np.empty(len(labels), dtype=int)
+        for n, lab in enumerate(labels.tolist()):
+            i = self._label_idx.get(lab)
+            if i is None:
+                i = self._label_idx[lab] = len(self.labels)
+                self.labels.append(lab)
+            idx[n] = i
+        self._last = (labels, idx)
+        return idx
+
+    def _grow(self, key):
+        n = len(self.labels)
+        if key not in self._sums:
+            self._sums[key] = np.zeros((n, self.n_stats))
+            self._counts[key] = np.zeros((n, self.n_stats))
+            self._seen[key] = np.zeros(n, dtype=bool)
+        elif len(self._seen[key]) < n:
+            extra = n - len(self._seen[key])
+            self._sums[key] = np.vstack([self._sums[key], np.zeros((extra, self.n_stats))])
+            self._counts[key] = np.vstack([self._counts[key], np.zeros((extra, self.n_stats))])
+            self._seen[key] = np.concatenate([self._seen[key], np.zeros(extra, dtype=bool)])
+
+    def add(self, key, labels, values):
+        idx = self._indices(labels)
+        self._grow(key)
+        valid = ~np.isnan(values)
+        np.add.at(self._sums[key], idx, np.where(valid, values, 0.0))
+        np.add.at(self._counts[key], idx, valid)
+        self._seen[key][idx] = True
+        self.version += 1
+
+    def keys(self):
+        return list(self._sums.keys())
+
+    def mean_matrix(self, keys):
+        """(sorted labels, means) with means shaped (len(keys), labels, stats); NaN where absent."""
+        order = sorted(range(len(self.labels)), key=self.labels.__getitem__)
+        out = np.full((len(keys), len(self.labels), self.n_stats), np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for r, key in enumerate(keys):
+                if key in self._sums:
+                    n = len(self._seen[key])
+                    out[r, :n] = self._sums[key] / self._counts[key]
+        return [self.labels[i] for i in order], out[:, order]
+
+    def mean(self, key):
+        """(labels, means) for the labels seen in this group, sorted like groupby()."""
+        seen = np.flatnonzero(self._seen[key])
+        seen = seen[np.argsort([self.labels[i] for i in seen], kind="stable")]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = self._sums[key][seen] / self._counts[key][seen]
+        return [self.labels[i] for i in seen], means
+
+
+def normalize_columns_absolute(values, invert=None):
+    """
+    Column-wise normalize_dict_values_absolute over a (sweep point x feature)
+    matrix: |v| / max|v| per column, 0 for an all-zero column, NaN stays
+    missing. Columns flagged in `invert` become 1 - v (lower is better).
+    """
+    a = np.abs(values)
+    if a.shape[0] == 0:
+        return a
+    denom = np.fmax.reduce(a, axis=0)  # NaN-skipping max without warnings
+    with np.errstate(divide="ignore", invalid="ignore"):
+        norm = np.where(denom > 0, a / denom, 0.0)
+    norm[np.isnan(values)] = np.nan
+    if invert is not None:
+        norm[:, invert] = 1.0 - norm[:, invert]
+    return norm
+
+
+def sweep_point_order(key):
+    p, f = key
+    return (p is None, p or 0.0, f is None, f or 0.0)
+
+
+class FeatureMatrix(Mapping):
+    """
+    Per-sweep-point features stored as one float array of shape
+    (sweep point, label, stat); `matrix` is its (sweep point x feature) view
+    with feature columns ordered label-major: (label, stat).
+
+    As a Mapping it reads like the old {(label, stat): {(power, freq): value}}
+    dicts: a feature maps to its non-NaN entries, features without any value
+    are absent.
+    """
+
+    def __init__(self, points=(), labels=(), stats=(), values=None):
+        self.points = list(points)
+        self.labels = list(labels)
+        self.stats = list(stats)
+        if values is None:
+            values = np.full((len(self.points), len(self.labels), len(self.stats)), np.nan)
+        self.values = values
+        self.features = [(lab, st) for lab in self.labels for st in self.stats]
+        self.column = {feat: c for c, feat in enumerate(self.features)}
+        self.row = {pt: r for r, pt in enumerate(self.points)}
+        self._present = ~np.isnan(self.matrix).all(axis=0) if self.points else np.zeros(len(self.features), bool)
+
+    @property
+    def matrix(self):
+        return self.values.reshape(len(self.points), len(self.features))
+
+    @property
+    def nbytes(self):
+        return self.values.nbytes
+
+    def __getitem__(self, feature):
+        col = self.column[feature]
+        if not self._present[col]:
+            raise KeyError(feature)
+        vals = self.matrix[:, col]
+        return {self.points[r]: float(vals[r]) for r in np.flatnonzero(~np.isnan(vals))}
+
+    def __contains__(self, feature):
+        col = self.column.get(feature)
+        return col is not None and bool(self._present[col])
+
+    def __iter__(self):
+        return (self.features[c] for c in np.flatnonzero(self._present))
+
+    def __len__(self):
+        return int(self._present.sum())
+
+    def normalized(self, invert_stats=()):
+        """New FeatureMatrix with every column normalized in one vectorized pass."""
+        invert = np.array([st in invert_stats for _, st in self.features], dtype=bool)
+        norm = normalize_columns_absolute(self.matrix, invert)
+        return FeatureMatrix(self.points, self.labels, self.stats, norm.reshape(self.values.shape))
+
+
+# candidate rows tested per block by pareto_front()
+PARETO_BLOCK = 256
+# criteria compared on every (candidate, front point) pair before only the surviving pairs are kept
+PARETO_DENSE_COLUMNS = 6
+
+
+def _dominated_by(cand, others):
+    """Mask of the rows of `cand` dominated by at least one row of `others`."""
+    dominated = np.zeros(len(cand), dtype=bool)
+    if not len(others):
+        return dominated
+    d = cand.shape[1]
+    dense = min(d, PARETO_DENSE_COLUMNS)
+    ge = others[None, :, 0] >= cand[:, None, 0]
+    for j in range(1, dense):
+        ge &= others[None, :, j] >= cand[:, None, j]
+    ci, oi = np.nonzero(ge)
+    # few pairs survive the first criteria; check the rest on those pairs only
+    for j in range(dense, d):
+        keep = others[oi, j] >= cand[ci, j]
+        ci, oi = ci[keep], oi[keep]
+    strict = (others[oi] > cand[ci]).any(axis=1)
+    dominated[ci[strict]] = True
+    return dominated
+
+
+@timed()
+def pareto_front(values):
+    """
+    Boolean mask of the non-dominated rows of `values` (n points x d
+    criteria, larger is better). A point is dominated when another point is
+    >= on every criterion and > on at least one; identical points do not
+    dominate each other.
+
+    d == 2 is a sort-and-sweep. d >= 3 sorts by the criterion sum (ties by
+    the criteria themselves), so a point can only be dominated by one
+    before it, and tests blocks of PARETO_BLOCK candidates at once against
+    the front found so far and against their own block. Dominance is
+    transitive, so a point dominated by a discarded point is also dominated
+    by a front point.
+    """
+    values = np.asarray(values, dtype=float)
+    n = values.shape[0]
+    mask = np.zeros(n, dtype=bool)
+    if n == 0:
+        return mask
+    if values.ndim == 1 or values.shape[1] == 1:
+        col = values.reshape(n)
+        return col == col.max()
+
+    if values.shape[1] == 2:
+        order = np.lexsort((-values[:, 1], -values[:, 0]))
+        x, y = values[order, 0], values[order, 1]
+        # runs of identical points share the best y seen before the run
+        new_run = np.ones(n, dtype=bool)
+        new_run[1:] = (x[1:] != x[:-1]) | (y[1:] != y[:-1])
+        run_id = np.cumsum(new_run) - 1
+        run_y = y[new_run]
+        best_before = np.concatenate(([-np.inf], np.maximum.accumulate(run_y)[:-1]))
+        mask[order] = y > best_before[run_id]
+        return mask
+
+    d = values.shape[1]
+    keys = tuple(-values[:, j] for j in reversed(range(d))) + (-values.sum(axis=1),)
+    order = np.lexsort(keys)
+    ordered = values[order]
+    front = np.empty_like(values)
+    size = 0
+    for start in range(0, n, PARETO_BLOCK):
+        block = ordered[start:start + PARETO_BLOCK]
+        keep = ~(_dominated_by(block, front[:size]) | _dominated_by(block, block))
+        kept = block[keep]
+        front[size:size + len(kept)] = kept
+        size += len(kept)
+        mask[order[start:start + PARETO_BLOCK][keep]] = True
+    return mask
+
+
+class ResponseSurface:
+    """
+    Quadratic response surface z ~ 1 + p + f + p^2 + p*f + f^2 over the
+    measured cells of a power x frequency score grid, evaluated on a fine
+    grid between them.
+
+    Everything that depends only on which cells are present is built once:
+    the Cholesky factor of X'X and the fine-grid leverage g' (X'X)^-1 g used
+    for the standard error. A new score vector (e.g. after a weight change)
+    only needs X'z, one triangular solve pair and a (fine grid x 6) product.
+    Raises ValueError when the cells cannot support a quadratic fit.
+    """
+
+    N_TERMS = 6
+
+    def __init__(self, powers, freqs, present, resolution=120):
+        present = np.asarray(present, dtype=bool)
+        P, F = np.meshgrid(np.asarray(powers, dtype=float), np.asarray(freqs, dtype=float), indexing="ij")
+        p, f = P[present], F[present]
+        if p.size < self.N_TERMS or np.unique(p).size < 3 or np.unique(f).size < 3:
+            raise ValueError("need at least 3 powers and 3 frequencies with data for a quadratic fit")
+
+        self.present = present
+        self.n = p.size
+        self._p_span = (float(np.min(powers)), float(np.max(powers)))
+        self._f_span = (float(np.min(freqs)), float(np.max(freqs)))
+        self.fine_powers = np.linspace(*self._p_span, resolution)
+        self.fine_freqs = np.linspace(*self._f_span, resolution)
+
+        self.X = self._design(p, f)
+        try:
+            self._factor = linalg.cho_factor(self.X.T @ self.X)
+        except linalg.LinAlgError as e:
+            raise ValueError("sweep points do not determine a quadratic surface") from e
+
+        FP, FF = np.meshgrid(self.fine_powers, self.fine_freqs, indexing="ij")
+        self._G = self._design(FP.ravel(), FF.ravel())
+        self._leverage = np.einsum("ij,ji->i", self._G, linalg.cho_solve(self._factor, self._G.T))
+
+    def _design(self, p, f):
+        # scale both axes to [-1, 1] so the normal equations stay well conditioned
+        u = self._scale(p, self._p_span)
+        v = self._scale(f, self._f_span)
+        return np.column_stack([np.ones_like(u), u, v, u * u, u * v, v * v])
+
+    @staticmethod
+    def _scale(x, span):
+        lo, hi = span
+        return (2.0 * x - (lo + hi)) / (hi - lo) if hi > lo else np.zeros_like(x)
+
+    @timed()
+    def fit(self, z):
+        """
+        z: scores of the present cells (grid[present]).
+        Returns a dict with the fine-grid prediction and standard error
+        (shape len(fine_powers) x len(fine_freqs)), the predicted optimum
+        and the fit RMSE.
+        """
+        z = np.asarray(z, dtype=float)
+        beta = linalg.cho_solve(self._factor, self.X.T @ z)
+        resid = z - self.X @ beta
+        dof = self.n - self.N_TERMS
+        sigma2 = float(resid @ resid) / dof if dof > 0 else np.nan
+        shape = (self.fine_powers.size, self.fine_freqs.size)
+        pred = (self._G @ beta).reshape(shape)
+        se = np.sqrt(sigma2 * self._leverage).reshape(shape)
+        i, j = np.unravel_index(np.argmax(pred), shape)
+        return {
+            "prediction": pred,
+            "stderr": se,
+            "optimum": {
+                "power": float(self.fine_powers[i]),
+                "freq": float(self.fine_freqs[j]),
+                "value": float(pred[i, j]),
+                "stderr": float(se[i, j]),
+            },
+            "rmse": float(np.sqrt(np.mean(resid ** 2))),
+        }
+
+
+class ScoringEngine:
+    """
+    Combined scores for every sweep point from selection/weight vectors over
+    the feature matrices: one matrix-vector product per matrix instead of
+    accumulating per-feature dicts. The power x frequency grid layout of the
+    sweep points is computed once, when the engine is built.
+    """
+
+    def __init__(self, matrices=()):
+        self.matrices = list(matrices)
+        points = set()
+        for m in self.matrices:
+            points.update(pt for pt in m.points if pt[0] is not None and pt[1] is not None)
+        self.points = sorted(points, key=sweep_point_order)
+        self.powers = sorted({p for p, _ in self.points})
+        self.freqs = sorted({f for _, f in self.points})
+        p_idx = {p: i for i, p in enumerate(self.powers)}
+        f_idx = {f: i for i, f in enumerate(self.freqs)}
+        self.point_rows = np.array([p_idx[p] for p, _ in self.points], dtype=int)
+        self.point_cols = np.array([f_idx[f] for _, f in self.points], dtype=int)
+        index = {pt: i for i, pt in enumerate(self.points)}
+        self._pareto = {}  # selection bytes -> front mask over self.points
+        self._surfaces = {}  # (powers, freqs, present bytes) -> ResponseSurface or None
+        # for each matrix: its rows that land on the grid, and where they land
+        self._maps = []
+        for m in self.matrices:
+            rows = [r for r, pt in enumerate(m.points) if pt in index]
+            self._maps.append((np.array(rows, dtype=int), np.array([index[m.points[r]] for r in rows], dtype=int)))
+
+    def scores(self, selections, weights):
+        """
+        selections / weights: one boolean / float vector per matrix, aligned
+        with its feature columns. Returns (scores, present) over self.points;
+        a point is present when any selected feature has a value there.
+        """
+        total = np.zeros(len(self.points))
+        present = np.zeros(len(self.points), dtype=bool)
+        for m, (rows, targets), sel, w in zip(self.matrices, self._maps, selections, weights):
+            cols = np.flatnonzero(sel)
+            if cols.size == 0 or rows.size == 0:
                 continue
+            sub = m.matrix[np.ix_(rows, cols)]
+            total[targets] += np.nan_to_num(sub, nan=0.0) @ np.asarray(w, dtype=float)[cols]
+            present[targets] |= ~np.isnan(sub).all(axis=1)
+        return total, present
+
+    def criteria(self, selections):
+        """
+        Selected feature columns of every matrix gathered onto self.points:
+        returns (features, values) with values shaped (n_points, n_selected),
+        NaN where a point has no value for a criterion.
+        """
+        features, blocks = [], []
+        for m, (rows, targets), sel in zip(self.matrices, self._maps, selections):
+            cols = np.flatnonzero(sel)
+            block = np.full((len(self.points), cols.size), np.nan)
+            if cols.size and rows.size:
+                block[targets] = m.matrix[np.ix_(rows, cols)]
+            features.extend(m.features[c] for c in cols)
+            blocks.append(block)
+        values = np.hstack(blocks) if blocks else np.empty((len(self.points), 0))
+        return features, values
+
+    @timed()
+    def pareto(self, selections):
+        """
+        Non-dominated sweep points over the selected criteria, ignoring
+        weights. Points missing any selected criterion are left out.
+        Returns (features, values, mask); the mask is cached per selection.
+        """
+        features, values = self.criteria(selections)
+        key = b"".join(np.packbits(np.asarray(sel, dtype=bool)).tobytes() + b"|" for sel in selections)
+        mask = self._pareto.get(key)
+        if mask is None:
+            complete = ~np.isnan(values).any(axis=1) if values.shape[1] else np.zeros(len(self.points), bool)
+            mask = np.zeros(len(self.points), dtype=bool)
+            mask[complete] = pareto_front(values[complete])
+            self._pareto[key] = mask
+        return features, values, mask
+
+    @timed()
+    def weight_sensitivity(self, selections, n_samples=5000, seed=None, block=2048):
+        """
+        Win frequency of every point when the weights of the selected
+        criteria are drawn uniformly from the simplex (Dirichlet(1, ..., 1)).
+        Each block of weight vectors is scored with one matrix product
+        (points x criteria) @ (criteria x samples).
+        """
+        _, values = self.criteria(selections)
+        present = ~np.isnan(values).all(axis=1) if values.shape[1] else np.zeros(len(self.points), bool)
+        wins = np.zeros(len(self.points), dtype=np.int64)
+        if not present.any():
+            return wins / max(n_samples, 1)
+        filled = np.nan_to_num(values[present], nan=0.0)
+        rows = np.flatnonzero(present)
+        rng = np.random.default_rng(seed)
+        for start in range(0, n_samples, block):
+            b = min(block, n_samples - start)
+            w = rng.dirichlet(np.ones(filled.shape[1]), size=b)
+            best = (filled @ w.T).argmax(axis=0)
+            wins += np.bincount(rows[best], minlength=len(self.points))
+        return wins / n_samples
 
-            idx_col = cols_map["order parameter"]
-
-            def find_col(possible):
-                for n in possible:
-                    if n in cols_map:
-                        return cols_map[n]
-                return None
-
-            mean_col = find_col(["mean"])
-            cv_col   = find_col(["%cv", "cv", "cv_percent", "cv percent"])
-            min_col  = find_col(["min"])
-            max_col  = find_col(["max"])
-
-            can = pd.DataFrame(index=df[idx_col].astype(str))
-            can["Mean"] = pd.to_numeric(df[mean_col], errors="coerce").values if mean_col else np.nan
-            can["%CV"]  = pd.to_numeric(df[cv_col],   errors="coerce").values if cv_col else np.nan
-            can["Min"]  = pd.to_numeric(df[min_col],  errors="coerce").values if min_col else np.nan
-            can["Max"]  = pd.to_numeric(df[max_col],  errors="coerce").values if max_col else np.nan
-            can.index.name = "Order Parameter"
-            canonical_dfs.append(can)
-
-        if not canonical_dfs:
-            continue
-
-        concat = pd.concat(canonical_dfs, axis=0, keys=range(len(canonical_dfs)))
-        avg = concat.groupby(level=1).mean()
-        gui.electrical_averaged[key] = avg
-
-    # Electrical normalization
-    gui.electrical_normalized.clear()
-    order_params = set()
-    for df in gui.electrical_averaged.values():
-        order_params.update(df.index.astype(str).tolist())
-    stats = ["Mean", "%CV", "Min", "Max"]
-
-    for op in order_params:
-        for stat in stats:
-            vals = {}
-            for key, df in gui.electrical_averaged.items():
-                if op in df.index and stat in df.columns:
-                    v = df.loc[op, stat]
-                    if pd.isna(v):
-                        continue
-                    vals[key] = float(v)
-            if vals:
-                norm = normalize_dict_values_absolute(vals)
-                # Invert %CV only
-                if stat == "%CV":
-                    norm = {k: 1 - v for k, v in norm.items()}
-                gui.electrical_normalized[(op, stat)] = norm
-
-    # ---------- OES averaging ----------
-    gui.oes_averaged.clear()
-    for key, dfs in gui.oes_groups.items():
-        canon = []
-        for df in dfs:
-            cols_map = {c.strip().lower(): c for c in df.columns}
-
-            if "wavelength_index" in cols_map:
-                idx_col = cols_map["wavelength_index"]
-            elif "wavelength index" in cols_map:
-                idx_col = cols_map["wavelength index"]
-            else:
-                idx_col = df.columns[0]
-
-            mean_col = cols_map.get("mean")
-            std_col = cols_map.get("std_dev") or cols_map.get("std dev") or cols_map.get("std")
-            cv_col  = cols_map.get("cv_percent") or cols_map.get("cv percent") or cols_map.get("cv")
-
-            can = pd.DataFrame()
+    def surface(self, powers, freqs, present):
+        """Cached ResponseSurface for a grid layout, or None if it cannot be fitted."""
+        key = (tuple(powers), tuple(freqs), np.packbits(present).tobytes())
+        if key not in self._surfaces:
             try:
-                can["wavelength_index"] = df[idx_col].astype(int).values
-            except Exception:
-                can["wavelength_index"] = np.arange(len(df))
-
-            can["mean"] = pd.to_numeric(df[mean_col], errors="coerce").values if mean_col else np.nan
-            can["std_dev"] = pd.to_numeric(df[std_col], errors="coerce").values if std_col else np.nan
-            can["cv_percent"] = pd.to_numeric(df[cv_col], errors="coerce").values if cv_col else np.nan
-
-            can = can.set_index("wavelength_index")
-            canon.append(can)
-
-        if canon:
-            concat = pd.concat(canon, axis=0, keys=range(len(canon)))
-            avg = concat.groupby(level=1).mean()
-            gui.oes_averaged[key] = avg
-
-    # ---------- OES normalization ----------
-    gui.oes_normalized.clear()
-    if wavelengths:
-        for wl in wavelengths:
-            statmaps = {"mean": {}, "std_dev": {}, "cv_percent": {}, "SNR": {}}
-            for key, df in gui.oes_averaged.items():
-                if wl in df.index:
-                    m = df.loc[wl, "mean"] if "mean" in df.columns else np.nan
-                    s = df.loc[wl, "std_dev"] if "std_dev" in df.columns else np.nan
-                    cv = df.loc[wl, "cv_percent"] if "cv_percent" in df.columns else np.nan
-
-                    if not pd.isna(m):
-                        statmaps["mean"][key] = float(m)
-                    if not pd.isna(s):
-                        statmaps["std_dev"][key] = float(s)
-                    if not pd.isna(cv):
-                        statmaps["cv_percent"][key] = float(cv)
-                    if (not pd.isna(m)) and (not pd.isna(s)) and s != 0:
-                        statmaps["SNR"][key] = float(abs(m / s))
-
-            for stat, mapping in statmaps.items():
-                if mapping:
-                    norm = normalize_dict_values_absolute(mapping)
-                    # Invert metrics where lower is better
-                    if stat in ("std_dev", "cv_percent"):
-                        norm = {k: 1 - v for k, v in norm.items()}
-                    gui.oes_normalized[(wl, stat)] = norm
\ No newline at end of file
+                self._surfaces[key] = ResponseSurface(powers, freqs, present)
+            except ValueError:
+                self._surfaces[key] = None
+        return self._surfaces[key]
+
+    @timed()
+    def grid(self, selections, weights):
+        """
+        (powers, freqs, grid): sorted powers and frequencies that have a
+        present point, and the score grid of shape (len(powers), len(freqs))
+        with NaN where a point is missing.
+        """
+        total, present = self.scores(selections, weights)
+        grid = np.full((len(self.powers), len(self.freqs)), np.nan)
+        grid[self.point_rows[present], self.point_cols[present]] = total[present]
+        keep_p = ~np.isnan(grid).all(axis=1)
+        keep_f = ~np.isnan(grid).all(axis=0)
+        powers = [p for p, k in zip(self.powers, keep_p) if k]
+        freqs = [f for f, k in zip(self.freqs, keep_f) if k]
+        return powers, freqs, grid[np.ix_(keep_p, keep_f)]
+
+
+@timed()
+def optimal_windows(powers, freqs, grid, threshold):
+    """
+    Connected regions of the score grid at or above `threshold` (4-connected,
+    NaN cells never qualify). Returns one dict per region, best peak first:
+    label, power/freq extents of its cells, cell count and peak score.
+    """
+    grid = np.asarray(grid, dtype=float)
+    with np.errstate(invalid="ignore"):
+        mask = grid >= threshold
+    labels, n = ndimage.label(mask)
+    if n == 0:
+        return []
+    # group cells by label with one sort, then reduce each run
+    flat = labels.ravel()
+    cells = np.flatnonzero(flat)
+    cells = cells[np.argsort(flat[cells], kind="stable")]
+    starts = np.searchsorted(flat[cells], np.arange(1, n + 1))
+    rows, cols = np.divmod(cells, grid.shape[1])
+    sizes = np.diff(np.r_[starts, cells.size])
+    peaks = np.maximum.reduceat(grid.ravel()[cells], starts)
+    r0, r1 = np.minimum.reduceat(rows, starts), np.maximum.reduceat(rows, starts)
+    c0, c1 = np.minimum.reduceat(cols, starts), np.maximum.reduceat(cols, starts)
+    windows = [
+        {
+            "power_start": powers[int(r0[k])],
+            "power_end": powers[int(r1[k])],
+            "freq_start": freqs[int(c0[k])],
+            "freq_end": freqs[int(c1[k])],
+            "cells": int(sizes[k]),
+            "peak": float(peaks[k]),
+        }
+        for k in range(n)
+    ]
+    windows.sort(key=lambda w: -w["peak"])
+    for k, w in enumerate(windows, start=1):
+        w["label"] = f"Window {k}"
+    return windows
+
+
+OES_FEATURE_STATS = OES_STATS + ["SNR"]
+
+
+@timed()
+def process_data(gui):
+    """
+    This is the logic from DataLoaderGUI.find_optimal_range, but pulled out so
+    the GUI method just parses wavelengths and calls this.
+    Operates on gui.electrical_avg / gui.oes_avg (filled at load time) and fills:
+        gui.electrical_averaged    FeatureMatrix of (power,freq) means
+        gui.electrical_normalized  FeatureMatrix of normalized means
+        gui.oes_averaged           FeatureMatrix over the full spectrum (+ SNR)
+        gui.oes_normalized         FeatureMatrix of normalized OES features
+    The OES tensors cover every wavelength, so changing the wavelength list
+    needs no reprocessing. Only the parts whose inputs changed are redone.
+    """
+    done = gui.processed_state
+
+    # ---------- Electrical averaging + normalization ----------
+    if done.get("electrical") != gui.electrical_avg.version:
+        points = sorted(gui.electrical_avg.keys(), key=sweep_point_order)
+        labels, means = gui.electrical_avg.mean_matrix(points)
+        gui.electrical_averaged = FeatureMatrix(points, labels, ELECTRICAL_STATS, means)
+        # Invert %CV only
+        gui.electrical_normalized = gui.electrical_averaged.normalized(invert_stats=("%CV",))
+        done["electrical"] = gui.electrical_avg.version
+
+    # ---------- OES averaging + normalization (all wavelengths) ----------
+    if done.get("oes") != gui.oes_avg.version:
+        points = sorted(gui.oes_avg.keys(), key=sweep_point_order)
+        labels, means = gui.oes_avg.mean_matrix(points)
+        m, s = means[..., 0], means[..., 1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            snr = np.where(s != 0, np.abs(m / s), np.nan)
+        values = np.concatenate([means, snr[..., None]], axis=2)
+        gui.oes_averaged = FeatureMatrix(points, labels, OES_FEATURE_STATS, values)
+        # Invert metrics where lower is better
+        gui.oes_normalized = gui.oes_averaged.normalized(invert_stats=("std_dev", "cv_percent"))
+        done["oes"] = gui.oes_avg.version
+
+    if done.get("engine") != (done["electrical"], done["oes"]):
+        gui.scoring_engine = ScoringEngine([gui.electrical_normalized, gui.oes_normalized])
+        done["engine"] = (done["electrical"], done["oes"])
+
+
+def feature_memory_bytes(gui):
+    """Bytes held by the averaged + normalized feature tensors."""
+    return {
+        "electrical": gui.electrical_averaged.nbytes + gui.electrical_normalized.nbytes,
+        "oes": gui.oes_averaged.nbytes + gui.oes_normalized.nbytes,
+    }
+
+
+# ---------- Bootstrap stability of the optimum ----------
+class BootstrapSource:
+    """
+    One data source (electrical or OES) prepared for bootstrap resampling.
+
+    Files are sorted by (power, freq) cell and reduced to per-file sums and
+    counts of the selected base columns, so a resampled cell mean is just
+    sum(sums) / sum(counts) over the drawn files, exactly like GroupAverager.
+    Each term is a normalized criterion: |mean[num]| or, for SNR,
+    |mean[num] / mean[den]|; normalization runs over every cell of the
+    source, as in FeatureMatrix.normalized().
+    """
+
+    def __init__(self, sums, counts, cells, targets, num_cols, den_cols, invert, weights):
+        self.sums = sums            # (n_files, n_base) per-file sums, files sorted by cell
+        self.counts = counts        # (n_files, n_base)
+        cells = np.asarray(cells, dtype=int)
+        self.starts = np.flatnonzero(np.r_[True, cells[1:] != cells[:-1]])
+        sizes = np.diff(np.r_[self.starts, len(cells)])
+        self.file_start = np.repeat(self.starts, sizes)
+        self.file_size = np.repeat(sizes, sizes)
+        self.targets = targets      # (n_cells,) engine point index of each cell, -1 if off-grid
+        self.num_cols = num_cols
+        self.den_cols = den_cols    # -1 where the term is a plain mean
+        self.invert = invert
+        self.weights = weights
+
+    def cell_scores(self, draws):
+        """draws: (B, n_files) file indices. Returns (B, n_cells) weighted scores."""
+        sums = np.add.reduceat(self.sums[draws], self.starts, axis=1)
+        counts = np.add.reduceat(self.counts[draws], self.starts, axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = sums / counts
+            num = means[..., self.num_cols]
+            den = means[..., np.maximum(self.den_cols, 0)]
+            ratio = np.where(den != 0, np.abs(num / den), np.nan)
+            feat = np.where(self.den_cols >= 0, ratio, np.abs(num))
+            scale = np.fmax.reduce(feat, axis=1, keepdims=True)
+            norm = np.where(scale > 0, feat / scale, 0.0)
+        norm[np.isnan(feat)] = np.nan
+        norm = np.where(self.invert, 1.0 - norm, norm)
+        return np.nan_to_num(norm, nan=0.0) @ self.weights
+
+    def draw(self, rng, n_resamples):
+        """Resample files with replacement within each cell: (B, n_files) indices."""
+        u = rng.random((n_resamples, len(self.file_start)))
+        return self.file_start + (u * self.file_size).astype(int)
+
+
+class BootstrapProblem:
+    """Sources plus the engine points they score, for bootstrap_optimum()."""
+
+    def __init__(self, sources, n_points, present):
+        self.sources = sources
+        self.n_points = n_points
+        self.present = present
+
+    def wins(self, n_resamples, seed=None, block=256):
+        """How often each engine point has the best combined score."""
+        rng = np.random.default_rng(seed)
+        wins = np.zeros(self.n_points, dtype=np.int64)
+        for start in range(0, n_resamples, block):
+            b = min(block, n_resamples - start)
+            total = np.zeros((b, self.n_points))
+            for src in self.sources:
+                scores = src.cell_scores(src.draw(rng, b))
+                on_grid = src.targets >= 0
+                total[:, src.targets[on_grid]] += scores[:, on_grid]
+            total[:, ~self.present] = -np.inf
+            wins += np.bincount(total.argmax(axis=1), minlength=self.n_points)
+        return wins
+
+    def scores(self):
+        """Combined scores of the observed data (no resampling), for checking."""
+        total = np.zeros(self.n_points)
+        for src in self.sources:
+            draws = np.arange(len(src.file_start))[None, :]
+            on_grid = src.targets >= 0
+            total[src.targets[on_grid]] += src.cell_scores(draws)[0, on_grid]
+        return total
+
+
+def _per_file_sums(files, labels, columns):
+    """Per-file sums / counts of (label, stat column) pairs, duplicates summed."""
+    want = np.array(labels, dtype=object)
+    sums = np.zeros((len(files), len(columns)))
+    counts = np.zeros((len(files), len(columns)))
+    lab_idx = np.array([labels.index(lab) for lab, _ in columns], dtype=int)
+    stat_idx = np.array([st for _, st in columns], dtype=int)
+    for i, item in enumerate(files):
+        match = (item["labels"].astype(object)[:, None] == want[None, :]).astype(float)
+        values = item["values"]
+        valid = ~np.isnan(values)
+        s = match.T @ np.where(valid, values, 0.0)   # (labels, n_stats)
+        c = match.T @ valid
+        sums[i] = s[lab_idx, stat_idx]
+        counts[i] = c[lab_idx, stat_idx]
+    return sums, counts
+
+
+def _bootstrap_source(files, matrix, sel, weights, invert_stats, engine_index):
+    """BootstrapSource for the selected features of one normalized FeatureMatrix."""
+    cols = np.flatnonzero(sel)
+    if cols.size == 0 or not files:
+        return None
+    stats = list(matrix.stats)
+    base_stats = [st for st in stats if st != "SNR"]
+    features = [matrix.features[c] for c in cols]
+
+    labels = sorted({lab for lab, _ in features}, key=str)
+    base, num_cols, den_cols = [], [], []
+
+    def base_col(lab, st):
+        key = (lab, base_stats.index(st))
+        if key not in base:
+            base.append(key)
+        return base.index(key)
+
+    for lab, st in features:
+        if st == "SNR":
+            num_cols.append(base_col(lab, "mean"))
+            den_cols.append(base_col(lab, "std_dev"))
+        else:
+            num_cols.append(base_col(lab, st))
+            den_cols.append(-1)
+
+    point_of = {pt: i for i, pt in enumerate(matrix.points)}
+    files = [f for f in files if (f["power"], f["freq"]) in point_of]
+    files.sort(key=lambda f: point_of[(f["power"], f["freq"])])
+    cells = np.array([point_of[(f["power"], f["freq"])] for f in files], dtype=int)
+    sums, counts = _per_file_sums(files, labels, base)
+
+    # cells are every matrix point that has files; ranks keep them contiguous
+    used, cell_rank = np.unique(cells, return_inverse=True)
+    targets = np.array([engine_index.get(matrix.points[c], -1) for c in used], dtype=int)
+    return BootstrapSource(
+        sums, counts, cell_rank, targets,
+        np.array(num_cols), np.array(den_cols),
+        np.array([st in invert_stats for _, st in features]),
+        np.asarray(weights, dtype=float)[cols],
+    )
+
+
+@timed()
+def build_bootstrap_problem(gui, selections, weights):
+    """
+    Bootstrap inputs for the current selection/weights from the per-file
+    canonical arrays in gui.electrical_files / gui.oes_files.
+    """
+    engine = gui.scoring_engine
+    engine_index = {pt: i for i, pt in enumerate(engine.points)}
+    specs = (
+        (gui.electrical_files, gui.electrical_normalized, ("%CV",)),
+        (gui.oes_files, gui.oes_normalized, ("std_dev", "cv_percent")),
+    )
+    sources = []
+    for (files, matrix, invert), sel, w in zip(specs, selections, weights):
+        src = _bootstrap_source(files, matrix, sel, w, invert, engine_index)
+        if src is not None:
+            sources.append(src)
+    _, present = engine.scores(selections, weights)
+    return BootstrapProblem(sources, len(engine.points), present)
+
+
+def _bootstrap_wins(problem, n_resamples, seed):
+    return problem.wins(n_resamples, seed)
+
+
+@timed()
+def bootstrap_optimum(problem, n_resamples=2000, seed=None, workers=1):
+    """
+    Probability that each engine point is the optimum across n_resamples
+    within-cell bootstrap resamples. With workers > 1 the resamples are
+    split across a process pool, each chunk with its own child seed.
+    """
+    if workers <= 1:
+        wins = problem.wins(n_resamples, seed)
+    else:
+        seeds = np.random.SeedSequence(seed).spawn(workers)
+        chunks = [n_resamples // workers + (i < n_resamples % workers) for i in range(workers)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = pool.map(_bootstrap_wins, [problem] * workers, chunks, seeds)
+            wins = np.sum(list(parts), axis=0)
+    return wins / max(n_resamples, 1)
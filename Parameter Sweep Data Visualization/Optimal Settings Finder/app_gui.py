@@ -1,8 +1,9 @@
 # app_gui.py
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from collections import defaultdict
 import os
+import queue
+import threading
 import numpy as np
 import matplotlib
 matplotlib.use("TkAgg")
@@ -10,11 +11,28 @@ from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 # Import logic modules
-from analysis import process_data
-from plotting import clear_plot_gui, update_heatmap_gui
-from data_loading import load_electrical_data, load_oes_data
+from analysis import (
+    process_data, feature_memory_bytes, GroupAverager, FeatureMatrix, ScoringEngine,
+    ELECTRICAL_STATS, OES_STATS, OES_FEATURE_STATS,
+)
+from plotting import clear_plot_gui, update_heatmap_gui, bootstrap_optimum_gui, weight_sensitivity_gui
+from data_loading import (
+    read_folder, add_records, export_pareto_front, export_windows_numberbar, TABLE_NAMES,
+)
+from testbench_core import perf
+from testbench_core.heatmap_view import HeatmapView
+from testbench_core.index import SweepIndex
+from testbench_core.perf_window import show_performance_window
+from checklist import CriteriaChecklist
+
+# pandas and SciPy load on first use; main.py preloads them in the
+# background once the window is up.
+PRELOAD = ("pandas", "scipy.ndimage", "scipy.linalg")
 
 class DataLoaderGUI:
+    LOAD_POLL_MS = 50
+    MAX_WEIGHT_SLIDERS = 12
+
     def __init__(self, root):
         self.root = root
         root.title("Electrical + OES Data Loader and Colormap Viewer")
@@ -24,19 +42,33 @@ class DataLoaderGUI:
         self.electrical_files = []  # list of dicts: {path,file,power,freq,df}
         self.oes_files = []
         # grouped by (power,freq)
-        self.electrical_groups = defaultdict(list)
-        self.oes_groups = defaultdict(list)
+        self.electrical_groups = SweepIndex()
+        self.oes_groups = SweepIndex()
+        # running (power,freq) averages of the canonical arrays, filled at load time
+        self.electrical_avg = GroupAverager(len(ELECTRICAL_STATS))
+        self.oes_avg = GroupAverager(len(OES_STATS))
+        self.processed_state = {}  # input versions used by the last process_data()
 
         # results
-        self.electrical_averaged = {}   # (p,f) -> DataFrame (indexed by Order Parameter)
-        self.electrical_normalized = {} # (order_param, stat) -> {(p,f): normalized_value}
-
-        self.oes_averaged = {}   # (p,f) -> DataFrame (indexed by wavelength_index)
-        self.oes_normalized = {} # (wavelength, stat) -> {(p,f): normalized_value}
-
-        # UI state: checkbox variables
-        self.elec_check_vars = {}  # (orderparam,stat) -> tk.IntVar
-        self.oes_check_vars = {}   # (wavelength,stat) -> tk.IntVar
+        self.electrical_averaged = FeatureMatrix()    # (p,f) x (order_param, stat) means
+        self.electrical_normalized = FeatureMatrix()  # (order_param, stat) -> {(p,f): normalized_value}
+
+        self.oes_averaged = FeatureMatrix()    # (p,f) x (wavelength, stat) over the full spectrum
+        self.oes_normalized = FeatureMatrix()  # (wavelength, stat) -> {(p,f): normalized_value}
+        self.scoring_engine = ScoringEngine()  # weighted sweep-point scores over both matrices
+
+        # UI state: criteria checklists (built in build_gui) and slider weights
+        self.criterion_weights = {}  # ("elec"|"oes", label, stat) -> tk.DoubleVar
+        self._update_job = None
+        self.pareto_front = None  # last front drawn by update_heatmap_gui()
+        self.surface_fit = None   # last response-surface fit drawn by update_heatmap_gui()
+        self.optimum_overlay = None  # P(optimum) per sweep point from a robustness run
+        self.optimal_windows = None  # connected regions above the window threshold
+
+        # background loads: kind -> folder, results come back through the queue
+        self._loads = {}
+        self._load_queue = queue.Queue()
+        self._poll_job = None
 
         # default folder config
         self.config_path = "default_folder.cfg"
@@ -105,19 +137,56 @@ class DataLoaderGUI:
         ttk.Button(btncol, text="Browse", command=self.set_default_folder).pack(pady=6)
         ttk.Button(btncol, text="Load Electrical Data", command=self.load_electrical_folder).pack(pady=6)
         ttk.Button(btncol, text="Load OES Data", command=self.load_oes_folder).pack(pady=6)
+        ttk.Button(btncol, text="Load Both...", command=self.load_both_folders).pack(pady=6)
 
         # Middle: wavelength entry, processing, plotting, clear
         midframe = ttk.Frame(main, padding=(0, 8, 0, 8))
         midframe.pack(fill="x")
 
-        ttk.Label(midframe, text="Wavelengths (comma-separated indices):").pack(side="left")
+        ttk.Label(midframe, text="OES wavelengths (optional, comma-separated indices):").pack(side="left")
         self.wavelength_entry = ttk.Entry(midframe, width=40)
         self.wavelength_entry.pack(side="left", padx=(6, 12))
 
-        ttk.Button(midframe, text="Process Data", command=self.find_optimal_range).pack(side="left", padx=(0, 6))
+        self.process_button = ttk.Button(midframe, text="Process Data", command=self.find_optimal_range)
+        self.process_button.pack(side="left", padx=(0, 6))
         ttk.Button(midframe, text="Find Optimal Range", command=self.update_heatmap).pack(side="left")
         ttk.Button(midframe, text="Clear Plot", command=self.clear_plot).pack(side="left", padx=(6, 0))
 
+        self.pareto_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            midframe, text="Pareto Front", variable=self.pareto_var, command=self.schedule_heatmap_update
+        ).pack(side="left", padx=(12, 0))
+        ttk.Button(midframe, text="Export Front", command=self.export_front).pack(side="left", padx=(6, 0))
+
+        self.surface_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            midframe, text="Response Surface", variable=self.surface_var, command=self.schedule_heatmap_update
+        ).pack(side="left", padx=(12, 0))
+
+        # Robustness of the optimum
+        robustframe = ttk.Frame(main, padding=(0, 0, 0, 8))
+        robustframe.pack(fill="x")
+
+        ttk.Label(robustframe, text="Samples:").pack(side="left")
+        self.samples_var = tk.IntVar(value=2000)
+        ttk.Entry(robustframe, textvariable=self.samples_var, width=8).pack(side="left", padx=(6, 12))
+        self.parallel_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(robustframe, text="Use all CPU cores", variable=self.parallel_var).pack(side="left")
+        ttk.Button(robustframe, text="Bootstrap Optimum", command=self.run_bootstrap).pack(side="left", padx=(12, 0))
+        ttk.Button(robustframe, text="Weight Sensitivity", command=self.run_weight_sensitivity).pack(side="left", padx=(6, 0))
+        ttk.Button(robustframe, text="Clear Overlay", command=self.clear_overlay).pack(side="left", padx=(6, 0))
+
+        self.windows_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            robustframe, text="Optimal Windows \u2265", variable=self.windows_var, command=self.schedule_heatmap_update
+        ).pack(side="left", padx=(24, 0))
+        self.threshold_var = tk.StringVar(value="0.8")
+        threshold_entry = ttk.Entry(robustframe, textvariable=self.threshold_var, width=6)
+        threshold_entry.pack(side="left", padx=(4, 0))
+        threshold_entry.bind("<Return>", lambda _e: self.schedule_heatmap_update())
+        ttk.Button(robustframe, text="Export Windows", command=self.export_windows).pack(side="left", padx=(6, 0))
+        ttk.Button(robustframe, text="Performance", command=lambda: show_performance_window(self.root)).pack(side="right")
+
         # lower layout
         lower = ttk.Frame(main)
         lower.pack(fill="both", expand=True)
@@ -132,58 +201,56 @@ class DataLoaderGUI:
         self.fig = Figure(figsize=(6, 5))
         self.ax = self.fig.add_subplot(111)
         self.ax.text(0.5, 0.5, "No data to display\nRun 'Find Optimal Range'", ha="center", va="center")
-        self.canvas = FigureCanvasTkAgg(self.fig, master=self.heatmap_container)
+        self.canvas = perf.instrument_canvas(FigureCanvasTkAgg(self.fig, master=self.heatmap_container))
         self.canvas.get_tk_widget().pack(fill="both", expand=True)
+        self.heatmap_view = HeatmapView(self.fig, self.canvas)
 
         # Checklist
         checklist_frame = ttk.Frame(lower)
         checklist_frame.pack(side="left", fill="y")
 
-        self.elec_check_frame = ttk.LabelFrame(checklist_frame, text="Electrical Checklist", padding=6)
-        self.elec_check_frame.pack(fill="y", padx=4, pady=4)
+        self.elec_checklist = CriteriaChecklist(
+            checklist_frame, "Electrical Checklist", "Order Parameter", ELECTRICAL_STATS,
+            on_change=self.on_criteria_changed, rows=8
+        )
+        self.elec_checklist.frame.pack(fill="x", padx=4, pady=4)
 
-        self.oes_check_frame = ttk.LabelFrame(checklist_frame, text="OES Checklist (user wavelengths)", padding=6)
-        self.oes_check_frame.pack(fill="y", padx=4, pady=4)
+        self.oes_checklist = CriteriaChecklist(
+            checklist_frame, "OES Checklist", "Wavelength", OES_FEATURE_STATS,
+            on_change=self.on_criteria_changed, rows=8
+        )
+        self.oes_checklist.frame.pack(fill="x", padx=4, pady=4)
+
+        self.weight_frame = ttk.LabelFrame(checklist_frame, text="Criterion Weights", padding=6)
+        self.weight_frame.pack(fill="x", padx=4, pady=4)
 
         ttk.Label(
             checklist_frame,
-            text="Select metrics to include.\nMultiple metrics are summed\n& normalized before plotting."
+            text="Select metrics to include.\nMultiple metrics are weighted, summed\n& normalized before plotting."
         ).pack(padx=6, pady=8)
 
     # -------------------------
     # Clear Plot
     # -------------------------
     def clear_plot(self):
+        if self._update_job is not None:
+            self.root.after_cancel(self._update_job)
+            self._update_job = None
         clear_plot_gui(self)
+        self.build_weight_panel()
 
     # -------------------------
     # Loading folders
     # -------------------------
-    def load_electrical_folder(self):
-        if self.default_folder:
-            try:
-                os.chdir(self.default_folder)  # Force Windows to use this dir
-            except:
-                pass
-
-            folder = filedialog.askdirectory(
-                parent=self.root,
-                title="Select Electrical Data Folder",
-                initialdir=self.default_folder,
-                mustexist=True
-            )
-        else:
-            folder = filedialog.askdirectory(
-                parent=self.root,
-                title="Select Electrical Data Folder",
-                mustexist=True
-            )
-        if not folder:
-            return
-
-        loaded = load_electrical_data(self, folder)
-        messagebox.showinfo("Loaded", f"Loaded {loaded} electrical CSV files from {folder}.")
+    def ask_folder(self, title):
+        return filedialog.askdirectory(
+            parent=self.root,
+            title=title,
+            initialdir=self.default_folder if self.default_folder else None,
+            mustexist=True
+        )
 
+    def remember_folder(self, folder):
         # Update default folder and persist
         self.default_folder = folder
         try:
@@ -192,38 +259,93 @@ class DataLoaderGUI:
         except Exception:
             pass
 
+    def load_electrical_folder(self):
+        folder = self.ask_folder("Select Electrical Data Folder")
+        if folder:
+            self.start_load("electrical", folder)
+
     def load_oes_folder(self):
-        if self.default_folder:
-            try:
-                os.chdir(self.default_folder)
-            except:
-                pass
+        folder = self.ask_folder("Select OES Data Folder")
+        if folder:
+            self.start_load("oes", folder)
 
-            folder = filedialog.askdirectory(
-                parent=self.root,
-                title="Select OES Data Folder",
-                initialdir=self.default_folder,
-                mustexist=True
-            )
-        else:
-            folder = filedialog.askdirectory(
-                parent=self.root,
-                title="Select OES Data Folder",
-                mustexist=True
-            )
-        if not folder:
+    def load_both_folders(self):
+        """Pick both folders up front, then read them concurrently."""
+        elec = self.ask_folder("Select Electrical Data Folder")
+        if not elec:
             return
+        oes = self.ask_folder("Select OES Data Folder")
+        self.start_load("electrical", elec)
+        if oes:
+            self.start_load("oes", oes)
 
-        loaded = load_oes_data(self, folder)
-        messagebox.showinfo("Loaded", f"Loaded {loaded} OES CSV files from {folder}.")
-
-        # Update default folder and persist
-        self.default_folder = folder
+    # -------------------------
+    # Background loading
+    # -------------------------
+    def start_load(self, kind, folder):
+        """Read one modality's folder in a worker thread; results are applied in _poll_loads."""
+        if kind in self._loads:
+            messagebox.showwarning(
+                "Still loading",
+                f"{TABLE_NAMES[kind]} from {os.path.basename(self._loads[kind])} is still loading."
+            )
+            return
+        self._loads[kind] = folder
+        self.show_load_progress(kind, folder, 0, None)
+        self.update_process_button()
+        known = set(getattr(self, f"{kind}_groups").paths)  # snapshot: the worker must not touch live state
+        threading.Thread(target=self._load_worker, args=(kind, folder, known), daemon=True).start()
+        if self._poll_job is None:
+            self._poll_job = self.root.after(self.LOAD_POLL_MS, self._poll_loads)
+
+    def _load_worker(self, kind, folder, known):
+        # Worker thread: only file I/O and parsing, never Tk calls
         try:
-            with open(self.config_path, "w") as f:
-                f.write(folder)
-        except Exception:
-            pass
+            records = read_folder(
+                kind, folder, skip=known,
+                progress=lambda done, total: self._load_queue.put(("progress", kind, folder, done, total))
+            )
+            self._load_queue.put(("done", kind, folder, records))
+        except Exception as e:
+            self._load_queue.put(("error", kind, folder, str(e)))
+
+    def _poll_loads(self):
+        self._poll_job = None
+        progress = {}
+        while True:
+            try:
+                msg = self._load_queue.get_nowait()
+            except queue.Empty:
+                break
+            what, kind, folder = msg[:3]
+            if what == "progress":
+                progress[kind] = (folder,) + msg[3:]
+            elif what == "done":
+                progress.pop(kind, None)
+                self._loads.pop(kind, None)
+                with perf.action(f"Add {TABLE_NAMES[kind]}"):
+                    add_records(self, kind, folder, msg[3])
+                self.remember_folder(folder)
+            elif what == "error":
+                progress.pop(kind, None)
+                self._loads.pop(kind, None)
+                add_records(self, kind, folder, [])
+                messagebox.showerror("Load failed", f"Could not load {TABLE_NAMES[kind]} from:\n{folder}\n\n{msg[3]}")
+        for kind, (folder, done, total) in progress.items():
+            self.show_load_progress(kind, folder, done, total)
+        self.update_process_button()
+        if self._loads:
+            self._poll_job = self.root.after(self.LOAD_POLL_MS, self._poll_loads)
+
+    def show_load_progress(self, kind, folder, done, total):
+        values = list(self.table.item(kind, "values"))
+        values[1] = os.path.basename(folder)
+        have = len(getattr(self, f"{kind}_files"))
+        values[4] = f"{have} + loading {done}/{total}" if total else f"{have} + loading..."
+        self.table.item(kind, values=values)
+
+    def update_process_button(self):
+        self.process_button.config(state="disabled" if self._loads else "normal")
 
     # -------------------------
     # Main processing (Process Data)
@@ -241,77 +363,200 @@ class DataLoaderGUI:
                 )
                 return
 
-        process_data(self, wavelengths)
-        self.build_checklists(wavelengths)
-        messagebox.showinfo("Done", "Processing complete.\nUse the checkboxes to build the colormap.")
+        with perf.action("Process Data"):
+            process_data(self)
+            self.build_checklists(wavelengths)
+        mem = feature_memory_bytes(self)
+        messagebox.showinfo(
+            "Done",
+            "Processing complete.\nUse the checkboxes to build the colormap.\n\n"
+            f"Feature tensors: electrical {mem['electrical'] / 1e6:.1f} MB, "
+            f"OES {mem['oes'] / 1e6:.1f} MB "
+            f"({len(self.oes_averaged.labels)} wavelengths)"
+        )
 
     # -------------------------
-    # Build checklist widgets
+    # Checklists
     # -------------------------
+    @perf.timed()
     def build_checklists(self, wavelengths):
-        # Clear previous checklist frames
-        for widget in self.elec_check_frame.winfo_children():
-            widget.destroy()
-        for widget in self.oes_check_frame.winfo_children():
+        """
+        Refresh the checklist rows from the processed feature matrices. The OES
+        list covers the whole spectrum unless specific wavelengths are given.
+        """
+        self.elec_checklist.set_labels(self.electrical_averaged.labels)
+        oes_labels = self.oes_averaged.labels
+        if wavelengths:
+            known = set(oes_labels)
+            oes_labels = [wl for wl in wavelengths if wl in known] or list(wavelengths)
+        self.oes_checklist.set_labels(oes_labels)
+        self.build_weight_panel()
+
+    # -------------------------
+    # Criterion weights
+    # -------------------------
+    def checked_criteria(self):
+        checked = [("elec", op, stat) for op, stat in self.elec_checklist.checked()]
+        checked += [("oes", wl, stat) for wl, stat in self.oes_checklist.checked()]
+        return checked
+
+    def build_weight_panel(self):
+        """One slider per checked criterion; weights survive unchecking."""
+        for widget in self.weight_frame.winfo_children():
             widget.destroy()
-        self.elec_check_vars.clear()
-        self.oes_check_vars.clear()
-
-        # Electrical Checklist
-        headers = ["Order Parameter", "Mean", "%CV", "Min", "Max"]
-        for c, h in enumerate(headers):
-            ttk.Label(self.elec_check_frame, text=h, font=("Arial", 9, "bold")).grid(
-                row=0, column=c, sticky="w", padx=4
+
+        checked = self.checked_criteria()
+        if not checked:
+            ttk.Label(self.weight_frame, text="(Check metrics to weight them)").grid(
+                row=0, column=0, sticky="w", padx=4
             )
+            return
+
+        if len(checked) > self.MAX_WEIGHT_SLIDERS:
+            ttk.Label(
+                self.weight_frame,
+                text=f"+{len(checked) - self.MAX_WEIGHT_SLIDERS} more criteria (current weights kept)"
+            ).grid(row=self.MAX_WEIGHT_SLIDERS, column=0, columnspan=3, sticky="w", padx=4)
+        for r, key in enumerate(checked[:self.MAX_WEIGHT_SLIDERS]):
+            _, label, stat = key
+            var = self.criterion_weights.get(key)
+            if var is None:
+                var = self.criterion_weights[key] = tk.DoubleVar(value=1.0)
+            ttk.Label(self.weight_frame, text=f"{label} {stat}").grid(row=r, column=0, sticky="w", padx=4)
+            ttk.Scale(
+                self.weight_frame, from_=0.0, to=1.0, variable=var, length=120,
+                command=lambda value, v=var: self.on_weight_changed(v, value)
+            ).grid(row=r, column=1, sticky="we", padx=4)
+            ttk.Label(self.weight_frame, textvariable=var, width=5).grid(row=r, column=2, sticky="w")
+
+    def on_weight_changed(self, var, value):
+        var.set(round(float(value), 2))
+        self.schedule_heatmap_update()
+
+    def on_criteria_changed(self):
+        self.build_weight_panel()
+        self.schedule_heatmap_update()
+
+    def schedule_heatmap_update(self):
+        # Coalesce bursts of slider events into one redraw per idle cycle
+        if self._update_job is None:
+            self._update_job = self.root.after_idle(self._run_heatmap_update)
+
+    @perf.timed_action("Update Heatmap")
+    def _run_heatmap_update(self):
+        self._update_job = None
+        update_heatmap_gui(self)
 
-        if not self.electrical_averaged:
-            ttk.Label(self.elec_check_frame, text="(No data loaded)").grid(
-                row=1, column=0, sticky="w", padx=4
+    # -------------------------
+    # Robustness overlays
+    # -------------------------
+    def read_samples(self):
+        try:
+            n = int(self.samples_var.get())
+        except (tk.TclError, ValueError):
+            n = 0
+        if n <= 0:
+            messagebox.showerror("Invalid samples", "Samples must be a positive integer.")
+            return None
+        return n
+
+    def run_bootstrap(self):
+        n = self.read_samples()
+        if n is None:
+            return
+        workers = max(1, (os.cpu_count() or 1) - 1) if self.parallel_var.get() else 1
+        self.root.config(cursor="watch")
+        self.root.update_idletasks()
+        try:
+            with perf.action("Bootstrap Optimum"):
+                prob = bootstrap_optimum_gui(self, n, workers=workers)
+        finally:
+            self.root.config(cursor="")
+        if prob is None:
+            messagebox.showwarning(
+                "Nothing to resample",
+                "Process data and check at least one metric before bootstrapping."
             )
-        else:
-            order_params = sorted({
-                op for df in self.electrical_averaged.values()
-                for op in df.index.astype(str)
-            })
-
-            for r, op in enumerate(order_params, start=1):
-                ttk.Label(self.elec_check_frame, text=op).grid(
-                    row=r, column=0, sticky="w", padx=4
-                )
-                for c, stat in enumerate(["Mean", "%CV", "Min", "Max"], start=1):
-                    var = tk.IntVar(value=0)
-                    chk = tk.Checkbutton(self.elec_check_frame, variable=var)
-                    chk.grid(row=r, column=c, sticky="w")
-                    self.elec_check_vars[(op, stat)] = var
-
-        # OES Checklist
-        headers2 = ["Wavelength", "mean", "std_dev", "cv_percent", "SNR"]
-        for c, h in enumerate(headers2):
-            ttk.Label(self.oes_check_frame, text=h, font=("Arial", 9, "bold")).grid(
-                row=0, column=c, sticky="w", padx=4
+
+    def run_weight_sensitivity(self):
+        n = self.read_samples()
+        if n is None:
+            return
+        with perf.action("Weight Sensitivity"):
+            result = weight_sensitivity_gui(self, n)
+        if result is None:
+            messagebox.showwarning(
+                "Nothing to weight",
+                "Process data and check at least one metric before running the sensitivity sweep."
             )
 
-        if not wavelengths:
-            ttk.Label(self.oes_check_frame, text="N/A").grid(
-                row=1, column=0, sticky="w", padx=4
+    def clear_overlay(self):
+        self.optimum_overlay = None
+        self.schedule_heatmap_update()
+
+    # -------------------------
+    # Optimal windows
+    # -------------------------
+    def window_threshold(self):
+        """Threshold on the normalized score, or None if the entry is not a number."""
+        try:
+            return float(self.threshold_var.get())
+        except ValueError:
+            return None
+
+    def export_windows(self):
+        if not self.optimal_windows or not self.optimal_windows["windows"]:
+            messagebox.showwarning(
+                "No windows",
+                "Enable 'Optimal Windows' with a threshold that selects at least one region first."
             )
-            for col in range(1, 5):
-                chk = tk.Checkbutton(self.oes_check_frame, state="disabled")
-                chk.grid(row=1, column=col, sticky="w")
             return
+        path = filedialog.asksaveasfilename(
+            parent=self.root,
+            title="Export Windows for Number Line Bar",
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json")],
+            initialdir=self.default_folder if self.default_folder else None
+        )
+        if not path:
+            return
+        w = self.optimal_windows
+        try:
+            written = export_windows_numberbar(w["windows"], w["powers"], w["freqs"], path)
+        except Exception as e:
+            messagebox.showerror("Export failed", str(e))
+            return
+        messagebox.showinfo("Exported", "Wrote Number Line Bar ranges to:\n" + "\n".join(written))
 
-        for r, wl in enumerate(wavelengths, start=1):
-            ttk.Label(self.oes_check_frame, text=str(wl)).grid(
-                row=r, column=0, sticky="w", padx=4
+    # -------------------------
+    # Pareto front export
+    # -------------------------
+    def export_front(self):
+        if not self.pareto_front or not self.pareto_front["points"]:
+            messagebox.showwarning(
+                "No Pareto front",
+                "Enable 'Pareto Front' and select criteria to compute a front first."
             )
-            for c, stat in enumerate(["mean", "std_dev", "cv_percent", "SNR"], start=1):
-                var = tk.IntVar(value=0)
-                chk = tk.Checkbutton(self.oes_check_frame, variable=var)
-                chk.grid(row=r, column=c, sticky="w")
-                self.oes_check_vars[(wl, stat)] = var
+            return
+        path = filedialog.asksaveasfilename(
+            parent=self.root,
+            title="Export Pareto Front",
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv")],
+            initialdir=self.default_folder if self.default_folder else None
+        )
+        if not path:
+            return
+        try:
+            n = export_pareto_front(self.pareto_front, path)
+        except Exception as e:
+            messagebox.showerror("Export failed", str(e))
+            return
+        messagebox.showinfo("Exported", f"Wrote {n} Pareto-optimal points to:\n{path}")
 
     # -------------------------
     # Plot wrapper
     # -------------------------
+    @perf.timed_action("Find Optimal Range")
     def update_heatmap(self):
         update_heatmap_gui(self)
\ No newline at end of file
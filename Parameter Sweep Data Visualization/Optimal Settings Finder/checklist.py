@@ -0,0 +1,189 @@
+# checklist.py
+import fnmatch
+import tkinter as tk
+from tkinter import ttk
+
+import numpy as np
+
+
+class CriteriaChecklist:
+    """
+    Virtualized (label x stat) checklist.
+
+    Selections live in one boolean array `selected` shaped (labels, stats),
+    so its ravel() lines up with FeatureMatrix.features (label-major) when
+    the labels match the matrix. The Treeview only ever holds `rows` items:
+    scrolling refills them from the filtered label list instead of creating
+    a widget per criterion.
+
+    Click a stat cell to toggle it, or the label cell to toggle the row. The
+    search box filters rows by substring, or by glob pattern when it has
+    * ? or [ ; Select / Clear apply to every filtered row for the chosen stat.
+    """
+
+    ALL_STATS = "All stats"
+    CHECKED, UNCHECKED = "☑", "☐"
+
+    def __init__(self, parent, title, label_header, stats, on_change=None, rows=12):
+        self.stats = list(stats)
+        self.on_change = on_change
+        self.rows = rows
+        self.labels = []
+        self._label_text = []
+        self.selected = np.zeros((0, len(self.stats)), dtype=bool)
+        self.visible = np.zeros(0, dtype=int)  # label indices passing the filter
+        self.offset = 0
+
+        self.frame = ttk.LabelFrame(parent, text=title, padding=6)
+
+        bar = ttk.Frame(self.frame)
+        bar.pack(fill="x")
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *_: self.apply_filter())
+        ttk.Label(bar, text="Filter:").pack(side="left")
+        ttk.Entry(bar, textvariable=self.search_var, width=14).pack(side="left", padx=(4, 6))
+        self.stat_var = tk.StringVar(value=self.ALL_STATS)
+        ttk.Combobox(
+            bar, textvariable=self.stat_var, values=[self.ALL_STATS] + self.stats, width=11, state="readonly"
+        ).pack(side="left")
+        ttk.Button(bar, text="Select", width=7, command=lambda: self.set_matching(True)).pack(side="left", padx=(6, 0))
+        ttk.Button(bar, text="Clear", width=6, command=lambda: self.set_matching(False)).pack(side="left", padx=(4, 0))
+
+        body = ttk.Frame(self.frame)
+        body.pack(fill="both", expand=True, pady=(4, 0))
+        columns = ["label"] + self.stats
+        self.tree = ttk.Treeview(body, columns=columns, show="headings", height=rows, selectmode="none")
+        self.tree.heading("label", text=label_header)
+        self.tree.column("label", width=120, anchor="w")
+        for st in self.stats:
+            self.tree.heading(st, text=st)
+            self.tree.column(st, width=70, anchor="center")
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar = ttk.Scrollbar(body, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="left", fill="y")
+
+        self.items = [self.tree.insert("", "end", values=()) for _ in range(rows)]
+        self.status = ttk.Label(self.frame, text="")
+        self.status.pack(anchor="w")
+
+        self.tree.bind("<Button-1>", self._on_click)
+        self.tree.bind("<MouseWheel>", lambda e: self.scroll(-1 if e.delta > 0 else 1))
+        self.tree.bind("<Button-4>", lambda e: self.scroll(-1))
+        self.tree.bind("<Button-5>", lambda e: self.scroll(1))
+        self.render()
+
+    # ---------- data ----------
+    def set_labels(self, labels):
+        """Replace the rows; selections of labels that are still present are kept."""
+        old = {lab: i for i, lab in enumerate(self.labels)}
+        selected = np.zeros((len(labels), len(self.stats)), dtype=bool)
+        for i, lab in enumerate(labels):
+            j = old.get(lab)
+            if j is not None:
+                selected[i] = self.selected[j]
+        self.labels = list(labels)
+        self.selected = selected
+        self._label_text = [str(lab) for lab in self.labels]
+        self.apply_filter()
+
+    def clear(self):
+        self.selected[:] = False
+        self.render()
+
+    def any(self):
+        return bool(self.selected.any())
+
+    def checked(self):
+        """(label, stat) pairs that are checked, label-major."""
+        rows, cols = np.nonzero(self.selected)
+        return [(self.labels[r], self.stats[c]) for r, c in zip(rows, cols)]
+
+    def mask_for(self, matrix):
+        """Boolean vector over matrix.features for the checked criteria."""
+        if list(matrix.labels) == self.labels and list(matrix.stats) == self.stats:
+            return self.selected.ravel().copy()
+        mask = np.zeros(len(matrix.features), dtype=bool)
+        for feature in self.checked():
+            col = matrix.column.get(feature)
+            if col is not None:
+                mask[col] = True
+        return mask
+
+    # ---------- filtering / bulk selection ----------
+    def apply_filter(self):
+        text = self.search_var.get().strip()
+        if not text:
+            self.visible = np.arange(len(self.labels))
+        elif any(ch in text for ch in "*?["):
+            self.visible = np.array(
+                [i for i, s in enumerate(self._label_text) if fnmatch.fnmatchcase(s.lower(), text.lower())], dtype=int
+            )
+        else:
+            needle = text.lower()
+            self.visible = np.array([i for i, s in enumerate(self._label_text) if needle in s.lower()], dtype=int)
+        self.offset = 0
+        self.render()
+
+    def set_matching(self, value):
+        if self.visible.size == 0:
+            return
+        stat = self.stat_var.get()
+        cols = slice(None) if stat == self.ALL_STATS else self.stats.index(stat)
+        self.selected[self.visible, cols] = value
+        self.render()
+        self._changed()
+
+    # ---------- rendering ----------
+    def scroll(self, delta):
+        self.offset = int(np.clip(self.offset + delta, 0, max(self.visible.size - self.rows, 0)))
+        self.render()
+        return "break"
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        total = self.visible.size
+        if action == "moveto":
+            self.offset = int(float(amount) * total)
+        else:
+            step = self.rows if unit == "pages" else 1
+            self.offset += int(amount) * step
+        self.scroll(0)
+
+    def render(self):
+        total = self.visible.size
+        for k, item in enumerate(self.items):
+            pos = self.offset + k
+            if pos < total:
+                i = self.visible[pos]
+                marks = [self.CHECKED if v else self.UNCHECKED for v in self.selected[i]]
+                self.tree.item(item, values=[self._label_text[i]] + marks)
+            else:
+                self.tree.item(item, values=())
+        if total:
+            self.scrollbar.set(self.offset / total, min(self.offset + self.rows, total) / total)
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        self.status.config(
+            text=f"{total} of {len(self.labels)} shown, {int(self.selected.sum())} checked" if self.labels
+            else "(No data loaded)"
+        )
+
+    def _on_click(self, event):
+        item = self.tree.identify_row(event.y)
+        if self.tree.identify_region(event.x, event.y) != "cell" or item not in self.items:
+            return "break"
+        pos = self.offset + self.items.index(item)
+        if pos >= self.visible.size:
+            return "break"
+        i = self.visible[pos]
+        col = int(self.tree.identify_column(event.x).lstrip("#")) - 1
+        if col == 0:
+            self.selected[i] = not self.selected[i].all()
+        else:
+            self.selected[i, col - 1] = not self.selected[i, col - 1]
+        self.render()
+        self._changed()
+        return "break"
+
+    def _changed(self):
+        if self.on_change is not None:
+            self.on_change()
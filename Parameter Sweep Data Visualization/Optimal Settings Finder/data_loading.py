@@ -1,103 +1,141 @@
 # data_loading.py
 import os
-import re
-import pandas as pd
-
-#from .analysis import is_electrical_df, is_oes_df  # if using as package
-# If not using a package, change this import to:
-from analysis import is_electrical_df, is_oes_df
-
-
-def parse_power_freq_from_filename(fname):
+import json
+import numpy as np
+
+from testbench_core.filenames import parse_power_freq_values as parse_power_freq_from_filename
+from testbench_core.index import path_key
+from testbench_core.lazy import lazy_import
+from testbench_core.loader import list_csv_files, read_csv
+from testbench_core.perf import timed
+from testbench_core.schemas import (
+    is_electrical_df, is_oes_df, canonicalize_electrical, canonicalize_oes, oes_index_column
+)
+
+pd = lazy_import("pandas")
+
+
+def read_electrical_file(fpath):
+    """Read one electrical summary CSV into a file record, or None if it is not one."""
+    try:
+        df = read_csv(fpath)
+    except Exception:
+        return None
+    if not is_electrical_df(df):
+        return None
+    power, freq = parse_power_freq_from_filename(fpath)
+    canon = canonicalize_electrical(df)
+    if canon is None:
+        return None
+    order_params, values = canon
+    return {
+        "path": fpath,
+        "file": os.path.basename(fpath),
+        "power": power,
+        "freq": freq,
+        "df": df,
+        "labels": order_params,
+        "values": values
+    }
+
+
+def read_oes_file(fpath):
+    """Read one OES summary CSV into a file record, or None if it is not one."""
+    try:
+        df = read_csv(fpath)
+    except Exception:
+        return None
+    if not is_oes_df(df):
+        return None
+    power, freq = parse_power_freq_from_filename(fpath)
+    idx_col = oes_index_column(df)
+
+    wavelengths, values = canonicalize_oes(df)
+    return {
+        "path": fpath,
+        "file": os.path.basename(fpath),
+        "power": power,
+        "freq": freq,
+        "df": df,
+        "idx_col": idx_col,
+        "labels": wavelengths,
+        "values": values
+    }
+
+
+READERS = {"electrical": read_electrical_file, "oes": read_oes_file}
+TABLE_NAMES = {"electrical": "Electrical Data", "oes": "OES Data"}
+
+
+@timed()
+def read_folder(kind, folder, progress=None, skip=()):
     """
-    Extract power and frequency from filenames like:
-    20251028_110700-Al_30sec_T2-1500-10-2.5.tdms_summary.csv
-
-    Assumes the last three numeric tokens before '.tdms_summary' are:
-        - power
-        - frequency
-        - another numeric parameter
+    Read every CSV of one modality ("electrical" or "oes") in folder,
+    except paths whose path_key() is in `skip` (already loaded).
+    Touches no GUI state, so it can run in a worker thread; progress(done,
+    total) is called after each file. Returns the list of file records.
     """
-    base = os.path.basename(fname)
-    name, _ = os.path.splitext(base)   # strips .csv, leaves ...tdms_summary
-
-    # Try strict pattern first
-    m = re.search(
-        r'-([0-9]+(?:\.[0-9]+)?)-([0-9]+(?:\.[0-9]+)?)-[0-9]+(?:\.[0-9]+)?\.tdms_summary$',
-        name
-    )
-    if m:
-        try:
-            power = float(m.group(1))
-            freq = float(m.group(2))
-            return power, freq
-        except ValueError:
-            return None, None
-
-    # Fallback: last three numeric tokens
-    nums = re.findall(r'(\d+(?:\.\d+)?)', name)
-    if len(nums) >= 3:
-        try:
-            power = float(nums[-3])
-            freq = float(nums[-2])
-            return power, freq
-        except ValueError:
-            return None, None
-
-    return None, None
-
-
-def groups_minmax(groups):
-    """Compute global power / frequency min/max for groups keyed by (power, freq)."""
-    powers = [k[0] for k in groups.keys() if k[0] is not None]
-    freqs = [k[1] for k in groups.keys() if k[1] is not None]
-    pmin, pmax = (min(powers), max(powers)) if powers else (None, None)
-    fmin, fmax = (min(freqs), max(freqs)) if freqs else (None, None)
-    return pmin, pmax, fmin, fmax
-
-
-def load_electrical_data(gui, folder):
+    files = [f for f in list_csv_files(folder) if path_key(f) not in skip]
+    reader = READERS[kind]
+    records = []
+    for n, fpath in enumerate(files, start=1):
+        record = reader(fpath)
+        if record is not None:
+            records.append(record)
+        if progress is not None:
+            progress(n, len(files))
+    return records
+
+
+@timed()
+def add_records(gui, kind, folder, records):
     """
-    Load electrical CSV files from folder into the gui.electrical_files and gui.electrical_groups.
-    This is the logic previously inside DataLoaderGUI.load_electrical_folder.
+    Append new file records from read_folder() to gui.<kind>_files, the
+    running averages and the SweepIndex gui.<kind>_groups, skipping files
+    that are already loaded, and refresh the table row.
+    Must run on the Tk thread. Returns the number of files added.
     """
-    files = [os.path.join(folder, f) for f in os.listdir(folder) if f.lower().endswith(".csv")]
-    loaded = 0
-    for fpath in files:
-        try:
-            df = pd.read_csv(fpath)
-        except Exception:
-            continue
-        if not is_electrical_df(df):
+    files = getattr(gui, f"{kind}_files")
+    index = getattr(gui, f"{kind}_groups")
+    averager = getattr(gui, f"{kind}_avg")
+    added = 0
+    for record in records:
+        if not index.add(record, folder):
             continue
-        from data_loading import parse_power_freq_from_filename as _parse  # or just parse_power_freq_from_filename
-        power, freq = _parse(fpath)
-        gui.electrical_files.append({
-            "path": fpath,
-            "file": os.path.basename(fpath),
-            "power": power,
-            "freq": freq,
-            "df": df
-        })
-        loaded += 1
-
-    gui.electrical_groups.clear()
-    for item in gui.electrical_files:
-        key = (item["power"], item["freq"])
-        gui.electrical_groups[key].append(item["df"])
-
-    pmin, pmax, fmin, fmax = groups_minmax(gui.electrical_groups)
+        files.append(record)
+        averager.add((record["power"], record["freq"]), record["labels"], record["values"])
+        added += 1
+
+    if not index.folders:
+        index.folders.append(folder)
+    update_table_row(gui, kind)
+    return added
+
+
+def update_table_row(gui, kind):
+    index = getattr(gui, f"{kind}_groups")
+    pmin, pmax, fmin, fmax = index.minmax()
+    rmin, rmax = index.replicate_range()
+    n_files = len(getattr(gui, f"{kind}_files"))
+    replicates = f" ({rmin}–{rmax} per point)" if rmin != rmax else f" ({rmin} per point)"
     gui.table.item(
-        "electrical",
+        kind,
         values=(
-            "Electrical Data",
-            os.path.basename(folder),
+            TABLE_NAMES[kind],
+            " + ".join(os.path.basename(f) for f in index.folders),
             f"{pmin} – {pmax}" if pmin is not None else "N/A",
             f"{fmin} – {fmax}" if fmin is not None else "N/A",
-            str(len(gui.electrical_files))
+            str(n_files) + (replicates if n_files else "")
         )
     )
-    return loaded
+
+
+def load_electrical_data(gui, folder):
+    """
+    Load electrical CSV files from folder into the gui.electrical_files and gui.electrical_groups.
+    This is the logic previously inside DataLoaderGUI.load_electrical_folder.
+    """
+    return add_records(gui, "electrical", folder, read_folder("electrical", folder))
 
 
 def load_oes_data(gui, folder):
@@ -105,50 +143,53 @@ def load_oes_data(gui, folder):
     Load OES CSV files from folder into gui.oes_files and gui.oes_groups.
     This is the logic previously inside DataLoaderGUI.load_oes_folder.
     """
-    files = [os.path.join(folder, f) for f in os.listdir(folder) if f.lower().endswith(".csv")]
-    loaded = 0
-    for fpath in files:
-        try:
-            df = pd.read_csv(fpath)
-        except Exception:
-            continue
-        if not is_oes_df(df):
-            continue
-        from data_loading import parse_power_freq_from_filename as _parse  # or just parse_power_freq_from_filename
-        power, freq = _parse(fpath)
-
-        cols_map = {c.strip().lower(): c for c in df.columns}
-        if "wavelength_index" in cols_map:
-            idx_col = cols_map["wavelength_index"]
-        elif "wavelength index" in cols_map:
-            idx_col = cols_map["wavelength index"]
-        else:
-            idx_col = df.columns[0]
-
-        gui.oes_files.append({
-            "path": fpath,
-            "file": os.path.basename(fpath),
-            "power": power,
-            "freq": freq,
-            "df": df,
-            "idx_col": idx_col
-        })
-        loaded += 1
-
-    gui.oes_groups.clear()
-    for item in gui.oes_files:
-        key = (item["power"], item["freq"])
-        gui.oes_groups[key].append(item["df"])
-
-    pmin, pmax, fmin, fmax = groups_minmax(gui.oes_groups)
-    gui.table.item(
-        "oes",
-        values=(
-            "OES Data",
-            os.path.basename(folder),
-            f"{pmin} – {pmax}" if pmin is not None else "N/A",
-            f"{fmin} – {fmax}" if fmin is not None else "N/A",
-            str(len(gui.oes_files))
-        )
-    )
-    return loaded
\ No newline at end of file
+    return add_records(gui, "oes", folder, read_folder("oes", folder))
+
+
+def export_pareto_front(front, path):
+    """
+    Write the Pareto front found by update_heatmap_gui() to CSV: one row per
+    non-dominated (power, freq) point with its normalized criteria and the
+    current weighted score.
+    """
+    rows = []
+    for (power, freq), values, score in zip(front["points"], front["values"], front["scores"]):
+        row = {"Power": power, "Frequency": freq}
+        for (label, stat), v in zip(front["features"], values):
+            row[f"{label} {stat}"] = v
+        row["Weighted Score"] = score
+        rows.append(row)
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return len(rows)
+
+
+def _axis_step(values):
+    steps = np.diff(np.unique(np.asarray(values, dtype=float)))
+    return float(steps.min()) if steps.size else 1.0
+
+
+def export_windows_numberbar(windows, powers, freqs, path):
+    """
+    Write optimal windows as Number Line Bar ranges: one JSON file per axis,
+    <path>_frequency.json and <path>_power.json, each holding
+    {"unit", "start", "end", "tick_interval", "bars": [{"label", "start", "end"}]}.
+    Returns the written paths.
+    """
+    base, _ = os.path.splitext(path)
+    written = []
+    for axis, key, unit, values in (("frequency", "freq", "kHz", freqs), ("power", "power", "U", powers)):
+        doc = {
+            "unit": unit,
+            "start": float(min(values)),
+            "end": float(max(values)),
+            "tick_interval": _axis_step(values),
+            "bars": [
+                {"label": w["label"], "start": float(w[key + "_start"]), "end": float(w[key + "_end"])}
+                for w in windows
+            ],
+        }
+        out = f"{base}_{axis}.json"
+        with open(out, "w") as f:
+            json.dump(doc, f, indent=2)
+        written.append(out)
+    return written
@@ -1,8 +1,19 @@
 # main.py
+import os
+import sys
+
+# testbench_core (shared loaders and views) lives at the repository root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir)))
+
 import tkinter as tk
-from app_gui import DataLoaderGUI
+from app_gui import DataLoaderGUI, PRELOAD
+from testbench_core import perf
+from testbench_core.lazy import preload
 
 if __name__ == "__main__":
     root = tk.Tk()
+    perf.attach_tk(root)  # actions include the redraws they schedule
     app = DataLoaderGUI(root)
+    # warm up the deferred imports once the window is on screen
+    root.after(100, preload, *PRELOAD)
     root.mainloop()
\ No newline at end of file
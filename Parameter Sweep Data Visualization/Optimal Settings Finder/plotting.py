@@ -1,103 +1,79 @@
 # plotting.py
 import numpy as np
-from matplotlib import cm
-import numpy.ma as ma
 
-
-def build_grid_from_map(mapping):
-    """
-    mapping: dict[(power,freq)] -> value
-    Returns:
-      powers_sorted, freqs_sorted, grid (2D array shape (len(powers), len(freqs))) with np.nan where missing
-    """
-    if not mapping:
-        return [], [], np.array([[]])
-    powers = sorted({k[0] for k in mapping.keys() if k[0] is not None})
-    freqs  = sorted({k[1] for k in mapping.keys() if k[1] is not None})
-    if not powers or not freqs:
-        return powers, freqs, np.full((len(powers), len(freqs)), np.nan)
-
-    grid = np.full((len(powers), len(freqs)), np.nan)
-    pidx = {p: i for i, p in enumerate(powers)}
-    fidx = {f: i for i, f in enumerate(freqs)}
-
-    for (p, f), v in mapping.items():
-        if p in pidx and f in fidx:
-            grid[pidx[p], fidx[f]] = v
-
-    return powers, freqs, grid
+from analysis import build_bootstrap_problem, bootstrap_optimum, optimal_windows
+from testbench_core.perf import timed
 
 
 def clear_plot_gui(gui):
     """Clear the current plot, uncheck all boxes, and reset to placeholder text."""
-    # Uncheck electrical
-    for var in gui.elec_check_vars.values():
-        var.set(0)
-    # Uncheck OES
-    for var in gui.oes_check_vars.values():
-        var.set(0)
+    gui.elec_checklist.clear()
+    gui.oes_checklist.clear()
 
     # Full reset of figure and axes
-    gui.fig.clf()
-    gui.ax = gui.fig.add_subplot(111)
-
-    gui.ax.text(
-        0.5, 0.5,
+    gui.heatmap_view.show_message(
         "Plot cleared.\nClick 'Process Data', select parameters,\nthen 'Find Optimal Range' to plot.",
-        ha="center", va="center", fontsize=12
+        fontsize=12
     )
+    gui.ax = gui.heatmap_view.ax
+    gui.pareto_front = None
+    gui.surface_fit = None
+    gui.optimum_overlay = None
+    gui.optimal_windows = None
+
 
-    gui.canvas.draw()
+def selection_vectors(gui):
+    """
+    Selection masks and weight vectors over the feature columns of
+    gui.electrical_normalized and gui.oes_normalized, built from the
+    checklist arrays and the weight sliders.
+    """
+    selections, weights = [], []
+    for kind, matrix, checklist in (
+        ("elec", gui.electrical_normalized, gui.elec_checklist),
+        ("oes", gui.oes_normalized, gui.oes_checklist),
+    ):
+        sel = checklist.mask_for(matrix)
+        w = sel.astype(float)
+        for col in np.flatnonzero(sel):
+            var = gui.criterion_weights.get((kind,) + matrix.features[col])
+            if var is not None:
+                w[col] = float(var.get())
+        selections.append(sel)
+        weights.append(w)
+    return selections, weights
 
 
+@timed()
 def update_heatmap_gui(gui):
     """
-    Build and plot the heatmap based on the current checkbox selections.
-    Assumes gui.electrical_normalized and gui.oes_normalized have been
-    populated by process_data().
+    Build and plot the heatmap based on the current checkbox selections and
+    weights. All sweep-point scores come from gui.scoring_engine, built by
+    process_data() over gui.electrical_normalized and gui.oes_normalized.
     """
-    combined_map = {}
-    any_selected = False
-
-    # Electrical selections
-    for (op, stat), var in gui.elec_check_vars.items():
-        if var.get():
-            any_selected = True
-            mapping = gui.electrical_normalized.get((op, stat), {})
-            for k, v in mapping.items():
-                combined_map[k] = combined_map.get(k, 0.0) + float(v)
-
-    # OES selections
-    for (wl, stat), var in gui.oes_check_vars.items():
-        if var.get():
-            any_selected = True
-            mapping = gui.oes_normalized.get((wl, stat), {})
-            for k, v in mapping.items():
-                combined_map[k] = combined_map.get(k, 0.0) + float(v)
-
-    # Completely reset the figure and axes (no old colorbars, no old axes)
-    gui.fig.clf()
-    gui.ax = gui.fig.add_subplot(111)
+    any_selected = gui.elec_checklist.any() or gui.oes_checklist.any()
 
     if not any_selected:
-        gui.ax.text(
-            0.5, 0.5,
+        gui.heatmap_view.show_message(
             "No parameters selected.\nCheck boxes on the right, then click 'Find Optimal Range'.",
-            ha="center", va="center", fontsize=12
+            fontsize=12
         )
-        gui.canvas.draw()
+        gui.ax = gui.heatmap_view.ax
+        gui.pareto_front = None
+        gui.surface_fit = None
+        gui.optimal_windows = None
         return
 
     # Build grid
-    powers, freqs, grid = build_grid_from_map(combined_map)
+    selections, weights = selection_vectors(gui)
+    powers, freqs, grid = gui.scoring_engine.grid(selections, weights)
 
     if grid.size == 0 or grid.shape[0] == 0 or grid.shape[1] == 0:
-        gui.ax.text(
-            0.5, 0.5,
-            "No overlapping power/frequency data to display.",
-            ha="center", va="center"
-        )
-        gui.canvas.draw()
+        gui.heatmap_view.show_message("No overlapping power/frequency data to display.")
+        gui.ax = gui.heatmap_view.ax
+        gui.pareto_front = None
+        gui.surface_fit = None
+        gui.optimal_windows = None
         return
 
     # Normalize combined grid
@@ -108,30 +84,185 @@ def update_heatmap_gui(gui):
     else:
         norm_grid = grid_numeric / maxv
 
-    mask = np.isnan(grid)
-    masked = ma.array(norm_grid, mask=mask)
-    cmap = cm.get_cmap('BuGn')
-
-    # Plot heatmap
-    im = gui.ax.imshow(
-        masked,
-        origin='lower',
-        aspect='auto',
-        interpolation='nearest',
-        cmap=cmap,
-        extent=[min(freqs), max(freqs), min(powers), max(powers)]
-    )
+    # Missing cells stay blank; the persistent view only swaps the image data
+    masked = np.where(np.isnan(grid), np.nan, norm_grid)
+
+    title = "Optimal Range Color Map"
+    front = pareto_front_gui(gui, selections, weights) if gui.pareto_var.get() else None
+    if front is not None:
+        title += f" (Pareto front: {len(front['points'])} points)"
+    surface = response_surface_gui(gui, powers, freqs, masked) if gui.surface_var.get() else None
+    if surface is not None:
+        opt = surface["optimum"]
+        title += (f"\nPredicted optimum: {opt['power']:.4g} U, {opt['freq']:.4g} kHz "
+                  f"(score {opt['value']:.3f} \u00b1 {opt['stderr']:.3f})")
+    threshold = gui.window_threshold() if gui.windows_var.get() else None
+    windows = None
+    if threshold is not None:
+        windows = {"windows": optimal_windows(powers, freqs, masked, threshold),
+                   "powers": powers, "freqs": freqs, "threshold": threshold}
+        title += f"\n{len(windows['windows'])} window(s) with score \u2265 {threshold:g}"
+    overlay = gui.optimum_overlay
+    if overlay is not None and not overlay_matches(gui, overlay, selections, weights):
+        overlay = gui.optimum_overlay = None  # computed for another selection or processed data
+    if overlay is not None:
+        best = int(np.argmax(overlay["prob"]))
+        p_best, f_best = gui.scoring_engine.points[best]
+        title += (f"\n{overlay['label']}: {overlay['prob'][best]:.0%} at "
+                  f"{p_best:.4g} U, {f_best:.4g} kHz")
 
     # Ticks only at existing values
-    gui.ax.set_xticks(freqs)
-    gui.ax.set_yticks(powers)
+    gui.heatmap_view.show(
+        masked, powers, freqs,
+        cmap="BuGn",
+        extent=[min(freqs), max(freqs), min(powers), max(powers)],
+        xlabel="Frequency (kHz)",
+        ylabel="Power (U)",
+        title=title,
+        cbar_label="Normalized value",
+    )
+    gui.ax = gui.heatmap_view.ax
+
+    gui.pareto_front = front
+    if front is None:
+        gui.heatmap_view.clear_overlays("markers")
+    else:
+        gui.heatmap_view.show_markers(
+            [f for _, f in front["points"]], [p for p, _ in front["points"]]
+        )
+
+    if overlay is None:
+        gui.heatmap_view.clear_overlays("probability")
+    else:
+        hit = np.flatnonzero(overlay["prob"] > 0)
+        pts = [gui.scoring_engine.points[i] for i in hit]
+        gui.heatmap_view.show_scatter(
+            [f for _, f in pts], [p for p, _ in pts], 30 + 600 * overlay["prob"][hit],
+            name="probability", facecolors="mediumpurple", edgecolors="indigo", alpha=0.7
+        )
+
+    gui.optimal_windows = windows
+    if windows is None or min(masked.shape) < 2:
+        gui.heatmap_view.clear_overlays("windows")
+    else:
+        gui.heatmap_view.show_contours(
+            freqs, powers, np.nan_to_num(masked, nan=threshold - 1.0), levels=[threshold],
+            name="windows", colors="navy", linewidths=2.0
+        )
 
-    # Axis labels and title
-    gui.ax.set_xlabel("Frequency (kHz)")
-    gui.ax.set_ylabel("Power (U)")
-    gui.ax.set_title("Optimal Range Color Map")
+    gui.surface_fit = surface
+    if surface is None:
+        gui.heatmap_view.clear_overlays("surface", "stderr", "optimum")
+    else:
+        view = gui.heatmap_view
+        fine_p, fine_f = surface["fine_powers"], surface["fine_freqs"]
+        view.show_contours(fine_f, fine_p, surface["prediction"], levels=8, name="surface",
+                           colors="dimgray", linewidths=0.8)
+        view.show_contours(fine_f, fine_p, surface["stderr"], levels=4, name="stderr",
+                           colors="darkorange", linewidths=1.0, linestyles="--")
+        opt = surface["optimum"]
+        view.show_markers([opt["freq"]], [opt["power"]], name="optimum", marker="*",
+                          markersize=16, markerfacecolor="gold", markeredgecolor="black",
+                          markeredgewidth=1.0)
+
+
+def selection_key(selections, weights=None):
+    """Hashable fingerprint of a selection (and optionally its weights)."""
+    key = tuple(np.packbits(np.asarray(sel, dtype=bool)).tobytes() for sel in selections)
+    if weights is not None:
+        key += tuple(np.asarray(w, dtype=float).tobytes() for w in weights)
+    return key
+
+
+def overlay_key(gui, selections, weights=None):
+    """
+    Key of an optimum overlay: the selection (and weights) plus the scoring
+    engine's inputs and point count, so an overlay from before the last
+    Process Data never indexes the new engine's points.
+    """
+    engine = (gui.processed_state.get("engine"), len(gui.scoring_engine.points))
+    return (engine,) + selection_key(selections, weights)
+
+
+def overlay_matches(gui, overlay, selections, weights):
+    uses_weights = overlay["key"] == overlay_key(gui, selections, weights)
+    return uses_weights or overlay["key"] == overlay_key(gui, selections)
 
-    # Single colorbar
-    gui.fig.colorbar(im, ax=gui.ax, orientation='vertical', label='Normalized value')
 
-    gui.canvas.draw()
\ No newline at end of file
+@timed()
+def bootstrap_optimum_gui(gui, n_resamples, workers=1):
+    """
+    Bootstrap the current selection/weights and store the probability that
+    each sweep point is the optimum as the heatmap overlay.
+    Returns the probabilities, or None if nothing is selected.
+    """
+    selections, weights = selection_vectors(gui)
+    problem = build_bootstrap_problem(gui, selections, weights)
+    if not problem.sources or not problem.present.any():
+        return None
+    prob = bootstrap_optimum(problem, n_resamples, workers=workers)
+    gui.optimum_overlay = {
+        "key": overlay_key(gui, selections, weights),
+        "prob": prob,
+        "label": f"Bootstrap P(optimum), {n_resamples} resamples",
+    }
+    update_heatmap_gui(gui)
+    return prob
+
+
+@timed()
+def weight_sensitivity_gui(gui, n_samples):
+    """
+    Score every sweep point under n_samples random weightings of the checked
+    criteria and store how often each point wins as the heatmap overlay.
+    Returns the win frequencies, or None if nothing is selected.
+    """
+    selections, _ = selection_vectors(gui)
+    if not any(sel.any() for sel in selections):
+        return None
+    prob = gui.scoring_engine.weight_sensitivity(selections, n_samples)
+    if not prob.any():
+        return None
+    gui.optimum_overlay = {
+        "key": overlay_key(gui, selections),
+        "prob": prob,
+        "label": f"Win frequency over {n_samples} random weightings",
+    }
+    update_heatmap_gui(gui)
+    return prob
+
+
+@timed()
+def response_surface_gui(gui, powers, freqs, grid):
+    """
+    Quadratic surrogate of the displayed (normalized) score grid. The
+    factorization is cached per grid layout in gui.scoring_engine, so weight
+    changes only refit the right-hand side. Returns the fit dict plus the
+    fine grid axes, or None when the sweep is too sparse for a quadratic.
+    """
+    present = ~np.isnan(grid)
+    rs = gui.scoring_engine.surface(powers, freqs, present)
+    if rs is None:
+        return None
+    fit = rs.fit(grid[present])
+    fit["fine_powers"] = rs.fine_powers
+    fit["fine_freqs"] = rs.fine_freqs
+    return fit
+
+
+@timed()
+def pareto_front_gui(gui, selections, weights):
+    """
+    Non-dominated sweep points over the checked criteria (weights only feed
+    the exported score). Returns a dict with features, points, values, scores.
+    """
+    engine = gui.scoring_engine
+    features, values, mask = engine.pareto(selections)
+    scores, _ = engine.scores(selections, weights)
+    idx = np.flatnonzero(mask)
+    return {
+        "features": features,
+        "points": [engine.points[i] for i in idx],
+        "values": values[idx],
+        "scores": scores[idx],
+    }
@@ -0,0 +1,223 @@
+"""
+Soak test: repeated plotting must not grow memory.
+
+Opens an app on the synthetic sweep (see synth.py) and plots N times in a
+row (default 500), sampling the process RSS after a garbage collection
+every --sample plots:
+
+  oes_dv         Plot Data (main plot + analysis popup) and
+                 Plot Normalized Intensity
+  electrical_dv  Plot Parameter (plot + Analysis Tables window)
+
+The run fails (exit status 1) when RSS grows by more than --max-growth MB
+between the end of the --warmup plots and the last plot.
+
+    python benchmarks/soak.py                      # oes_dv, 500 plots, needs a display
+    python benchmarks/soak.py electrical_dv -n 200
+    python benchmarks/soak.py --headless           # no Tk: plot functions on one Agg figure
+
+Uses psutil for the RSS when it is installed, else /proc/self/statm.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+
+import synth
+from startup import APPS, ROOT
+
+MB = 1024 * 1024
+
+
+def rss_mb():
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / MB
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / MB
+    except OSError:
+        sys.exit("Cannot read the process RSS here; install psutil.")
+
+
+def count_widgets(widget):
+    return 1 + sum(count_widgets(w) for w in widget.winfo_children())
+
+
+def peak_wavelengths(manifest):
+    n = manifest["wavelengths"]
+    return [int(round(centre * n)) for centre, _, _ in synth.EMISSION_LINES]
+
+
+def electrical_sets(folders):
+    """[(tag, [(file name, frame), ...]), ...] for the Electrical DV app."""
+    from testbench_core.loader import load_folder
+    from testbench_core.schemas import ELECTRICAL_COLUMNS
+    return [(os.path.basename(f), load_folder(f, ELECTRICAL_COLUMNS).files) for f in folders]
+
+
+# ---------- one plot per call, with a window ----------
+def tk_oes_dv(root, path, manifest):
+    import app_gui
+    app = app_gui.DataPlotApp(root)
+    for g, folder in enumerate(synth.folders(path, manifest, "oes"), start=1):
+        app.data_mgr.add_data_set_from_folder(folder, os.path.basename(folder), g)
+    app.populate_table()
+    app.wavelength_entry.insert(0, ", ".join(str(p) for p in peak_wavelengths(manifest)))
+
+    def step():
+        app.plot_data()
+        app.show_normalized_intensity_popup()
+    return step
+
+
+def tk_electrical_dv(root, path, manifest):
+    import app_gui
+    app = app_gui.DataPlotApp(root)
+    for g, (tag, files) in enumerate(electrical_sets(synth.folders(path, manifest, "electrical")), start=1):
+        app.dataframes.add_dataset(tag, [df for _f, df in files])
+        app.file_names += [f for f, _df in files]
+        app.groups += [g] * len(files)
+        app.original_groups += [g] * len(files)
+        app.group_tags += [tag] * len(files)
+        app.group_folders += [tag] * len(files)
+    app.stats.rebuild(app.dataframes, app.groups)
+    app.update_parameters_from_dataframes()
+    app.populate_table()
+    app.selected_param.set(app.param_combo["values"][0])
+    return app.plot_parameter_gui
+
+
+# ---------- the same plot functions on one Agg figure ----------
+def headless_oes_dv(path, manifest):
+    import data_manager
+    import plotter
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    dm = data_manager.DataManager()
+    for g, folder in enumerate(synth.folders(path, manifest, "oes"), start=1):
+        dm.add_data_set_from_folder(folder, os.path.basename(folder), g)
+    figure = Figure(figsize=(10, 8), dpi=100)
+    FigureCanvasAgg(figure)
+    peaks = [float(p) for p in peak_wavelengths(manifest)]
+
+    def step():
+        plotter.plot_oes_data(dm.dataframes, dm.groups, dm.group_tags, peaks, figure=figure)
+        figure.canvas.draw()
+    return step
+
+
+def headless_electrical_dv(path, manifest):
+    import plotting
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    dfs, groups, tags = [], [], []
+    for g, (tag, files) in enumerate(electrical_sets(synth.folders(path, manifest, "electrical")), start=1):
+        dfs += [df for _f, df in files]
+        groups += [g] * len(files)
+        tags += [tag] * len(files)
+    figure = Figure(figsize=(9, 4.5), dpi=100)
+    FigureCanvasAgg(figure)
+    param = synth.parameter_names(manifest["params"])[0]
+
+    def step():
+        plotting.plot_parameter(figure, dfs, groups, tags, param)
+        figure.canvas.draw()
+    return step
+
+
+SETUPS = {
+    "oes_dv": (tk_oes_dv, headless_oes_dv),
+    "electrical_dv": (tk_electrical_dv, headless_electrical_dv),
+}
+
+
+def soak(step, n, warmup, sample, settle=None, widgets=None):
+    """Run step() n times; returns [(plots done, RSS MB, widgets or None), ...]."""
+    samples = []
+
+    def measure(done):
+        if settle is not None:
+            settle()
+        gc.collect()
+        samples.append((done, rss_mb(), widgets() if widgets is not None else None))
+
+    measure(0)
+    for i in range(1, n + 1):
+        step()
+        if settle is not None:
+            settle()
+        if i == warmup or i % sample == 0 or i == n:
+            measure(i)
+    return samples
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Plot repeatedly and check that memory stays bounded.")
+    parser.add_argument("app", nargs="?", default="oes_dv", choices=sorted(SETUPS))
+    parser.add_argument("-n", "--plots", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=50, help="plots before the RSS baseline is taken (default: 50)")
+    parser.add_argument("--sample", type=int, default=50, help="plots between RSS samples (default: 50)")
+    parser.add_argument("--max-growth", type=float, default=20.0,
+                        help="allowed RSS growth after warm-up, MB (default: 20)")
+    parser.add_argument("--headless", action="store_true", help="no window: plot functions on one Agg figure")
+    parser.add_argument("--scale", type=float, default=1, help="synthetic data size (default: 1)")
+    parser.add_argument("--data", default=os.path.join(tempfile.gettempdir(), "testbench-bench"),
+                        help="where synthetic sweeps are kept")
+    parser.add_argument("-o", "--output", help="write the samples to this JSON file")
+    args = parser.parse_args(argv)
+    if not 0 < args.warmup < args.plots:
+        parser.error("--warmup must be between 0 and --plots")
+
+    path = os.path.join(args.data, f"x{args.scale:g}")
+    manifest = synth.ensure(path, scale=args.scale)
+    sys.path[:0] = [os.path.join(ROOT, APPS[args.app]), ROOT]
+    with_tk, headless = SETUPS[args.app]
+
+    root = None
+    if args.headless:
+        import matplotlib
+        matplotlib.use("Agg")
+        step, settle, widgets = headless(path, manifest), None, None
+    else:
+        import tkinter as tk
+        root = tk.Tk()
+        step = with_tk(root, path, manifest)
+        settle, widgets = root.update, lambda: count_widgets(root)
+
+    mode = "headless" if args.headless else "Tk"
+    print(f"{args.app} ({mode}): {args.plots} plots on {manifest['files_per_kind']} files per kind")
+    start = time.perf_counter()
+    samples = soak(step, args.plots, args.warmup, args.sample, settle, widgets)
+    elapsed = time.perf_counter() - start
+    if root is not None:
+        root.destroy()
+
+    baseline = next(rss for done, rss, _ in samples if done == args.warmup)
+    for done, rss, count in samples:
+        extra = f", {count} widgets" if count is not None else ""
+        print(f"  after {done:4d} plots: RSS {rss:8.1f} MB{extra}")
+    growth = samples[-1][1] - baseline
+    ok = growth <= args.max_growth
+    per_plot = growth * 1024 / (args.plots - args.warmup)
+    print(f"RSS growth after warm-up: {growth:+.1f} MB ({per_plot:+.1f} KB per plot, "
+          f"limit {args.max_growth:g} MB) in {elapsed:.1f} s: {'OK' if ok else 'FAIL'}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "app": args.app, "mode": mode, "plots": args.plots, "warmup": args.warmup,
+                "max_growth_mb": args.max_growth, "growth_mb": round(growth, 2), "ok": ok,
+                "samples": [{"plots": d, "rss_mb": round(r, 2), "widgets": c} for d, r, c in samples],
+            }, f, indent=2)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,112 @@
+"""
+Startup import benchmark for the test bench apps.
+
+Imports each app's app_gui in a fresh interpreter under `-X importtime`
+(no window is created) and reports the total import time plus the
+slowest top-level imports. Run from anywhere:
+
+    python benchmarks/startup.py                  # all apps, 5 runs each
+    python benchmarks/startup.py -n 10 --top 15
+    python benchmarks/startup.py --json startup.json
+    python benchmarks/startup.py --preload        # also time the PRELOAD set
+
+Median of the runs is reported, in milliseconds.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+APPS = {
+    "electrical_dv": "Electrical Data Visualization",
+    "oes_dv": "OES Data Visualization",
+    "electrical_ps": os.path.join("Parameter Sweep Data Visualization", "Electrical Parameter Sweep"),
+    "oes_ps": os.path.join("Parameter Sweep Data Visualization", "OES Parameter Sweep"),
+    "osf": os.path.join("Parameter Sweep Data Visualization", "Optimal Settings Finder"),
+}
+LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_times(app_dir, statement):
+    """{module: (self_us, cumulative_us, depth)} for one fresh-interpreter import."""
+    code = (
+        "import sys; "
+        f"sys.path[:0] = [{app_dir!r}, {ROOT!r}]; "
+        f"{statement}"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=app_dir, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in proc.stderr.splitlines():
+        m = LINE.match(line)
+        if m:
+            self_us, cum_us, indent, name = m.groups()
+            times[name] = (int(self_us), int(cum_us), (len(indent) - 1) // 2)
+    return times
+
+
+def bench_app(name, runs, top, preload):
+    app_dir = os.path.join(ROOT, APPS[name])
+    totals, preload_totals, samples = [], [], []
+    for _ in range(runs):
+        times = import_times(app_dir, "import app_gui")
+        totals.append(times["app_gui"][1] / 1000.0)
+        samples.append(times)
+        if preload:
+            after = import_times(app_dir, "import app_gui; [__import__(m) for m in app_gui.PRELOAD]")
+            extra = sum(cum for mod, (_s, cum, depth) in after.items() if depth == 0 and mod not in times)
+            preload_totals.append(extra / 1000.0)
+
+    # slowest top-level imports made by app_gui (depth 1 under it), median over runs
+    children = {}
+    for times in samples:
+        for mod, (_self, cum, depth) in times.items():
+            if depth == 1:
+                children.setdefault(mod, []).append(cum / 1000.0)
+    slowest = sorted(((statistics.median(v), mod) for mod, v in children.items()), reverse=True)[:top]
+
+    result = {
+        "app": APPS[name],
+        "runs": runs,
+        "import_ms": round(statistics.median(totals), 1),
+        "slowest": [{"module": mod, "ms": round(ms, 1)} for ms, mod in slowest],
+    }
+    if preload:
+        result["preload_ms"] = round(statistics.median(preload_totals), 1)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time app_gui imports with -X importtime.")
+    parser.add_argument("apps", nargs="*", help=f"apps to time: {', '.join(APPS)} (default: all)")
+    parser.add_argument("-n", "--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="slowest imports to list per app")
+    parser.add_argument("--preload", action="store_true", help="also time importing each app's PRELOAD modules")
+    parser.add_argument("--json", help="write results to this JSON file")
+    args = parser.parse_args(argv)
+    unknown = [a for a in args.apps if a not in APPS]
+    if unknown:
+        parser.error(f"unknown app(s): {', '.join(unknown)}")
+
+    results = {}
+    for name in args.apps or list(APPS):
+        r = results[name] = bench_app(name, args.runs, args.top, args.preload)
+        extra = f", preload {r['preload_ms']:.0f} ms" if "preload_ms" in r else ""
+        print(f"{r['app']}: import app_gui {r['import_ms']:.0f} ms (median of {r['runs']}){extra}")
+        for s in r["slowest"]:
+            print(f"    {s['ms']:8.1f} ms  {s['module']}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"python": sys.version.split()[0], "results": results}, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
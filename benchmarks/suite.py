@@ -0,0 +1,628 @@
+"""
+Benchmark suite for the test bench loaders, analyses and heatmap builders.
+
+Generates synthetic sweeps with synth.py (reused between runs) and times,
+at each scale:
+
+  load.*          the shared folder loader and each app's folder ingest
+  <app>.analysis  every public function of the Electrical DV, OES DV and
+                  OES Parameter Sweep analysis modules
+  osf.*           Optimal Settings Finder process_data, score grid and
+                  Pareto front (thousands of points x 30 criteria)
+  heatmap.*       the Parameter Sweep heatmap builders and HeatmapView
+                  drawing on an Agg canvas
+  watch.*         one new file arriving in a watched folder while the whole
+                  sweep is loaded: poll, load, update the running group
+                  statistics and the tables computed from them (should not
+                  grow with the scale)
+
+No window is opened. Run from anywhere:
+
+    python benchmarks/suite.py                          # 1x, 10x, 100x
+    python benchmarks/suite.py --scales 1 10 -r 5 -k oes_dv
+    python benchmarks/suite.py -o after.json --compare before.json
+
+Each benchmark is run up to --repeat times (stopping early once --budget
+seconds are spent); the minimum and median are reported. A benchmark that
+runs past the budget once is skipped at the larger scales. Results are
+written as JSON together with the git commit and library versions, and
+--compare prints the change against an earlier results file (exit status 1
+when anything got slower by more than --tolerance).
+"""
+import argparse
+import atexit
+import datetime
+import functools
+import importlib
+import inspect
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import types
+
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+import synth
+from startup import APPS, ROOT
+
+sys.path.insert(0, ROOT)
+from testbench_core import loader, memory
+from testbench_core.filenames import parse_power_freq_from_filename
+from testbench_core.heatmap_view import HeatmapView
+from testbench_core.index import SweepIndex
+from testbench_core.schemas import ELECTRICAL_COLUMNS, OES_COLUMNS, clean_oes_frame, electrical_stat_rows
+from testbench_core.streaming import GroupStats
+from testbench_core.watch import FolderWatcher
+
+# module names the apps import from their own folders (analysis, data_manager, ...)
+APP_MODULES = sorted({
+    os.path.splitext(f)[0]
+    for folder in APPS.values()
+    for f in os.listdir(os.path.join(ROOT, folder))
+    if f.endswith(".py")
+})
+
+
+@functools.lru_cache(maxsize=None)
+def app_module(app, name):
+    """Import one of an app's own modules by its bare name without clashing with the other apps."""
+    app_dir = os.path.join(ROOT, APPS[app])
+    saved = {n: sys.modules.pop(n) for n in APP_MODULES if n in sys.modules}
+    sys.path.insert(0, app_dir)
+    try:
+        return importlib.import_module(name)
+    finally:
+        sys.path.remove(app_dir)
+        for n in APP_MODULES:
+            sys.modules.pop(n, None)
+        sys.modules.update(saved)
+
+
+# ---------- inputs ----------
+class NullTable:
+    """Stands in for the Optimal Settings Finder summary Treeview."""
+
+    def item(self, *args, **kwargs):
+        pass
+
+
+class Sweep:
+    """One generated sweep plus the app-shaped inputs built from it, loaded on first use."""
+
+    def __init__(self, path, manifest):
+        self.path = path
+        self.manifest = manifest
+
+    def folders(self, kind):
+        return synth.folders(self.path, self.manifest, kind)
+
+    def _frames(self, kind, required, clean=None):
+        dfs, groups, tags, fnames = [], [], [], []
+        for g, folder in enumerate(self.folders(kind), start=1):
+            for fname, df in loader.load_folder(folder, required, clean=clean, cache=None).files:
+                dfs.append(df)
+                groups.append(g)
+                tags.append(os.path.basename(folder))
+                fnames.append(fname)
+        return dfs, groups, tags, fnames
+
+    @functools.cached_property
+    def electrical(self):
+        """(dataframes, groups, tags, file names) like the Electrical DV app: one group per dataset."""
+        return self._frames("electrical", ELECTRICAL_COLUMNS)
+
+    @functools.cached_property
+    def oes(self):
+        """(dataframes, groups, tags, file names) like the OES DV app."""
+        return self._frames("oes", OES_COLUMNS, clean_oes_frame)
+
+    @functools.cached_property
+    def peaks(self):
+        """A few wavelength indices, as typed into the OES apps: the synthetic emission lines."""
+        n = self.manifest["wavelengths"]
+        return [int(round(centre * n)) for centre, _, _ in synth.EMISSION_LINES]
+
+    @functools.cached_property
+    def electrical_ps(self):
+        """Electrical Parameter Sweep DataPlotApp holding the electrical frames, without a window."""
+        app_gui = app_module("electrical_ps", "app_gui")
+        app = app_gui.DataPlotApp.__new__(app_gui.DataPlotApp)
+        dfs, _, tags, fnames = self.electrical
+        app.dataframes = dfs
+        app.group_folders = tags
+        app.power_values_per_file, app.freq_values_per_file = (
+            list(v) for v in zip(*(parse_power_freq_from_filename(f) for f in fnames))
+        )
+        return app
+
+    @functools.cached_property
+    def oes_ps(self):
+        """OES Parameter Sweep DataManager with every OES dataset loaded."""
+        dm = app_module("oes_ps", "data_manager").DataManager()
+        for folder in self.folders("oes"):
+            dm.add_data_set_from_folder_auto(folder)
+        return dm
+
+    @functools.cached_property
+    def oes_ps_inputs(self):
+        """Arguments of the OES Parameter Sweep analysis functions, from the first two datasets."""
+        analysis = app_module("oes_ps", "analysis")
+        dm = self.oes_ps
+        idx1, idx2 = (dm.folder_indices(name) for name in self.manifest["datasets"][:2])
+        wavelengths = np.unique(np.concatenate([dm.file_stats(i).wavelengths for i in idx1 + idx2]))
+        keys = sorted({(dm.groups_power[i], dm.groups_freq[i]) for i in idx1 + idx2})
+        cell_of = {k: n for n, k in enumerate(keys)}
+        inputs = {
+            "spectra1": dm.aligned_spectra(idx1, "mean", wavelengths),
+            "cells1": [cell_of[(dm.groups_power[i], dm.groups_freq[i])] for i in idx1],
+            "spectra2": dm.aligned_spectra(idx2, "mean", wavelengths),
+            "cells2": [cell_of[(dm.groups_power[i], dm.groups_freq[i])] for i in idx2],
+            "n_cells": len(keys),
+            "wavelengths": wavelengths,
+        }
+        inputs["spectra"], inputs["cells"] = inputs["spectra1"], inputs["cells1"]
+        for side in ("1", "2"):
+            moments = analysis.cell_moments(inputs["spectra" + side], inputs["cells" + side], len(keys))
+            for key, value in zip(("mean", "var", "n"), moments):
+                inputs[key + side] = value
+        inputs["pvalues"], inputs["qvals"] = analysis.significance_spectrum(
+            inputs["spectra1"], inputs["cells1"], inputs["spectra2"], inputs["cells2"], len(keys)
+        )
+        return inputs
+
+    def osf_records(self, kind):
+        return [r for folder in self.folders(kind) for r in app_module("osf", "data_loading").read_folder(kind, folder)]
+
+    @functools.cached_property
+    def osf_loaded(self):
+        return {kind: self.osf_records(kind) for kind in ("electrical", "oes")}
+
+    def osf_gui(self):
+        """Fresh Optimal Settings Finder state (the attributes DataLoaderGUI sets up) with every file added."""
+        analysis = app_module("osf", "analysis")
+        data_loading = app_module("osf", "data_loading")
+        gui = types.SimpleNamespace(
+            electrical_files=[], oes_files=[],
+            electrical_groups=SweepIndex(), oes_groups=SweepIndex(),
+            electrical_avg=analysis.GroupAverager(len(analysis.ELECTRICAL_STATS)),
+            oes_avg=analysis.GroupAverager(len(analysis.OES_STATS)),
+            processed_state={}, table=NullTable(),
+        )
+        for kind, records in self.osf_loaded.items():
+            for folder in self.folders(kind):
+                data_loading.add_records(gui, kind, folder, [r for r in records if os.path.dirname(r["path"]) == folder])
+        return gui
+
+    @functools.cached_property
+    def osf_processed(self):
+        gui = self.osf_gui()
+        app_module("osf", "analysis").process_data(gui)
+        return gui
+
+    @functools.cached_property
+    def score_grid(self):
+        """(powers, freqs, grid) scored with every feature selected at weight 1."""
+        engine = self.osf_processed.scoring_engine
+        selections = [np.ones(len(m.features), dtype=bool) for m in engine.matrices]
+        weights = [np.ones(len(m.features)) for m in engine.matrices]
+        return engine.grid(selections, weights)
+
+
+# ---------- benchmarks ----------
+# name -> setup(sweep) returning the zero-argument callable that is timed
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+
+@benchmark("load.core.load_folder[electrical]")
+def _load_electrical(sweep):
+    folders = sweep.folders("electrical")
+    return lambda: [loader.load_folder(f, ELECTRICAL_COLUMNS, cache=None) for f in folders]
+
+
+@benchmark("load.core.load_folder[electrical,cached]")
+def _load_electrical_cached(sweep):
+    folders, cache = sweep.folders("electrical"), loader.CsvCache()
+    for f in folders:
+        loader.load_folder(f, ELECTRICAL_COLUMNS, cache=cache)
+    return lambda: [loader.load_folder(f, ELECTRICAL_COLUMNS, cache=cache) for f in folders]
+
+
+@benchmark("load.core.load_folder[oes]")
+def _load_oes(sweep):
+    folders = sweep.folders("oes")
+    return lambda: [loader.load_folder(f, OES_COLUMNS, clean=clean_oes_frame, cache=None) for f in folders]
+
+
+@benchmark("load.oes_dv.DataManager.add_data_set_from_folder")
+def _load_oes_dv(sweep):
+    DataManager = app_module("oes_dv", "data_manager").DataManager
+
+    def run():
+        loader.CACHE.clear()
+        dm = DataManager()
+        for g, folder in enumerate(sweep.folders("oes"), start=1):
+            dm.add_data_set_from_folder(folder, os.path.basename(folder), g)
+    return run
+
+
+@benchmark("load.oes_ps.DataManager.add_data_set_from_folder_auto")
+def _load_oes_ps(sweep):
+    DataManager = app_module("oes_ps", "data_manager").DataManager
+
+    def run():
+        loader.CACHE.clear()
+        dm = DataManager()
+        for folder in sweep.folders("oes"):
+            dm.add_data_set_from_folder_auto(folder)
+    return run
+
+
+def _lean(kind):
+    def setup(sweep):
+        dfs, groups, _, _ = getattr(sweep, kind)
+        datasets = [[df for df, g in zip(dfs, groups) if g == group] for group in sorted(set(groups))]
+        keep = ELECTRICAL_COLUMNS if kind == "electrical" else OES_COLUMNS
+        return lambda: [memory.lean_frames(frames, keep) for frames in datasets]
+    return setup
+
+
+benchmark("memory.lean_frames[electrical]")(_lean("electrical"))
+benchmark("memory.lean_frames[oes]")(_lean("oes"))
+
+
+def _watched_copy(folder):
+    """A temporary folder (removed at exit) holding a copy of `folder`'s first file, and that file."""
+    tmp = tempfile.mkdtemp(prefix="testbench-watch-")
+    atexit.register(shutil.rmtree, tmp, True)
+    template = sorted(loader.list_csv_files(folder))[0]
+    shutil.copy(template, tmp)
+    return tmp, template
+
+
+def _arrive(watcher, tmp, template, state):
+    """Write one new file into the watched folder and poll until it settles; returns {folder: [path]}."""
+    state["n"] += 1
+    shutil.copy(template, os.path.join(tmp, f"new_{state['n']:06d}.csv"))
+    ready = {}
+    while not ready:
+        ready = watcher.poll()
+    return ready
+
+
+@benchmark("watch.oes_dv.new_file")
+def _watch_oes_dv(sweep):
+    DataManager = app_module("oes_dv", "data_manager").DataManager
+    analysis = app_module("oes_dv", "analysis")
+    dm = DataManager()
+    for g, folder in enumerate(sweep.folders("oes"), start=1):
+        dm.add_data_set_from_folder(folder, os.path.basename(folder), g)
+    tmp, template = _watched_copy(sweep.folders("oes")[0])
+    dm.add_data_set_from_folder(tmp, "live", 1)
+    dm.watcher.poll()   # the first poll lists every folder
+    state = {"n": 0}
+
+    def run():
+        for folder, paths in _arrive(dm.watcher, tmp, template, state).items():
+            dm.add_new_files(folder, paths)
+        for fn in (analysis.calculate_group_means, analysis.calculate_group_cv,
+                   analysis.calculate_group_cv_normalized, analysis.calculate_group_pvalues_raw):
+            fn(dm.dataframes, dm.groups, sweep.peaks, stats=dm.stats)
+    return run
+
+
+@benchmark("watch.electrical_dv.new_file")
+def _watch_electrical_dv(sweep):
+    file_io = app_module("electrical_dv", "file_io")
+    analysis = app_module("electrical_dv", "analysis")
+    dfs, groups, tags, _ = sweep.electrical
+    groups, tags = list(groups), list(tags)
+    frames = memory.DatasetFrames(keep=ELECTRICAL_COLUMNS)
+    frames.add_dataset("sweep", dfs)
+    stats = GroupStats(electrical_stat_rows, 4)
+    stats.rebuild(frames, groups)
+    tmp, template = _watched_copy(sweep.folders("electrical")[0])
+    watcher = FolderWatcher()
+    watcher.watch(tmp, known=os.listdir(tmp))
+    watcher.poll()
+    state = {"n": 0}
+
+    def run():
+        # what the Electrical DV app's add_new_files does, without the window
+        for folder, paths in _arrive(watcher, tmp, template, state).items():
+            loaded = file_io.load_new_files(folder, paths)
+            frames.append_frames("live", [df for _f, df in loaded.files])
+            for _f, df in loaded.files:
+                stats.add(df, 1)
+                groups.append(1)
+                tags.append("live")
+        for fn in (analysis.compute_pvalue_tables, analysis.compute_mean_tables, analysis.compute_group_cv_tables,
+                   analysis.compute_drift_first_last_tables, analysis.compute_drift_min_max_tables):
+            fn(frames, groups, tags, stats=stats)
+    return run
+
+
+def _osf_read_folder(kind):
+    def setup(sweep):
+        def run():
+            loader.CACHE.clear()
+            return sweep.osf_records(kind)
+        return run
+    return setup
+
+
+benchmark("load.osf.read_folder[electrical]")(_osf_read_folder("electrical"))
+benchmark("load.osf.read_folder[oes]")(_osf_read_folder("oes"))
+
+
+@benchmark("load.osf.add_records")
+def _osf_add_records(sweep):
+    sweep.osf_loaded
+    return sweep.osf_gui
+
+
+def _inputs_electrical_dv(sweep):
+    dfs, groups, tags, _ = sweep.electrical
+    return {"dataframes": dfs, "groups": groups, "group_tags": tags}
+
+
+def _inputs_oes_dv(sweep):
+    dfs, groups, tags, _ = sweep.oes
+    return {"dataframes": dfs, "groups": groups, "group_tags": tags, "dataset_tags": tags,
+            "wavelengths": sweep.peaks, "peak_wavelengths": sweep.peaks}
+
+
+def _analysis_setup(fn, inputs):
+    def setup(sweep):
+        available = inputs(sweep)
+        params = inspect.signature(fn).parameters
+        return functools.partial(fn, **{p: available[p] for p in params if p in available})
+    return setup
+
+
+def register_analyses(app, inputs):
+    """One benchmark per public function of an app's analysis module, fed by parameter name."""
+    module = app_module(app, "analysis")
+    for name, fn in inspect.getmembers(module, inspect.isfunction):
+        if fn.__module__ == module.__name__ and not name.startswith("_"):
+            benchmark(f"{app}.analysis.{name}")(_analysis_setup(fn, inputs))
+
+
+register_analyses("electrical_dv", _inputs_electrical_dv)
+register_analyses("oes_dv", _inputs_oes_dv)
+register_analyses("oes_ps", lambda sweep: sweep.oes_ps_inputs)
+
+
+@benchmark("osf.process_data")
+def _osf_process_data(sweep):
+    gui = sweep.osf_gui()
+    process_data = app_module("osf", "analysis").process_data
+
+    def run():
+        gui.processed_state = {}
+        process_data(gui)
+    return run
+
+
+@benchmark("osf.pareto_front[30 criteria]")
+def _osf_pareto_front(sweep):
+    # 2000 points at 1x, growing with the square root of the scale (~20000 at 100x);
+    # random criteria leave almost every point non-dominated, the slowest case
+    pareto_front = app_module("osf", "analysis").pareto_front
+    n = int(2000 * sweep.manifest["scale"] ** 0.5)
+    values = np.random.default_rng(0).random((n, 30))
+    return lambda: pareto_front(values)
+
+
+@benchmark("heatmap.osf.ScoringEngine.grid")
+def _osf_grid(sweep):
+    engine = sweep.osf_processed.scoring_engine
+    selections = [np.ones(len(m.features), dtype=bool) for m in engine.matrices]
+    weights = [np.ones(len(m.features)) for m in engine.matrices]
+    return functools.partial(engine.grid, selections, weights)
+
+
+@benchmark("heatmap.electrical_ps.build_heatmap_dataframe")
+def _electrical_ps_heatmap(sweep):
+    app = sweep.electrical_ps
+    return functools.partial(app.build_heatmap_dataframe, synth.ORDER_PARAMETERS[0], "Mean", "All Folders")
+
+
+@benchmark("heatmap.electrical_ps.calculate_pvalue_dataframe")
+def _electrical_ps_pvalues(sweep):
+    app = sweep.electrical_ps
+    a, b = sweep.manifest["datasets"][:2]
+    return functools.partial(app.calculate_pvalue_dataframe, synth.ORDER_PARAMETERS[0], "Mean", a, b)
+
+
+@benchmark("heatmap.oes_ps.wavelength_cube")
+def _oes_ps_cube(sweep):
+    dm = sweep.oes_ps
+    name = sweep.manifest["datasets"][0]
+
+    def run():
+        dm._cubes.clear()
+        dm._file_stats.clear()
+        return dm.wavelength_cube(name)
+    return run
+
+
+@benchmark("heatmap.HeatmapView.show[draw]")
+def _heatmap_draw(sweep):
+    powers, freqs, grid = sweep.score_grid
+
+    def run():
+        figure = Figure(figsize=(8, 6))
+        canvas = FigureCanvasAgg(figure)
+        HeatmapView(figure, canvas).show(grid, powers, freqs, title="score")
+        canvas.draw()
+    return run
+
+
+@benchmark("heatmap.HeatmapView.show[blit]")
+def _heatmap_blit(sweep):
+    powers, freqs, grid = sweep.score_grid
+    figure = Figure(figsize=(8, 6))
+    canvas = FigureCanvasAgg(figure)
+    view = HeatmapView(figure, canvas)
+    lo, hi = np.nanmin(grid), np.nanmax(grid)
+    view.show(grid, powers, freqs, vmin=lo, vmax=hi)
+    canvas.draw()
+    frames = [grid, grid[::-1, ::-1]]
+    state = {"n": 0}
+
+    def run():
+        state["n"] += 1
+        view.show(frames[state["n"] % 2], powers, freqs, vmin=lo, vmax=hi, title=f"frame {state['n']}")
+    return run
+
+
+# ---------- running ----------
+def time_call(fn, repeat, budget):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+        if sum(times) > budget:
+            break
+    return times
+
+
+def run_scale(sweep, names, repeat, budget, over_budget):
+    results = {}
+    for name in names:
+        if name in over_budget:
+            results[name] = {"skipped": f"over budget at {over_budget[name]:g}x"}
+            print(f"  {name:60s} skipped ({results[name]['skipped']})")
+            continue
+        try:
+            fn = BENCHMARKS[name](sweep)
+            times = time_call(fn, repeat, budget)
+        except Exception as e:
+            results[name] = {"error": f"{type(e).__name__}: {e}"}
+            print(f"  {name:60s} error: {results[name]['error']}")
+            continue
+        results[name] = {
+            "min_s": min(times),
+            "median_s": statistics.median(times),
+            "runs": len(times),
+        }
+        if times[0] > budget:
+            over_budget[name] = sweep.manifest["scale"]
+        print(f"  {name:60s} {1000 * results[name]['median_s']:10.2f} ms  (min {1000 * min(times):.2f}, n={len(times)})")
+    return results
+
+
+def environment():
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    versions = {}
+    for name in ("numpy", "pandas", "scipy", "matplotlib"):
+        try:
+            versions[name] = importlib.import_module(name).__version__
+        except ImportError:
+            versions[name] = None
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": git("rev-parse", "HEAD"),
+        "dirty": bool(status) if status is not None else None,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "versions": versions,
+    }
+
+
+def compare(results, baseline, tolerance):
+    """
+    Print the change in best-of-N time against a baseline results dict (the
+    minimum is less sensitive to a busy machine than the median). Returns
+    the number of regressions.
+    """
+    slower = 0
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'}:")
+    for scale, current in results["scales"].items():
+        before = baseline.get("scales", {}).get(scale, {}).get("results", {})
+        for name, r in current["results"].items():
+            old = before.get(name, {})
+            if "min_s" not in r or "min_s" not in old:
+                continue
+            ratio = r["min_s"] / old["min_s"] if old["min_s"] else float("inf")
+            flag = ""
+            if ratio > 1 + tolerance:
+                flag, slower = "  SLOWER", slower + 1
+            elif ratio < 1 / (1 + tolerance):
+                flag = "  faster"
+            print(f"  {scale:>5s}x {name:60s} {ratio:6.2f}x{flag}")
+    return slower
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time loaders, analyses and heatmap builders on synthetic sweeps.")
+    parser.add_argument("--scales", nargs="+", type=float, default=[1, 10, 100], help="data sizes (default: 1 10 100)")
+    parser.add_argument("-k", "--select", nargs="+", help="only benchmarks whose name contains one of these")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="runs per benchmark (default: 3)")
+    parser.add_argument("--budget", type=float, default=30.0, help="seconds per benchmark and scale (default: 30)")
+    parser.add_argument("--data", default=os.path.join(tempfile.gettempdir(), "testbench-bench"),
+                        help="where synthetic sweeps are generated and reused")
+    parser.add_argument("--wavelengths", type=int, default=512, help="OES rows per file")
+    parser.add_argument("-o", "--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="earlier results JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="slowdown reported as a regression (default: 0.2)")
+    parser.add_argument("--list", action="store_true", help="list the benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    names = [n for n in BENCHMARKS if not args.select or any(s in n for s in args.select)]
+    if args.list:
+        print("\n".join(names))
+        return 0
+    if not names:
+        parser.error("no benchmark matches --select")
+
+    results = {**environment(), "options": {"repeat": args.repeat, "budget": args.budget}, "scales": {}}
+    over_budget = {}
+    for scale in args.scales:
+        path = os.path.join(args.data, f"x{scale:g}")
+        manifest = synth.ensure(path, scale=scale, wavelengths=args.wavelengths)
+        print(f"{scale:g}x: {manifest['files_per_kind']} files per kind in {path}")
+        loader.CACHE.clear()
+        results["scales"][f"{scale:g}"] = {
+            "manifest": manifest,
+            "results": run_scale(Sweep(path, manifest), names, args.repeat, args.budget, over_budget),
+        }
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
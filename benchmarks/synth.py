@@ -0,0 +1,184 @@
+"""
+Synthetic sweep data for benchmarking the test bench apps.
+
+Writes electrical (Order Parameter, Mean, %CV, Min, Max) and OES
+(wavelength_index, mean, std_dev, cv_percent) summary CSVs with the
+instrument's file naming
+
+    20251028_110700-Al_Spot-3min-T{replicate}-{power}-{freq}-2.5.tdms_summary.csv
+
+into OUTDIR/electrical/<dataset>/ and OUTDIR/oes/<dataset>/, one file per
+dataset, power, frequency and replicate. Values vary smoothly over the
+power x frequency grid with per-file noise, so averages, p-values and
+optimal settings behave like real sweeps.
+
+    python benchmarks/synth.py OUTDIR                  # 1x: 5 x 4 grid
+    python benchmarks/synth.py OUTDIR --scale 100      # 100x the files
+    python benchmarks/synth.py OUTDIR --powers 12 --freqs 9 --wavelengths 2048
+
+--scale multiplies the number of files (the grid grows by sqrt(scale) in
+each direction); --powers / --freqs set the grid directly. A synth.json
+manifest describing the data is written next to the folders.
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+
+import numpy as np
+
+BASE_POWERS = 5
+BASE_FREQS = 4
+ORDER_PARAMETERS = [
+    "Forward Power", "Reflected Power", "DC Bias", "Peak Voltage",
+    "RMS Current", "Phase", "Impedance", "Chamber Pressure",
+]
+# (centre index as a fraction of the spectrum, width in pixels, relative height)
+EMISSION_LINES = [(0.12, 3.0, 0.6), (0.31, 2.0, 1.0), (0.47, 4.0, 0.35),
+                  (0.63, 2.5, 0.8), (0.82, 3.5, 0.5)]
+FILE_PATTERN = "20251028_110700-Al_Spot-3min-T{rep}-{power:g}-{freq:g}-2.5.tdms_summary.csv"
+MANIFEST = "synth.json"
+
+
+def sweep_grid(scale=1, powers=None, freqs=None):
+    """Power and frequency set points; the file count grows linearly with scale."""
+    grow = math.sqrt(scale)
+    n_p = powers or max(1, round(BASE_POWERS * grow))
+    n_f = freqs or max(1, round(BASE_FREQS * grow))
+    return [500 + 100 * i for i in range(n_p)], [10 + 2 * j for j in range(n_f)]
+
+
+def dataset_names(n):
+    return [f"Run_{chr(ord('A') + i)}" if i < 26 else f"Run_{i + 1}" for i in range(n)]
+
+
+def parameter_names(n):
+    return ORDER_PARAMETERS[:n] + [f"Parameter {i + 1}" for i in range(len(ORDER_PARAMETERS), n)]
+
+
+def _write_electrical(path, names, mean, cv, spread):
+    lo = mean - np.abs(mean) * spread
+    hi = mean + np.abs(mean) * spread
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Order Parameter", "Mean", "%CV", "Min", "Max"])
+        for row in zip(names, mean, cv, lo, hi):
+            writer.writerow([row[0]] + [f"{v:.6g}" for v in row[1:]])
+
+
+def _write_oes(path, mean, cv):
+    table = np.column_stack([np.arange(mean.size), mean, np.abs(mean) * cv / 100.0, cv])
+    np.savetxt(path, table, fmt=["%d", "%.6g", "%.6g", "%.6g"], delimiter=",",
+               header="wavelength_index,mean,std_dev,cv_percent", comments="")
+
+
+def generate(outdir, scale=1, powers=None, freqs=None, replicates=2, datasets=2,
+             params=8, wavelengths=512, seed=0):
+    """Write one synthetic sweep under outdir and return its manifest dict."""
+    rng = np.random.default_rng(seed)
+    power_values, freq_values = sweep_grid(scale, powers, freqs)
+    names = parameter_names(params)
+    folders = dataset_names(datasets)
+
+    # smooth per-parameter response surface over normalised power / frequency
+    base = rng.uniform(1.0, 100.0, params) * rng.choice([-1.0, 1.0], params, p=[0.15, 0.85])
+    slope_p, slope_f, twist = rng.normal(0.0, 0.4, (3, params))
+    base_cv = rng.uniform(0.5, 6.0, params)
+
+    pixels = np.arange(wavelengths, dtype=float)
+    lines = sum(h * np.exp(-0.5 * ((pixels - c * wavelengths) / w) ** 2) for c, w, h in EMISSION_LINES)
+
+    for d, folder in enumerate(folders):
+        elec_dir = os.path.join(outdir, "electrical", folder)
+        oes_dir = os.path.join(outdir, "oes", folder)
+        os.makedirs(elec_dir, exist_ok=True)
+        os.makedirs(oes_dir, exist_ok=True)
+        shift = 1.0 + 0.03 * d  # datasets differ slightly, so comparisons find something
+        for i, power in enumerate(power_values):
+            x = i / max(len(power_values) - 1, 1)
+            for j, freq in enumerate(freq_values):
+                y = j / max(len(freq_values) - 1, 1)
+                for rep in range(1, replicates + 1):
+                    fname = FILE_PATTERN.format(rep=rep, power=power, freq=freq)
+
+                    mean = base * shift * (1 + slope_p * x + slope_f * y + twist * x * y)
+                    mean = mean * (1 + rng.normal(0.0, 0.01, params))
+                    cv = base_cv * (1 + 0.5 * (x - y) ** 2) * rng.uniform(0.8, 1.2, params)
+                    _write_electrical(os.path.join(elec_dir, fname), names, mean, cv,
+                                      rng.uniform(0.02, 0.08, params))
+
+                    spectrum = 200.0 + 5000.0 * shift * (0.5 + x) * (1.2 - 0.4 * y) * lines
+                    spectrum = spectrum * (1 + rng.normal(0.0, 0.02, wavelengths))
+                    oes_cv = np.clip(rng.normal(2.0 + 3.0 * y, 0.5, wavelengths), 0.05, None)
+                    _write_oes(os.path.join(oes_dir, fname), spectrum, oes_cv)
+
+    manifest = {
+        "scale": scale,
+        "powers": power_values,
+        "freqs": freq_values,
+        "replicates": replicates,
+        "datasets": folders,
+        "params": params,
+        "wavelengths": wavelengths,
+        "seed": seed,
+        "files_per_kind": len(folders) * len(power_values) * len(freq_values) * replicates,
+    }
+    with open(os.path.join(outdir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def ensure(outdir, **options):
+    """Reuse the sweep in outdir if its manifest matches `options`, else (re)generate it."""
+    try:
+        with open(os.path.join(outdir, MANIFEST), "r") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = None
+    wanted = dict(scale=1, powers=None, freqs=None, replicates=2, datasets=2,
+                  params=8, wavelengths=512, seed=0)
+    wanted.update(options)
+    if manifest is not None:
+        p, f = sweep_grid(wanted["scale"], wanted["powers"], wanted["freqs"])
+        same = (
+            manifest["powers"] == p and manifest["freqs"] == f
+            and manifest["datasets"] == dataset_names(wanted["datasets"])
+            and all(manifest[k] == wanted[k] for k in ("replicates", "params", "wavelengths", "seed"))
+        )
+        if same:
+            return manifest
+    return generate(outdir, **wanted)
+
+
+def folders(outdir, manifest, kind):
+    """Dataset folders of one kind ("electrical" or "oes") in manifest order."""
+    return [os.path.join(outdir, kind, name) for name in manifest["datasets"]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write synthetic electrical and OES sweep CSVs.")
+    parser.add_argument("outdir")
+    parser.add_argument("--scale", type=float, default=1, help="file count relative to the 5 x 4 grid (default: 1)")
+    parser.add_argument("--powers", type=int, help="power set points (overrides --scale)")
+    parser.add_argument("--freqs", type=int, help="frequency set points (overrides --scale)")
+    parser.add_argument("--replicates", type=int, default=2, help="files per set point and dataset")
+    parser.add_argument("--datasets", type=int, default=2, help="dataset folders per kind")
+    parser.add_argument("--params", type=int, default=8, help="electrical order parameters per file")
+    parser.add_argument("--wavelengths", type=int, default=512, help="OES rows per file")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    manifest = generate(
+        args.outdir, scale=args.scale, powers=args.powers, freqs=args.freqs,
+        replicates=args.replicates, datasets=args.datasets, params=args.params,
+        wavelengths=args.wavelengths, seed=args.seed,
+    )
+    print(f"Wrote {manifest['files_per_kind']} electrical and {manifest['files_per_kind']} OES files "
+          f"({len(manifest['powers'])} powers x {len(manifest['freqs'])} freqs) to {args.outdir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,23 @@
+"""
+Shared ingestion and data-model code for the test bench apps.
+
+Every app (Electrical / OES Data Visualization and the Parameter Sweep
+apps) runs from its own folder; its main.py puts the repository root on
+sys.path so these modules import as `testbench_core.<module>`.
+
+    config        last-folder setting (settings.json)
+    filenames     power / frequency parsing from sweep file names
+    schemas       column sets, validation and canonical typed arrays
+    loader        cached, header-checked, threaded CSV folder loading
+    index         incremental (power, freq) index of loaded files
+    stores        per-file columnar statistics and wavelength lookup
+    heatmap_view  persistent, blitted Power vs Frequency heatmap
+    lazy          deferred imports and background preloading
+    perf          timing spans / actions for the hot paths (off by default)
+    perf_window   the Performance window showing per-action timings
+    memory        per-data-set memory accounting, lean mode and budget spilling
+    memory_window the Memory window (sizes, lean mode, budget)
+    figures       one reused figure / canvas per view and per popup
+    streaming     running (Welford) per-group statistics, updated per file
+    watch         polling for new CSV files in loaded folders
+"""
@@ -2,18 +2,18 @@ import os, json
 
 CONFIG_FILE = "settings.json"
 
-def load_last_path():
-    if os.path.exists(CONFIG_FILE):
+def load_last_path(config_file=CONFIG_FILE):
+    if os.path.exists(config_file):
         try:
-            with open(CONFIG_FILE, "r") as f:
+            with open(config_file, "r") as f:
                 return json.load(f).get("last_path", os.getcwd())
         except Exception:
             pass
     return os.getcwd()
 
-def save_last_path(path):
+def save_last_path(path, config_file=CONFIG_FILE):
     try:
-        with open(CONFIG_FILE, "w") as f:
+        with open(config_file, "w") as f:
             json.dump({"last_path": path}, f)
     except Exception:
-        pass
\ No newline at end of file
+        pass
@@ -0,0 +1,112 @@
+"""
+One figure and Tk canvas per view, reused by every redraw.
+
+A FigureCanvasTkAgg keeps its figure, Agg buffer and PhotoImage alive
+through the Tk callbacks it registers until its widget is destroyed, so
+building a new canvas per plot (and only unpacking the old one) grows
+memory with every click. Views here clear and redraw their one figure;
+popups stay open and are reused, and closing one destroys its widgets
+and clears its figure.
+
+    view = FigureView(frame, figsize=(10, 8))
+    view.widget.pack(fill="both", expand=True)
+    fig = view.clear()          # draw into fig ...
+    view.draw()
+
+    popup = FigurePopup(root, "Normalized Intensity", "1000x700", figsize=(10, 6))
+    fig = popup.show()          # opens the window or reuses it, figure cleared
+    popup.draw()
+"""
+import tkinter as tk
+from tkinter import ttk
+
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+
+from testbench_core import perf
+
+
+class FigureView:
+    """A view's single Figure on a single (instrumented) FigureCanvasTkAgg."""
+
+    def __init__(self, master, figsize, dpi=100, name="canvas.draw"):
+        self.figure = Figure(figsize=figsize, dpi=dpi)
+        self.canvas = perf.instrument_canvas(FigureCanvasTkAgg(self.figure, master=master), name)
+        self.widget = self.canvas.get_tk_widget()
+
+    def clear(self):
+        """Empty the figure for the next plot and return it."""
+        self.figure.clear()
+        return self.figure
+
+    def draw(self):
+        self.canvas.draw()
+
+    def close(self):
+        """Destroy the canvas widget (dropping its Tk callbacks) and release the figure's artists."""
+        if self.canvas is None:
+            return
+        try:
+            self.widget.destroy()
+        except tk.TclError:
+            pass  # already gone with its toplevel
+        self.figure.clear()
+        self.figure = self.canvas = self.widget = None
+
+
+class FigurePopup:
+    """
+    A Toplevel with one FigureView above a footer frame, opened by the
+    first show() and reused by later ones. The footer's widgets are
+    destroyed on each show() so callers can rebuild their summary there.
+    """
+
+    def __init__(self, root, title, geometry, figsize, dpi=100, name="canvas.draw"):
+        self.root = root
+        self.title = title
+        self.geometry = geometry
+        self.figsize = figsize
+        self.dpi = dpi
+        self.name = name
+        self.top = None
+        self.view = None
+        self.footer = None
+
+    @property
+    def figure(self):
+        return self.view.figure if self.view is not None else None
+
+    def is_open(self):
+        return self.top is not None and self.top.winfo_exists()
+
+    def show(self, title=None, lift=True):
+        """Open the popup (or reuse the open one, raised if `lift`) and return its cleared figure."""
+        if not self.is_open():
+            self.close()
+            self.top = tk.Toplevel(self.root)
+            self.top.geometry(self.geometry)
+            self.top.protocol("WM_DELETE_WINDOW", self.close)
+            self.view = FigureView(self.top, self.figsize, self.dpi, self.name)
+            self.view.widget.pack(fill="both", expand=True, padx=10, pady=10)
+            self.footer = ttk.Frame(self.top)
+            self.footer.pack(fill="x")
+        else:
+            for child in self.footer.winfo_children():
+                child.destroy()
+            if lift:
+                self.top.lift()
+        self.top.title(title or self.title)
+        return self.view.clear()
+
+    def draw(self):
+        self.view.draw()
+
+    def close(self):
+        if self.view is not None:
+            self.view.close()
+        if self.top is not None:
+            try:
+                self.top.destroy()
+            except tk.TclError:
+                pass
+        self.top = self.view = self.footer = None
@@ -0,0 +1,48 @@
+import os
+import re
+from functools import lru_cache
+
+_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+
+
+@lru_cache(maxsize=65536)
+def _numeric_tokens(name):
+    return tuple(_NUMBER.findall(name))
+
+
+def parse_power_freq_from_filename(fname):
+    """
+    Parse filename for numeric tokens -> return (power_str, freq_str)
+    Example: 20251015_125714-Al_Spot-3min-T1-2000-18-2.5.tdms_summary.csv
+             -> ("2000", "18")
+    Heuristic: use numeric tokens; prefer tokens[-3], tokens[-2] for power/freq.
+    """
+    tokens = _numeric_tokens(fname)
+    if len(tokens) >= 3:
+        return tokens[-3], tokens[-2]
+    elif len(tokens) >= 2:
+        return tokens[-2], tokens[-1]
+    else:
+        return None, None
+
+
+def parse_power_freq_values(fname):
+    """
+    Power and frequency as floats from a path like
+    .../20251028_110700-Al_30sec_T2-1500-10-2.5.tdms_summary.csv -> (1500.0, 10.0).
+    The last three numeric tokens of the base name (extension stripped) are
+    power, frequency and a third sweep parameter; (None, None) when there
+    are fewer than three.
+    """
+    name, _ = os.path.splitext(os.path.basename(fname))
+    tokens = _numeric_tokens(name)
+    if len(tokens) >= 3:
+        return float(tokens[-3]), float(tokens[-2])
+    return None, None
+
+
+def numeric_sort_key(s):
+    try:
+        return (0, float(s))
+    except (TypeError, ValueError):
+        return (1, str(s))
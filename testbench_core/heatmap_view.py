@@ -0,0 +1,222 @@
+import numpy as np
+from matplotlib import colormaps
+
+from testbench_core.perf import timed
+
+
+class HeatmapView:
+    """
+    Persistent Power vs Frequency heatmap living on one figure/canvas pair.
+
+    The axes, AxesImage and colorbar are built once and then updated in place
+    (set_data / set_clim / tick relabelling).  When only the pixel data and
+    title change, the image is blitted over a cached background instead of
+    redrawing the whole figure; anything else goes through draw_idle().
+    """
+
+    def __init__(self, figure, canvas):
+        self.figure = figure
+        self.canvas = canvas
+        self.ax = None
+        self.image = None
+        self.colorbar = None
+        self.overlays = {}
+        self._layout = None
+        self._clim = None
+        self._background = None
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    # ---------- lifecycle ----------
+    def reset(self):
+        """Clear the figure and forget every cached artist."""
+        self.figure.clf()
+        self.ax = None
+        self.image = None
+        self.colorbar = None
+        self.overlays = {}
+        self._layout = None
+        self._clim = None
+        self._background = None
+
+    def _alive(self):
+        return self.image is not None and self.ax in self.figure.axes
+
+    def show_message(self, text, **text_kw):
+        self.reset()
+        self.ax = self.figure.add_subplot(111)
+        self.ax.text(0.5, 0.5, text, ha="center", va="center", **text_kw)
+        self.canvas.draw_idle()
+
+    def _on_draw(self, event):
+        # Full draws skip the animated image/title: grab the clean background,
+        # then paint them on top so the canvas always shows the whole picture.
+        if not self._alive():
+            self._background = None
+            return
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        self.ax.draw_artist(self.image)
+        for artist in self.overlays.values():
+            self.ax.draw_artist(artist)
+        self.ax.draw_artist(self.ax.title)
+
+    # ---------- drawing ----------
+    def _build(self, data, cmap, extent):
+        self.reset()
+        self.ax = self.figure.add_subplot(111)
+        self.image = self.ax.imshow(
+            data,
+            origin="lower",
+            aspect="auto",
+            interpolation="nearest",
+            cmap=cmap,
+            extent=extent,
+            animated=True,
+        )
+        self.ax.title.set_animated(True)
+        self.colorbar = self.figure.colorbar(self.image, ax=self.ax)
+
+    @timed("HeatmapView.show")
+    def show(self, data, row_labels, col_labels, cmap="cividis", vmin=None, vmax=None,
+             title="", xlabel="Frequency", ylabel="Power", cbar_label="",
+             extent=None, xtick_rotation=0, bad_color=None):
+        """
+        Display `data` (rows = power, columns = frequency).
+
+        Without `extent` the cells sit on integer positions labelled with
+        `row_labels` / `col_labels`; with an extent the labels are used as tick
+        positions in data coordinates.  vmin/vmax default to the data range.
+        """
+        data = np.ma.masked_invalid(np.asarray(data, dtype=float))
+        nrows, ncols = data.shape
+        indexed = extent is None
+        if indexed:
+            extent = (-0.5, ncols - 0.5, -0.5, nrows - 0.5)
+
+        if isinstance(cmap, str):
+            cmap = colormaps[cmap]
+        if bad_color is not None:
+            cmap = cmap.with_extremes(bad=bad_color)
+
+        layout = (
+            data.shape, tuple(map(str, row_labels)), tuple(map(str, col_labels)),
+            tuple(extent), xlabel, ylabel, cbar_label, xtick_rotation,
+        )
+        if vmin is None or vmax is None:
+            finite = data.compressed()
+            lo, hi = (float(finite.min()), float(finite.max())) if finite.size else (0.0, 1.0)
+            vmin = lo if vmin is None else vmin
+            vmax = hi if vmax is None else vmax
+        clim = (vmin, vmax)
+
+        fast = (
+            self._alive()
+            and self._background is not None
+            and layout == self._layout
+            and clim == self._clim
+            and self.image.get_cmap().name == cmap.name
+        )
+
+        if not self._alive():
+            self._build(data, cmap, extent)
+        else:
+            self.image.set_data(data)
+            if self.image.get_cmap().name != cmap.name:
+                self.image.set_cmap(cmap)
+        self.ax.set_title(title)
+
+        if fast:
+            self.canvas.restore_region(self._background)
+            self._draw_animated()
+            self.canvas.blit(self.figure.bbox)
+            return
+
+        if layout != self._layout:
+            self.image.set_extent(extent)
+            self.ax.set_xlim(extent[0], extent[1])
+            self.ax.set_ylim(extent[2], extent[3])
+            if indexed:
+                self.ax.set_xticks(np.arange(ncols))
+                self.ax.set_yticks(np.arange(nrows))
+                ha = "right" if xtick_rotation else "center"
+                self.ax.set_xticklabels([str(x) for x in col_labels], rotation=xtick_rotation, ha=ha)
+                self.ax.set_yticklabels([str(x) for x in row_labels])
+            else:
+                self.ax.set_xticks(list(col_labels))
+                self.ax.set_yticks(list(row_labels))
+            self.ax.set_xlabel(xlabel)
+            self.ax.set_ylabel(ylabel)
+            self.colorbar.set_label(cbar_label)
+            self._layout = layout
+
+        self.image.set_clim(vmin, vmax)
+        self._clim = clim
+        self._background = None
+        self.canvas.draw_idle()
+
+    # ---------- overlays ----------
+    # Named animated artists drawn over the image (markers, contours), so
+    # blitting the image keeps them on top.
+    def show_markers(self, x, y, name="markers", **line_kw):
+        """Mark points (data coordinates), e.g. a Pareto front."""
+        if not self._alive():
+            return
+        markers = self.overlays.get(name)
+        if markers is None:
+            kw = dict(linestyle="none", marker="o", markersize=9, markerfacecolor="none",
+                      markeredgecolor="crimson", markeredgewidth=1.8)
+            kw.update(line_kw)
+            markers, = self.ax.plot([], [], animated=True, scalex=False, scaley=False, **kw)
+            self.overlays[name] = markers
+        markers.set_data(x, y)
+        self._redraw_overlay()
+
+    def show_scatter(self, x, y, sizes, name="scatter", **scatter_kw):
+        """Points with per-point marker areas, e.g. a probability overlay."""
+        if not self._alive():
+            return
+        self._remove_overlay(name)
+        limits = self.ax.get_xlim(), self.ax.get_ylim()
+        points = self.ax.scatter(x, y, s=sizes, animated=True, **scatter_kw)
+        self.ax.set_xlim(limits[0])
+        self.ax.set_ylim(limits[1])
+        self.overlays[name] = points
+        self._redraw_overlay()
+
+    def show_contours(self, x, y, z, levels=None, name="contours", **contour_kw):
+        """Contour lines of z (shape len(y) x len(x)) over the image."""
+        if not self._alive():
+            return
+        self._remove_overlay(name)
+        limits = self.ax.get_xlim(), self.ax.get_ylim()
+        contours = self.ax.contour(x, y, z, levels=levels, **contour_kw)
+        self.ax.set_xlim(limits[0])
+        self.ax.set_ylim(limits[1])
+        contours.set_animated(True)
+        self.overlays[name] = contours
+        self._redraw_overlay()
+
+    def clear_overlays(self, *names):
+        """Remove the named overlays (all of them when no names are given)."""
+        if not self._alive():
+            return
+        names = names or tuple(self.overlays)
+        if any([self._remove_overlay(name) for name in names]):
+            self._redraw_overlay()
+
+    def _remove_overlay(self, name):
+        artist = self.overlays.pop(name, None)
+        if artist is None:
+            return False
+        artist.remove()
+        return True
+
+    def _redraw_overlay(self):
+        if self._background is not None:
+            self.canvas.restore_region(self._background)
+            self._draw_animated()
+            self.canvas.blit(self.figure.bbox)
+        else:
+            self.canvas.draw_idle()
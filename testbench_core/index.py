@@ -0,0 +1,77 @@
+import os
+from collections.abc import Mapping
+
+
+def groups_minmax(groups):
+    """Compute global power / frequency min/max for groups keyed by (power, freq)."""
+    powers = [k[0] for k in groups.keys() if k[0] is not None]
+    freqs = [k[1] for k in groups.keys() if k[1] is not None]
+    pmin, pmax = (min(powers), max(powers)) if powers else (None, None)
+    fmin, fmax = (min(freqs), max(freqs)) if freqs else (None, None)
+    return pmin, pmax, fmin, fmax
+
+
+def path_key(path):
+    """Identity of a file for de-duplication across loads."""
+    return os.path.normcase(os.path.realpath(path))
+
+
+class SweepIndex(Mapping):
+    """
+    Incremental (power, freq) -> [DataFrame, ...] index over loaded files.
+
+    Files are only ever appended, duplicates (same resolved path) are
+    skipped, and the power/frequency ranges, replicate counts and source
+    folders are kept up to date as files arrive, so loading several
+    campaign folders never rescans what is already indexed.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._groups = {}
+        self.paths = set()
+        self.folders = []
+        self.power_range = (None, None)
+        self.freq_range = (None, None)
+
+    @staticmethod
+    def _extend(span, value):
+        if value is None:
+            return span
+        lo, hi = span
+        return (value if lo is None else min(lo, value), value if hi is None else max(hi, value))
+
+    def add(self, record, folder=None):
+        """Index one file record; returns False if its path was already indexed."""
+        key = path_key(record["path"])
+        if key in self.paths:
+            return False
+        self.paths.add(key)
+        if folder is not None and folder not in self.folders:
+            self.folders.append(folder)
+        power, freq = record["power"], record["freq"]
+        self._groups.setdefault((power, freq), []).append(record["df"])
+        self.power_range = self._extend(self.power_range, power)
+        self.freq_range = self._extend(self.freq_range, freq)
+        return True
+
+    def replicates(self, key):
+        return len(self._groups.get(key, ()))
+
+    def replicate_range(self):
+        counts = [len(v) for v in self._groups.values()]
+        return (min(counts), max(counts)) if counts else (0, 0)
+
+    def minmax(self):
+        return self.power_range + self.freq_range
+
+    def __getitem__(self, key):
+        return self._groups[key]
+
+    def __iter__(self):
+        return iter(self._groups)
+
+    def __len__(self):
+        return len(self._groups)
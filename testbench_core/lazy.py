@@ -0,0 +1,60 @@
+import importlib
+import threading
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported on first attribute access.
+
+        pd = lazy_import("pandas")      # nothing imported yet
+        pd.DataFrame(...)               # pandas imported here, once
+
+    Lets an app build and show its window before heavy libraries (pandas,
+    SciPy, the analysis modules) are loaded; preload() can warm them up in
+    the background meanwhile.
+    """
+
+    def __init__(self, name):
+        self.__dict__["_name"] = name
+        self.__dict__["_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_module"]
+        if module is None:
+            module = self.__dict__["_module"] = importlib.import_module(self._name)
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_module"] is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def lazy_import(name):
+    return LazyModule(name)
+
+
+def preload(*names):
+    """
+    Import modules in a daemon thread so first use does not wait for them.
+    Failures are ignored here; they surface on first real use instead.
+    Returns the thread.
+    """
+    def run():
+        for name in names:
+            try:
+                importlib.import_module(name)
+            except Exception:
+                pass
+
+    thread = threading.Thread(target=run, name="preload", daemon=True)
+    thread.start()
+    return thread
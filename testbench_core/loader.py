@@ -0,0 +1,146 @@
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from testbench_core.index import path_key
+from testbench_core.lazy import lazy_import
+from testbench_core.perf import timed
+
+pd = lazy_import("pandas")
+
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def list_csv_files(folder):
+    return [os.path.join(folder, f) for f in os.listdir(folder) if f.lower().endswith(".csv")]
+
+
+def file_signature(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+class CsvCache:
+    """
+    Parsed CSV files keyed by resolved path, reused while the file's mtime
+    and size are unchanged, so re-adding a folder (or opening it in a second
+    app session) skips the parse. Least recently used files are dropped
+    beyond `max_files`. Cached frames are shared: treat them as read-only.
+    Safe to use from loader threads.
+    """
+
+    def __init__(self, max_files=4096):
+        self.max_files = max_files
+        self._frames = OrderedDict()   # key -> (signature, DataFrame)
+        self._headers = {}             # key -> (signature, column list)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            self._headers.clear()
+
+    def memory_usage(self):
+        """(files, deep bytes) of the cached frames."""
+        with self._lock:
+            frames = [df for _sig, df in self._frames.values()]
+        return len(frames), sum(int(df.memory_usage(deep=True).sum()) for df in frames)
+
+    def columns(self, path):
+        """Column names from the header row only (no data parse)."""
+        key, sig = path_key(path), file_signature(path)
+        with self._lock:
+            hit = self._frames.get(key)
+            if hit is not None and hit[0] == sig:
+                return list(hit[1].columns)
+            hit = self._headers.get(key)
+            if hit is not None and hit[0] == sig:
+                return hit[1]
+        columns = list(pd.read_csv(path, nrows=0).columns)
+        with self._lock:
+            self._headers[key] = (sig, columns)
+        return columns
+
+    def read(self, path):
+        key, sig = path_key(path), file_signature(path)
+        with self._lock:
+            hit = self._frames.get(key)
+            if hit is not None and hit[0] == sig:
+                self._frames.move_to_end(key)
+                self.hits += 1
+                return hit[1]
+        df = pd.read_csv(path)
+        with self._lock:
+            self.misses += 1
+            self._frames[key] = (sig, df)
+            self._frames.move_to_end(key)
+            while len(self._frames) > self.max_files:
+                self._frames.popitem(last=False)
+        return df
+
+
+CACHE = CsvCache()
+
+
+def read_csv(path, cache=CACHE):
+    return pd.read_csv(path) if cache is None else cache.read(path)
+
+
+class FolderLoad:
+    """Outcome of load_folder(): loaded (file name, frame) pairs in listing order, skipped names and errors."""
+
+    def __init__(self, folder):
+        self.folder = folder
+        self.files = []     # [(file name, DataFrame), ...]
+        self.skipped = []   # file names missing required columns
+        self.errors = []    # [(file name, exception), ...]
+
+    def __len__(self):
+        return len(self.files)
+
+
+@timed("load_folder")
+def load_folder(folder, required=None, clean=None, workers=DEFAULT_WORKERS, cache=CACHE, paths=None):
+    """
+    Read every CSV in `folder` (or just `paths`) in a thread pool.
+
+    Files whose header lacks any `required` column are skipped before their
+    data is parsed. `clean(df)` may return a transformed frame (it must not
+    modify its argument, which can be a shared cached frame). Touches no GUI
+    state, so it can itself run in a worker thread.
+    """
+    result = FolderLoad(folder)
+    if paths is None:
+        paths = list_csv_files(folder)
+
+    def read_one(path):
+        try:
+            if required is not None:
+                columns = cache.columns(path) if cache is not None else list(pd.read_csv(path, nrows=0).columns)
+                if not set(required).issubset(columns):
+                    return "skipped", None
+            df = read_csv(path, cache)
+            if required is not None and not set(required).issubset(df.columns):
+                return "skipped", None
+            return "ok", clean(df) if clean is not None else df
+        except Exception as e:
+            return "error", e
+
+    if workers and workers > 1 and len(paths) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            outcomes = list(pool.map(read_one, paths))
+    else:
+        outcomes = [read_one(p) for p in paths]
+
+    for path, (status, value) in zip(paths, outcomes):
+        fname = os.path.basename(path)
+        if status == "ok":
+            result.files.append((fname, value))
+        elif status == "skipped":
+            result.skipped.append(fname)
+        else:
+            result.errors.append((fname, value))
+    return result
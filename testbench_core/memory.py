@@ -0,0 +1,332 @@
+"""
+Memory accounting, lean storage and a memory budget for the frames the
+Data Visualization apps keep loaded.
+
+    frames = DatasetFrames(keep=ELECTRICAL_COLUMNS)
+    frames.add_dataset("Run_A (baseline)", dfs)   # one dataset per added folder
+    frames[i], len(frames), for df in frames      # used like the old list of frames
+
+Sizes come from DataFrame.memory_usage(deep=True); categoricals that share
+one dtype count their categories once. In lean mode a dataset's frames
+keep only the `keep` columns, integers are downcast losslessly, floats are
+stored as float32 and repeated strings (e.g. "Order Parameter") become one
+categorical shared by all files of the dataset. With a budget set, the
+least recently used datasets are pickled to a spill directory and read
+back the next time one of their frames is touched.
+"""
+import bisect
+import itertools
+import os
+import pickle
+import shutil
+import tempfile
+import weakref
+from collections.abc import Sequence
+
+import numpy as np
+
+from testbench_core import perf
+from testbench_core.lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+MB = 1024 * 1024
+
+
+def frames_bytes(frames):
+    """Deep size of each frame; categories shared between frames are counted once."""
+    seen = set()
+    sizes = []
+    for df in frames:
+        n = int(df.memory_usage(deep=True).sum())
+        for dtype in df.dtypes:
+            if isinstance(dtype, pd.CategoricalDtype):
+                key = id(dtype.categories)
+                if key in seen:
+                    n -= int(dtype.categories.memory_usage(deep=True))
+                seen.add(key)
+        sizes.append(n)
+    return sizes
+
+
+def _is_text(dtype):
+    return dtype == object or isinstance(dtype, pd.StringDtype)
+
+
+def _smallest_int(values):
+    """Copy of a signed integer array in the smallest signed type holding its values."""
+    if values.size:
+        lo, hi = values.min(), values.max()
+        for dtype in (np.int8, np.int16, np.int32):
+            info = np.iinfo(dtype)
+            if info.min <= lo and hi <= info.max:
+                return values.astype(dtype)
+    return values.copy()
+
+
+def lean_frames(frames, keep=None, max_unique=0.5):
+    """
+    Lean copies of one dataset's frames (the inputs are not modified; they
+    may be shared through the loader cache). Columns outside `keep` are
+    dropped, integer columns downcast to the smallest type holding their
+    values, float64 columns stored as float32, and text columns with at
+    most `max_unique` distinct values per row converted to a categorical
+    whose categories all frames share. The copies get a RangeIndex.
+    """
+    frames = list(frames)
+    total_rows = sum(len(df) for df in frames)
+
+    shared = {}
+    text_columns = {c for df in frames for c, dt in df.dtypes.items()
+                    if _is_text(dt) and (keep is None or c in keep)}
+    for col in text_columns:
+        values = pd.unique(np.concatenate([df[col].to_numpy(dtype=object) for df in frames if col in df.columns]))
+        values = [v for v in values if not pd.isna(v)]
+        if values and len(values) <= max_unique * total_rows:
+            shared[col] = pd.CategoricalDtype(sorted(values, key=str))
+    lookup = {col: {v: i for i, v in enumerate(dtype.categories)} for col, dtype in shared.items()}
+
+    # built from plain arrays: DataFrame.astype costs milliseconds per small frame
+    lean = []
+    for df in frames:
+        columns = {}
+        for col, dtype in df.dtypes.items():
+            if keep is not None and col not in keep:
+                continue
+            values = df[col]
+            if col in shared and _is_text(dtype):
+                code = lookup[col].get   # missing values -> -1
+                codes = np.fromiter((code(v, -1) for v in values.to_numpy(dtype=object)), dtype=np.int64, count=len(values))
+                columns[col] = pd.Categorical.from_codes(codes, dtype=shared[col])
+            elif dtype == np.float64:
+                columns[col] = values.to_numpy(dtype=np.float32)
+            elif np.issubdtype(dtype, np.signedinteger):
+                columns[col] = _smallest_int(values.to_numpy())
+            else:
+                columns[col] = values.to_numpy(copy=True)
+        lean.append(pd.DataFrame(columns, copy=False))
+    return lean
+
+
+def figure_bytes(figure):
+    """
+    Approximate memory held by a matplotlib figure: the Agg pixel buffer of
+    its last draw plus the data arrays of its lines, collections and images.
+    """
+    n = 0
+    renderer = getattr(figure.canvas, "renderer", None)
+    if renderer is not None:
+        n += int(renderer.width) * int(renderer.height) * 4
+    for ax in figure.axes:
+        for line in ax.lines:
+            n += line.get_xydata().nbytes
+        for coll in ax.collections:
+            n += np.asarray(coll.get_offsets()).nbytes
+            array = coll.get_array()
+            if array is not None:
+                n += array.nbytes
+        for image in ax.images:
+            array = image.get_array()
+            if array is not None:
+                n += array.nbytes
+    return n
+
+
+class Dataset:
+    """One added folder: its frames (None while spilled to disk) and their sizes."""
+    __slots__ = ("name", "frames", "sizes", "lean", "spill_path", "last_used")
+
+    def __init__(self, name, frames, lean):
+        self.name = name
+        self.frames = frames
+        self.sizes = frames_bytes(frames)
+        self.lean = lean
+        self.spill_path = None
+        self.last_used = 0
+
+    @property
+    def resident(self):
+        return self.frames is not None
+
+    @property
+    def nbytes(self):
+        return sum(self.sizes)
+
+    def __len__(self):
+        return len(self.sizes)
+
+
+class DatasetFrames(Sequence):
+    """
+    The loaded frames of a Data Visualization app, in load order, grouped
+    into datasets (one per added folder) for accounting, lean mode and the
+    memory budget. Indexing and iteration read spilled datasets back in,
+    so analysis code can keep treating it as a list of frames. Frames are
+    treated as read-only once added.
+    """
+
+    def __init__(self, keep=None, lean=False, budget=None):
+        self.keep = keep
+        self.lean = lean
+        self.budget = budget        # bytes of resident frames; None = no limit
+        self.version = 0            # changes whenever sizes or residency change
+        self._datasets = []
+        self._starts = []           # index of each dataset's first frame
+        self._clock = itertools.count(1)
+        self._spill_dir = None
+        self._cleanup = None
+
+    # ---------- sequence ----------
+    def __len__(self):
+        return sum(len(ds) for ds in self._datasets)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("frame index out of range")
+        d = bisect.bisect_right(self._starts, i) - 1
+        return self._frames_of(self._datasets[d])[i - self._starts[d]]
+
+    def __iter__(self):
+        for ds in list(self._datasets):
+            yield from self._frames_of(ds)
+
+    # ---------- datasets ----------
+    def datasets(self):
+        return list(self._datasets)
+
+    def add_dataset(self, name, frames):
+        """Append one folder's frames (made lean first in lean mode); returns the Dataset."""
+        frames = list(frames)
+        if self.lean:
+            frames = lean_frames(frames, self.keep)
+        ds = Dataset(name, frames, self.lean)
+        ds.last_used = next(self._clock)
+        self._starts.append(len(self))
+        self._datasets.append(ds)
+        self._changed()
+        self.enforce_budget(keep=ds)
+        return ds
+
+    def append_frames(self, name, frames):
+        """
+        Add frames that arrived later for the dataset `name` (a watched
+        folder): extends it in place when it is the last dataset and in
+        memory, otherwise starts another dataset of that name. Returns the
+        Dataset.
+        """
+        frames = list(frames)
+        last = self._datasets[-1] if self._datasets else None
+        if last is None or last.name != name or not last.resident or last.lean != self.lean:
+            return self.add_dataset(name, frames)
+        if self.lean:
+            frames = lean_frames(frames, self.keep)
+        self._discard_spill(last)       # its spill file no longer holds every frame
+        last.frames.extend(frames)
+        last.sizes.extend(frames_bytes(frames))
+        last.last_used = next(self._clock)
+        self._changed()
+        self.enforce_budget(keep=last)
+        return last
+
+    def clear(self):
+        self._datasets.clear()
+        self._starts.clear()
+        if self._spill_dir is not None:
+            self._cleanup()
+            self._spill_dir = self._cleanup = None
+        self._changed()
+
+    def sizes(self):
+        """Bytes of every frame in index order (spilled frames included), without reading anything back."""
+        return [n for ds in self._datasets for n in ds.sizes]
+
+    def resident_bytes(self):
+        return sum(ds.nbytes for ds in self._datasets if ds.resident)
+
+    def total_bytes(self):
+        return sum(ds.nbytes for ds in self._datasets)
+
+    # ---------- lean mode / budget ----------
+    def set_lean(self, lean):
+        """
+        Switch lean mode. Turning it on converts every loaded dataset now
+        (spilled ones are read back first, then the budget applies) and
+        returns the (before, after) total bytes; later loads are stored
+        lean too. Turning it off only affects later loads.
+        """
+        self.lean = lean
+        before = self.total_bytes()
+        if lean:
+            for ds in list(self._datasets):
+                if not ds.lean:
+                    self._frames_of(ds)      # reading back converts it already
+                    if not ds.lean:
+                        self._make_lean(ds)
+            self.enforce_budget()
+        return before, self.total_bytes()
+
+    def set_budget(self, budget):
+        """Limit resident frames to `budget` bytes (None removes the limit)."""
+        self.budget = budget
+        self.enforce_budget()
+
+    def enforce_budget(self, keep=None):
+        """Spill least recently used datasets until the resident bytes fit the budget."""
+        if self.budget is None:
+            return
+        resident = [ds for ds in self._datasets if ds.resident and ds is not keep]
+        resident.sort(key=lambda ds: ds.last_used)
+        used = self.resident_bytes()
+        for ds in resident:
+            if used <= self.budget:
+                break
+            used -= ds.nbytes
+            self._spill(ds)
+
+    # ---------- internals ----------
+    def _changed(self):
+        self.version += 1
+
+    def _make_lean(self, ds):
+        ds.frames = lean_frames(ds.frames, self.keep)
+        ds.sizes = frames_bytes(ds.frames)
+        ds.lean = True
+        self._discard_spill(ds)
+        self._changed()
+
+    def _frames_of(self, ds):
+        ds.last_used = next(self._clock)
+        if ds.frames is None:
+            with perf.span("read back spilled dataset"):
+                with open(ds.spill_path, "rb") as f:
+                    ds.frames = pickle.load(f)
+            if self.lean and not ds.lean:
+                self._make_lean(ds)
+            self._changed()
+            self.enforce_budget(keep=ds)
+        return ds.frames
+
+    def _spill(self, ds):
+        if ds.spill_path is None:
+            if self._spill_dir is None:
+                self._spill_dir = tempfile.mkdtemp(prefix="testbench-spill-")
+                self._cleanup = weakref.finalize(self, shutil.rmtree, self._spill_dir, True)
+            fd, ds.spill_path = tempfile.mkstemp(suffix=".pkl", dir=self._spill_dir)
+            with perf.span("spill dataset"), os.fdopen(fd, "wb") as f:
+                pickle.dump(ds.frames, f, protocol=pickle.HIGHEST_PROTOCOL)
+        # an unchanged dataset keeps its spill file, so spilling it again is free
+        ds.frames = None
+        self._changed()
+
+    def _discard_spill(self, ds):
+        if ds.spill_path is not None:
+            try:
+                os.remove(ds.spill_path)
+            except OSError:
+                pass
+            ds.spill_path = None
@@ -0,0 +1,157 @@
+import tkinter as tk
+from tkinter import messagebox, ttk
+
+from testbench_core import loader
+from testbench_core.memory import MB, figure_bytes
+
+_window = None
+
+
+def _mb(n):
+    return f"{n / MB:.2f}"
+
+
+class MemoryWindow:
+    """
+    Memory held by the loaded data, per data set (folder) and per group,
+    plus the shared CSV cache and the open figures. Controls lean mode and
+    the memory budget of a testbench_core.memory.DatasetFrames.
+
+    `labels()` returns the group label of every frame (parallel to the
+    frames); `figures()` returns {name: Figure} for the figures to count.
+    """
+    POLL_MS = 1000
+
+    def __init__(self, root, frames, labels=None, figures=None):
+        self.frames = frames
+        self.labels = labels
+        self.figures = figures
+        self.top = tk.Toplevel(root)
+        self.top.title("Memory")
+        self.top.geometry("720x480")
+        self.top.protocol("WM_DELETE_WINDOW", self.close)
+
+        controls = ttk.Frame(self.top)
+        controls.pack(fill="x", padx=10, pady=(10, 5))
+        self.lean = tk.BooleanVar(value=frames.lean)
+        ttk.Checkbutton(controls, text="Lean mode", variable=self.lean,
+                        command=self.toggle_lean).pack(side="left")
+        ttk.Label(controls, text="Budget (MB):").pack(side="left", padx=(15, 5))
+        self.budget_entry = ttk.Entry(controls, width=8)
+        if frames.budget is not None:
+            self.budget_entry.insert(0, f"{frames.budget / MB:g}")
+        self.budget_entry.pack(side="left")
+        self.budget_entry.bind("<Return>", lambda e: self.apply_budget())
+        ttk.Button(controls, text="Apply", command=self.apply_budget).pack(side="left", padx=5)
+        ttk.Button(controls, text="Refresh", command=self.refresh).pack(side="right")
+
+        self.report = ttk.Label(self.top, foreground="gray")
+        self.report.pack(fill="x", padx=10)
+
+        frame = ttk.Frame(self.top)
+        frame.pack(fill="both", expand=True, padx=10, pady=(5, 10))
+        self.tree = ttk.Treeview(frame, columns=("files", "mb", "where"))
+        self.tree.heading("#0", text="Data")
+        self.tree.column("#0", width=330)
+        for c, t, w in [("files", "Files", 70), ("mb", "Size (MB)", 100), ("where", "Stored", 150)]:
+            self.tree.heading(c, text=t)
+            self.tree.column(c, width=w, anchor="e")
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.tree.yview)
+        scrollbar.pack(side="right", fill="y")
+        self.tree.configure(yscrollcommand=scrollbar.set)
+
+        self._shown = None
+        self._job = None
+        self._poll()
+
+    # ---------- controls ----------
+    def toggle_lean(self):
+        if self.lean.get():
+            before, after = self.frames.set_lean(True)
+            # the lean copies replace the parsed files; keep only one copy in memory
+            loader.CACHE.clear()
+            saved = 100.0 * (before - after) / before if before else 0.0
+            self.report.configure(text=f"Lean mode: {_mb(before)} MB -> {_mb(after)} MB ({saved:.0f}% smaller)")
+        else:
+            self.frames.set_lean(False)
+            self.report.configure(text="Lean mode off for new data sets; loaded ones stay lean.")
+        self.refresh()
+
+    def apply_budget(self):
+        text = self.budget_entry.get().strip()
+        if not text:
+            self.frames.set_budget(None)
+        else:
+            try:
+                budget = float(text)
+                if budget <= 0:
+                    raise ValueError
+            except ValueError:
+                messagebox.showerror("Invalid Budget", "Enter a positive number of MB, or leave empty for no limit.",
+                                     parent=self.top)
+                return
+            self.frames.set_budget(int(budget * MB))
+        self.refresh()
+
+    # ---------- display ----------
+    def _poll(self):
+        if self.frames.version != self._shown:
+            self.refresh()
+        self._job = self.top.after(self.POLL_MS, self._poll)
+
+    def refresh(self):
+        self._shown = self.frames.version
+        self.tree.delete(*self.tree.get_children())
+        datasets = self.frames.datasets()
+        resident = self.frames.resident_bytes()
+
+        node = self.tree.insert("", "end", text="Data sets", open=True,
+                                values=(len(self.frames), _mb(self.frames.total_bytes()), f"{_mb(resident)} MB in memory"))
+        for ds in datasets:
+            where = "memory" if ds.resident else "disk"
+            if ds.lean:
+                where += ", lean"
+            self.tree.insert(node, "end", text=ds.name, values=(len(ds), _mb(ds.nbytes), where))
+
+        if self.labels is not None:
+            per_group = {}
+            for label, n in zip(self.labels(), self.frames.sizes()):
+                entry = per_group.setdefault(label, [0, 0])
+                entry[0] += 1
+                entry[1] += n
+            node = self.tree.insert("", "end", text="Groups", open=True, values=("", "", ""))
+            for label, (files, n) in per_group.items():
+                self.tree.insert(node, "end", text=str(label), values=(files, _mb(n), ""))
+
+        files, cached = loader.CACHE.memory_usage()
+        self.tree.insert("", "end", text="File cache (parsed CSVs)", values=(files, _mb(cached), "memory"))
+        figure_total = 0
+        if self.figures is not None:
+            node = self.tree.insert("", "end", text="Figures", open=True)
+            for name, fig in self.figures().items():
+                n = figure_bytes(fig)
+                figure_total += n
+                self.tree.insert(node, "end", text=name, values=("", _mb(n), "memory"))
+            self.tree.item(node, values=("", _mb(figure_total), "memory"))
+        self.tree.insert("", "end", text="Total in memory",
+                         values=("", _mb(resident + cached + figure_total), ""))
+
+    def close(self):
+        global _window
+        if self._job is not None:
+            self.top.after_cancel(self._job)
+            self._job = None
+        self.top.destroy()
+        _window = None
+
+
+def show_memory_window(root, frames, labels=None, figures=None):
+    """Open (or raise) the Memory window for `frames` (a DatasetFrames)."""
+    global _window
+    if _window is not None and _window.top.winfo_exists():
+        _window.top.lift()
+        _window.refresh()
+        return _window
+    _window = MemoryWindow(root, frames, labels, figures)
+    return _window
@@ -0,0 +1,252 @@
+"""
+Timing spans around the hot paths: loading, analysis, plot building,
+popup construction and canvas draws.
+
+    @timed()                           # span named module.function
+    def compute_mean_tables(...):
+
+    with span("populate table"):
+        ...
+
+    @timed_action("Plot Parameter")    # a user action: the root of a timing tree
+    def plot_parameter_gui(self):
+
+Recording is off unless enable() is called (or TESTBENCH_PERF=1 is set); a
+decorated call then costs one flag check. Spans opened inside another span
+become its children. Each finished root (usually an action) is kept in a
+short history for the Performance window and, when a log file is set (or
+TESTBENCH_PERF_LOG names one), appended to it as one JSON line.
+
+After attach_tk(root), an action finished on the Tk thread stays open
+until Tk is next idle, so the draw_idle() redraw it scheduled is counted
+in it.
+"""
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+
+HISTORY_SIZE = 200
+
+_enabled = False
+_log_path = None
+_lock = threading.Lock()
+_local = threading.local()
+_history = deque(maxlen=HISTORY_SIZE)
+_version = 0
+_NULL = contextlib.nullcontext()
+
+# Tk integration (attach_tk)
+_idle = None        # root.after_idle
+_tk_thread = None
+_lingering = None   # finished action still collecting idle-time spans
+
+
+class Span:
+    __slots__ = ("name", "wall", "start", "ms", "children", "thread")
+
+    def __init__(self, name):
+        self.name = name
+        self.children = []
+        self.ms = 0.0
+        self.thread = threading.current_thread().name
+
+    def to_dict(self):
+        d = {"name": self.name, "ms": round(self.ms, 3)}
+        if self.children:
+            d["children"] = [c.to_dict() for c in self.children]
+        return d
+
+
+def _stack():
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+class _Recorder:
+    __slots__ = ("span", "action", "root")
+
+    def __init__(self, name, action=False):
+        self.span = Span(name)
+        self.action = action
+        self.root = False
+
+    def __enter__(self):
+        stack = _stack()
+        on_tk = _tk_thread is not None and threading.current_thread() is _tk_thread
+        if stack:
+            stack[-1].children.append(self.span)
+        elif on_tk and _lingering is not None and not self.action:
+            _lingering.children.append(self.span)
+        else:
+            if on_tk and _lingering is not None:
+                _finish_lingering()
+            self.root = True
+        stack.append(self.span)
+        self.span.wall = time.time()
+        self.span.start = time.perf_counter()
+        return self.span
+
+    def __exit__(self, *exc):
+        span = self.span
+        span.ms = (time.perf_counter() - span.start) * 1000.0
+        _stack().pop()
+        if self.root:
+            if self.action and _idle is not None and threading.current_thread() is _tk_thread:
+                _linger(span)
+            else:
+                _publish(span)
+        return False
+
+
+def _linger(span):
+    global _lingering
+    _lingering = span
+    try:
+        _idle(functools.partial(_finish_lingering, span))
+    except Exception:  # root already destroyed
+        _finish_lingering(span)
+
+
+def _finish_lingering(span=None):
+    global _lingering
+    current = _lingering
+    if current is None or (span is not None and current is not span):
+        return
+    _lingering = None
+    current.ms = (time.perf_counter() - current.start) * 1000.0
+    _publish(current)
+
+
+def _publish(span):
+    global _version
+    record = span.to_dict()
+    record["start"] = round(span.wall, 3)
+    record["thread"] = span.thread
+    record["pid"] = os.getpid()
+    with _lock:
+        _history.append(record)
+        _version += 1
+        path = _log_path
+    if path:
+        try:
+            with open(path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        except OSError:
+            pass
+
+
+# ---------- public API ----------
+def span(name):
+    """Context manager timing a block as a child of the enclosing span."""
+    return _Recorder(name) if _enabled else _NULL
+
+
+def action(name):
+    """Context manager for one user action (a button click); the root of a timing tree."""
+    return _Recorder(name, action=True) if _enabled else _NULL
+
+
+def timed(name=None):
+    """Decorator: time every call as a span (default name module.function)."""
+    def decorate(fn):
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Recorder(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def timed_action(name):
+    """Decorator for GUI handlers: time every call as a user action."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fn(*args, **kwargs)
+            with _Recorder(name, action=True):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def instrument_canvas(canvas, name="canvas.draw"):
+    """Time every draw of a matplotlib canvas, including idle redraws. Returns the canvas."""
+    draw = canvas.draw
+
+    @functools.wraps(draw)
+    def timed_draw(*args, **kwargs):
+        if not _enabled:
+            return draw(*args, **kwargs)
+        with _Recorder(name):
+            return draw(*args, **kwargs)
+
+    canvas.draw = timed_draw
+    return canvas
+
+
+def attach_tk(root):
+    """Let actions on the Tk thread include the redraws they schedule with draw_idle()."""
+    global _idle, _tk_thread
+    _idle = root.after_idle
+    _tk_thread = threading.current_thread()
+
+
+def enabled():
+    return _enabled
+
+
+def enable(log_path=None):
+    global _enabled
+    if log_path is not None:
+        set_log(log_path)
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+    _finish_lingering()
+
+
+def set_log(path):
+    """Append finished actions to `path` as JSON lines; None stops logging."""
+    global _log_path
+    with _lock:
+        _log_path = path or None
+
+
+def log_path():
+    return _log_path
+
+
+def history():
+    """Finished root records, oldest first."""
+    with _lock:
+        return list(_history)
+
+
+def version():
+    """Changes whenever a record is added or the history is cleared."""
+    return _version
+
+
+def clear():
+    global _version
+    with _lock:
+        _history.clear()
+        _version += 1
+
+
+if os.environ.get("TESTBENCH_PERF") or os.environ.get("TESTBENCH_PERF_LOG"):
+    enable(os.environ.get("TESTBENCH_PERF_LOG"))
@@ -0,0 +1,136 @@
+import os
+import time
+import tkinter as tk
+from tkinter import filedialog, ttk
+
+from testbench_core import perf
+
+_window = None
+
+
+class PerformanceWindow:
+    """
+    Per-action timing breakdown from testbench_core.perf, newest first.
+    Repeated calls of the same span under one parent are merged into a
+    single row with a call count; "(untimed)" is the part of a span not
+    covered by its children (widget creation, Tk work, ...).
+    """
+    POLL_MS = 300
+
+    def __init__(self, root):
+        self.top = tk.Toplevel(root)
+        self.top.title("Performance")
+        self.top.geometry("820x480")
+        self.top.protocol("WM_DELETE_WINDOW", self.close)
+
+        controls = ttk.Frame(self.top)
+        controls.pack(fill="x", padx=10, pady=(10, 5))
+        self.recording = tk.BooleanVar(value=perf.enabled())
+        ttk.Checkbutton(controls, text="Record timings", variable=self.recording,
+                        command=self.toggle_recording).pack(side="left")
+        ttk.Button(controls, text="Clear", command=perf.clear).pack(side="left", padx=10)
+        self.log_button = ttk.Button(controls, command=self.toggle_log)
+        self.log_button.pack(side="left")
+        self.log_label = ttk.Label(controls, foreground="gray")
+        self.log_label.pack(side="left", padx=10)
+
+        frame = ttk.Frame(self.top)
+        frame.pack(fill="both", expand=True, padx=10, pady=(0, 10))
+        self.tree = ttk.Treeview(frame, columns=("ms", "share", "calls"))
+        self.tree.heading("#0", text="Action / Span")
+        self.tree.column("#0", width=480)
+        for c, t, w in [("ms", "Time (ms)", 110), ("share", "% of Action", 100), ("calls", "Calls", 70)]:
+            self.tree.heading(c, text=t)
+            self.tree.column(c, width=w, anchor="e")
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar = ttk.Scrollbar(frame, orient="vertical", command=self.tree.yview)
+        scrollbar.pack(side="right", fill="y")
+        self.tree.configure(yscrollcommand=scrollbar.set)
+
+        self._shown = None
+        self._job = None
+        self._update_log_controls()
+        self._poll()
+
+    # ---------- controls ----------
+    def toggle_recording(self):
+        if self.recording.get():
+            perf.enable()
+        else:
+            perf.disable()
+
+    def toggle_log(self):
+        if perf.log_path():
+            perf.set_log(None)
+        else:
+            path = filedialog.asksaveasfilename(
+                parent=self.top, title="Log Timings To",
+                defaultextension=".jsonl", filetypes=[("JSON lines", "*.jsonl"), ("All files", "*.*")]
+            )
+            if path:
+                perf.set_log(path)
+        self._update_log_controls()
+
+    def _update_log_controls(self):
+        path = perf.log_path()
+        self.log_button.configure(text="Stop Logging" if path else "Log to File...")
+        self.log_label.configure(text=os.path.basename(path) if path else "")
+
+    # ---------- display ----------
+    def _poll(self):
+        if perf.version() != self._shown:
+            self.refresh()
+        self._job = self.top.after(self.POLL_MS, self._poll)
+
+    def refresh(self):
+        self._shown = perf.version()
+        self.tree.delete(*self.tree.get_children())
+        records = perf.history()
+        for n, record in enumerate(reversed(records)):
+            stamp = time.strftime("%H:%M:%S", time.localtime(record["start"]))
+            item = self.tree.insert(
+                "", "end", text=f"{stamp}  {record['name']}",
+                values=(f"{record['ms']:.1f}", "100.0", 1), open=(n == 0)
+            )
+            self._insert_children(item, record, record["ms"])
+
+    def _insert_children(self, parent, record, action_ms):
+        children = record.get("children")
+        if not children:
+            return
+        merged = {}  # name -> [ms, calls, grandchildren]
+        for child in children:
+            entry = merged.setdefault(child["name"], [0.0, 0, []])
+            entry[0] += child["ms"]
+            entry[1] += 1
+            entry[2].extend(child.get("children", []))
+        for name, (ms, calls, grandchildren) in sorted(merged.items(), key=lambda kv: -kv[1][0]):
+            item = self.tree.insert(parent, "end", text=name, values=(f"{ms:.1f}", _share(ms, action_ms), calls))
+            self._insert_children(item, {"ms": ms, "children": grandchildren}, action_ms)
+        untimed = record["ms"] - sum(c["ms"] for c in children)
+        if untimed >= 0.05:
+            self.tree.insert(parent, "end", text="(untimed)", values=(f"{untimed:.1f}", _share(untimed, action_ms), ""))
+
+    def close(self):
+        global _window
+        if self._job is not None:
+            self.top.after_cancel(self._job)
+            self._job = None
+        self.top.destroy()
+        _window = None
+
+
+def _share(ms, total):
+    return f"{100.0 * ms / total:.1f}" if total else ""
+
+
+def show_performance_window(root):
+    """Open (or raise) the Performance window; opening it turns recording on."""
+    global _window
+    perf.enable()
+    if _window is not None and _window.top.winfo_exists():
+        _window.recording.set(True)
+        _window.top.lift()
+        return _window
+    _window = PerformanceWindow(root)
+    return _window
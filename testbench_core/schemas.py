@@ -0,0 +1,125 @@
+import numpy as np
+
+from testbench_core.lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+# Columns an electrical / OES summary CSV must have to be loaded by the
+# Data Visualization and Parameter Sweep apps (exact names).
+ELECTRICAL_COLUMNS = frozenset(["Order Parameter", "Mean", "%CV", "Min", "Max"])
+OES_COLUMNS = frozenset(["wavelength_index", "mean", "std_dev", "cv_percent"])
+
+# Canonical statistic order of the typed arrays built below.
+ELECTRICAL_STATS = ["Mean", "%CV", "Min", "Max"]
+OES_STATS = ["mean", "std_dev", "cv_percent"]
+
+
+def has_columns(columns, required):
+    return set(required).issubset(columns)
+
+
+def clean_oes_frame(df):
+    """
+    New frame with a numeric wavelength_index and unparsable rows dropped;
+    `df` itself is left alone (it may be shared through the loader cache).
+    """
+    df = df.assign(wavelength_index=pd.to_numeric(df['wavelength_index'], errors='coerce'))
+    return df.dropna(subset=['wavelength_index'])
+
+
+# ---------- lenient detection (Optimal Settings Finder) ----------
+def is_electrical_df(df):
+    cols = [c.strip().lower() for c in df.columns]
+    return ("order parameter" in cols) and ("mean" in cols)
+
+
+def is_oes_df(df):
+    cols = [c.strip().lower() for c in df.columns]
+    return (
+        ("wavelength_index" in cols)
+        or ("wavelength index" in cols)
+        or (len(df.columns) >= 1)
+    ) and ("mean" in cols)
+
+
+def _find_col(cols_map, possible):
+    for n in possible:
+        if n in cols_map:
+            return cols_map[n]
+    return None
+
+
+def _numeric_columns(df, cols):
+    return np.column_stack([
+        pd.to_numeric(df[c], errors="coerce").to_numpy(dtype=float) if c else np.full(len(df), np.nan)
+        for c in cols
+    ])
+
+
+def canonicalize_electrical(df):
+    """
+    Canonical typed arrays for an electrical summary CSV:
+        (order_params, values) with values[:, j] holding ELECTRICAL_STATS[j].
+    Returns None when there is no Order Parameter column.
+    """
+    cols_map = {c.strip().lower(): c for c in df.columns}
+    if "order parameter" not in cols_map:
+        return None
+    order_params = df[cols_map["order parameter"]].astype(str).to_numpy()
+    values = _numeric_columns(df, [
+        _find_col(cols_map, ["mean"]),
+        _find_col(cols_map, ["%cv", "cv", "cv_percent", "cv percent"]),
+        _find_col(cols_map, ["min"]),
+        _find_col(cols_map, ["max"]),
+    ])
+    return order_params, values
+
+
+def oes_index_column(df):
+    """Name of the wavelength index column (first column if none is named so)."""
+    cols_map = {c.strip().lower(): c for c in df.columns}
+    return _find_col(cols_map, ["wavelength_index", "wavelength index"]) or df.columns[0]
+
+
+def canonicalize_oes(df):
+    """
+    Canonical typed arrays for an OES summary CSV:
+        (wavelength_index, values) with values[:, j] holding OES_STATS[j].
+    """
+    cols_map = {c.strip().lower(): c for c in df.columns}
+    idx_col = oes_index_column(df)
+    try:
+        wavelengths = df[idx_col].astype(int).to_numpy()
+    except Exception:
+        wavelengths = np.arange(len(df))
+    values = _numeric_columns(df, [
+        _find_col(cols_map, ["mean"]),
+        _find_col(cols_map, ["std_dev", "std dev", "std"]),
+        _find_col(cols_map, ["cv_percent", "cv percent", "cv"]),
+    ])
+    return wavelengths, values
+
+
+# ---------- per-file rows for streaming group statistics (streaming.GroupStats) ----------
+def electrical_stat_rows(df):
+    """
+    (order parameters, rows of ELECTRICAL_STATS) of one loaded electrical
+    file, as the Electrical DV analyses read it; rows without an order
+    parameter are left out.
+    """
+    params = df["Order Parameter"]
+    present = params.notna().to_numpy()
+    values = df[ELECTRICAL_STATS].to_numpy(dtype=float)[present]
+    return params[present].tolist(), values
+
+
+def oes_stat_rows(df):
+    """
+    (wavelength indices, rows of OES_STATS + [mean / file total]) of one
+    cleaned OES file; the last column is the normalized intensity the
+    OES DV analyses use.
+    """
+    values = df[OES_STATS].to_numpy(dtype=float)
+    total = np.nansum(values[:, 0])
+    normalized = values[:, 0] / total if total != 0 else np.zeros(len(values))
+    return df["wavelength_index"].tolist(), np.column_stack([values, normalized])
@@ -0,0 +1,62 @@
+import numpy as np
+
+
+def nearest_rows(wavelengths, targets):
+    """
+    Row position in `wavelengths` nearest to each value of `targets`.
+    Ties and duplicate wavelengths resolve to the earliest row, like idxmin().
+    """
+    wavelengths = np.asarray(wavelengths, dtype=float)
+    targets = np.asarray(targets, dtype=float)
+    order = np.argsort(wavelengths, kind="stable")
+    ordered = wavelengths[order]
+    right = np.clip(np.searchsorted(ordered, targets, side="left"), 0, len(ordered) - 1)
+    left = np.clip(right - 1, 0, len(ordered) - 1)
+    # first row holding each neighbour's value (duplicates keep row order)
+    right = np.searchsorted(ordered, ordered[right], side="left")
+    left = np.searchsorted(ordered, ordered[left], side="left")
+    d_left = np.abs(ordered[left] - targets)
+    d_right = np.abs(ordered[right] - targets)
+    use_left = (d_left < d_right) | ((d_left == d_right) & (order[left] < order[right]))
+    return order[np.where(use_left, left, right)]
+
+
+class FileStats:
+    """
+    Lazily filled statistics for one loaded file: the spectrum as a float array,
+    whole-spectrum moments per column and a nearest-row map per queried wavelength.
+    """
+    COLUMNS = ["mean", "std_dev", "cv_percent"]
+
+    def __init__(self, df):
+        self.wavelengths = df["wavelength_index"].to_numpy(dtype=float)
+        self.values = df[self.COLUMNS].to_numpy(dtype=float)
+        self._nearest = {}
+        self._moments = None
+
+    def nearest_row(self, wl):
+        row = self._nearest.get(wl)
+        if row is None:
+            row = self._nearest[wl] = int(nearest_rows(self.wavelengths, [wl])[0])
+        return row
+
+    def value(self, row, column):
+        return self.values[row, self.COLUMNS.index(column)]
+
+    def moments(self):
+        """column -> (count, mean, sample std), NaNs skipped like DataFrame.std()."""
+        if self._moments is None:
+            valid = ~np.isnan(self.values)
+            n = valid.sum(axis=0)
+            filled = np.where(valid, self.values, 0.0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                mean = filled.sum(axis=0) / n
+                ss = (np.where(valid, self.values - mean, 0.0) ** 2).sum(axis=0)
+                std = np.where(n > 1, np.sqrt(ss / (n - 1)), np.nan)
+            self._moments = {
+                col: (int(n[c]), float(mean[c]), float(std[c])) for c, col in enumerate(self.COLUMNS)
+            }
+        return self._moments
+
+    def std(self, column):
+        return self.moments()[column][2]
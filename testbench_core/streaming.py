@@ -0,0 +1,181 @@
+"""
+Streaming group statistics, updated one file at a time.
+
+RunningStats keeps, per key (order parameter, wavelength index, ...) and
+value column, a Welford count / mean / M2 and the first, last, min and
+max of each file's first row for the key. GroupStats holds one per group
+and stays in step with an app's frames: add() every new file, rebuild()
+after files change group. Adding a file costs the same however many
+files came before it.
+
+NaN values propagate as in np.mean / np.std over the same values, so the
+results match recomputing from the files.
+"""
+import numpy as np
+
+
+class RunningStats:
+    """Welford statistics per key and column; keys are added as files bring them."""
+
+    def __init__(self, n_columns):
+        self.n_columns = n_columns
+        self.index = {}         # key -> row
+        self.files = 0
+        self._size = 0
+        self._last_keys = self._last_rows = None
+        self._allocate(16)
+
+    def _allocate(self, capacity):
+        shape = (capacity, self.n_columns)
+        old = self._size
+
+        def grow(name, fill, dtype=float, columns=True):
+            array = np.full(shape if columns else capacity, fill, dtype=dtype)
+            if old:
+                array[:old] = getattr(self, name)[:old]
+            setattr(self, name, array)
+
+        grow("n", 0, np.int64, columns=False)          # values per key
+        grow("n_files", 0, np.int64, columns=False)    # files having the key
+        grow("mean", 0.0)
+        grow("m2", 0.0)
+        for name in ("first", "last", "min", "max"):
+            grow(name, np.nan)
+
+    def _row(self, key):
+        row = self.index.get(key)
+        if row is None:
+            if self._size == len(self.n):
+                self._allocate(2 * self._size)
+            row = self.index[key] = self._size
+            self._size += 1
+        return row
+
+    def keys(self):
+        """Keys in the order they were first seen."""
+        return list(self.index)
+
+    # ---------- updates ----------
+    def add_file(self, keys, values, duplicates=True):
+        """
+        Add one file: `keys[i]` labels row `values[i]`. The first row of
+        each key feeds every statistic; further rows with the same key
+        feed count / mean / variance only when `duplicates` is true.
+        """
+        keys = list(keys)
+        values = np.asarray(values, dtype=float).reshape(len(keys), self.n_columns)
+        if keys == self._last_keys:
+            rows, first = self._last_rows     # files of a run share one key list (wavelength grid)
+        else:
+            rows = np.fromiter((self._row(k) for k in keys), dtype=np.int64, count=len(keys))
+            _, first = np.unique(rows, return_index=True)
+            first.sort()
+            self._last_keys, self._last_rows = keys, (rows, first)
+        self._update(rows[first], values[first], extremes=True)
+        if duplicates and len(first) < len(rows):
+            rest = np.setdiff1d(np.arange(len(rows)), first)
+            while rest.size:
+                _, idx = np.unique(rows[rest], return_index=True)
+                take = rest[np.sort(idx)]
+                self._update(rows[take], values[take], extremes=False)
+                rest = np.setdiff1d(rest, take)
+        self.files += 1
+
+    def _update(self, rows, x, extremes):
+        n = self.n[rows] + 1
+        self.n[rows] = n
+        mean = self.mean[rows]
+        delta = x - mean
+        mean += delta / n[:, None]
+        self.mean[rows] = mean
+        self.m2[rows] += delta * (x - mean)
+        if extremes:
+            new = (self.n_files[rows] == 0)[:, None]
+            self.n_files[rows] += 1
+            self.first[rows] = np.where(new, x, self.first[rows])
+            self.last[rows] = x
+            self.min[rows] = np.where(new, x, np.minimum(self.min[rows], x))
+            self.max[rows] = np.where(new, x, np.maximum(self.max[rows], x))
+
+    # ---------- queries (one row per requested key, NaN / 0 for unseen keys) ----------
+    def _take(self, array, keys, fill=np.nan):
+        rows = np.fromiter((self.index.get(k, -1) for k in keys), dtype=np.int64, count=len(keys))
+        out = np.full((len(keys),) + array.shape[1:], fill, dtype=array.dtype)
+        seen = rows >= 0
+        out[seen] = array[rows[seen]]
+        return out
+
+    def count(self, keys):
+        return self._take(self.n, keys, 0)
+
+    def file_count(self, keys):
+        return self._take(self.n_files, keys, 0)
+
+    def get_mean(self, keys):
+        mean = self._take(self.mean, keys)
+        mean[self.count(keys) == 0] = np.nan
+        return mean
+
+    def get_std(self, keys, ddof=0):
+        dof = (self.count(keys) - ddof)[:, None]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            std = np.sqrt(np.maximum(self._take(self.m2, keys), 0.0) / dof)
+        return np.where(dof > 0, std, np.nan)
+
+    def get_first(self, keys):
+        return self._take(self.first, keys)
+
+    def get_last(self, keys):
+        return self._take(self.last, keys)
+
+    def get_min(self, keys):
+        return self._take(self.min, keys)
+
+    def get_max(self, keys):
+        return self._take(self.max, keys)
+
+
+class GroupStats:
+    """
+    RunningStats per group for one app. `extract(df)` returns the (keys,
+    values) of one file, values with `n_columns` columns.
+    """
+
+    def __init__(self, extract, n_columns, duplicates=True):
+        self.extract = extract
+        self.n_columns = n_columns
+        self.duplicates = duplicates
+        self._groups = {}
+
+    def clear(self):
+        self._groups = {}
+
+    def add(self, df, group):
+        stats = self._groups.get(group)
+        if stats is None:
+            stats = self._groups[group] = RunningStats(self.n_columns)
+        keys, values = self.extract(df)
+        stats.add_file(keys, values, self.duplicates)
+
+    def rebuild(self, frames, groups):
+        """Start over from every file; needed when files move between groups."""
+        self.clear()
+        for df, group in zip(frames, groups):
+            self.add(df, group)
+
+    def groups(self):
+        return sorted(self._groups)
+
+    def __getitem__(self, group):
+        stats = self._groups.get(group)
+        return stats if stats is not None else RunningStats(self.n_columns)
+
+    def __contains__(self, group):
+        return group in self._groups
+
+    def keys(self):
+        """Every key seen in any group, in first-seen order."""
+        keys = {}
+        for stats in self._groups.values():
+            keys.update(dict.fromkeys(stats.index))
+        return list(keys)
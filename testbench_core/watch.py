@@ -0,0 +1,150 @@
+"""
+Watch loaded folders for CSV files that appear during a run.
+
+FolderWatcher polls each watched folder's modification time and lists the
+folder only when that changed (and every `rescan_every` polls regardless,
+for file systems such as some network shares whose folder times are
+coarse or not updated). A new file is reported once its size and
+modification time are unchanged between two polls, so a file that is
+still being written is not read half-way. A poll that finds nothing new
+stats one path per watched folder and per unsettled file, however many
+files have been loaded.
+
+    watcher = FolderWatcher()
+    watcher.watch(folder, known=loaded_names)      # names already read
+    watcher.start(root, on_new, interval_ms=2000)  # on_new({folder: [path, ...]})
+    watcher.stop()
+"""
+import os
+
+from testbench_core.loader import file_signature
+
+DEFAULT_INTERVAL_MS = 2000
+
+
+class _Folder:
+    __slots__ = ("mtime", "known", "pending")
+
+    def __init__(self, known):
+        self.mtime = None           # None: list on the next poll
+        self.known = set(known)     # file names read (or skipped) already
+        self.pending = {}           # new file name -> signature at the last poll
+
+
+class FolderWatcher:
+    """Polls folders for new CSV files, on demand (poll()) or on a Tk event loop (start())."""
+
+    def __init__(self, rescan_every=30):
+        self.rescan_every = rescan_every
+        self.interval_ms = DEFAULT_INTERVAL_MS
+        self._folders = {}
+        self._polls = 0
+        self._widget = None
+        self._callback = None
+        self._job = None
+
+    # ---------- folders ----------
+    def watch(self, folder, known=()):
+        """Watch `folder`; `known` are the names of the files already read from it."""
+        entry = self._folders.get(folder)
+        if entry is None:
+            self._folders[folder] = _Folder(known)
+        else:
+            entry.known.update(known)
+
+    def unwatch(self, folder):
+        self._folders.pop(folder, None)
+
+    def clear(self):
+        self._folders.clear()
+
+    def folders(self):
+        return list(self._folders)
+
+    def pending(self):
+        """Number of new files still waiting to settle."""
+        return sum(len(entry.pending) for entry in self._folders.values())
+
+    # ---------- polling ----------
+    def poll(self):
+        """{folder: [paths of new, settled CSV files]} found since the last poll."""
+        self._polls += 1
+        rescan = self.rescan_every and self._polls % self.rescan_every == 0
+        ready = {}
+        for folder, entry in self._folders.items():
+            try:
+                mtime = os.stat(folder).st_mtime_ns
+            except OSError:
+                continue    # unreachable for now (unplugged drive, network share); retried next poll
+            listed = set()
+            if mtime != entry.mtime or rescan:
+                entry.mtime = mtime
+                listed = self._list_new(folder, entry)
+            settled = []
+            for name, sig in list(entry.pending.items()):
+                if name in listed:
+                    continue    # first seen just now; must look the same next poll
+                try:
+                    now = file_signature(os.path.join(folder, name))
+                except OSError:
+                    del entry.pending[name]     # gone again before it settled
+                    continue
+                if now == sig and now[1] > 0:
+                    settled.append(name)
+                else:
+                    entry.pending[name] = now
+            if settled:
+                settled.sort()      # test bench file names start with a timestamp
+                for name in settled:
+                    del entry.pending[name]
+                    entry.known.add(name)
+                ready[folder] = [os.path.join(folder, name) for name in settled]
+        return ready
+
+    def _list_new(self, folder, entry):
+        new = set()
+        try:
+            with os.scandir(folder) as it:
+                for e in it:
+                    name = e.name
+                    if (name.lower().endswith(".csv") and name not in entry.known
+                            and name not in entry.pending):
+                        try:
+                            st = e.stat()
+                        except OSError:
+                            continue
+                        entry.pending[name] = (st.st_mtime_ns, st.st_size)
+                        new.add(name)
+        except OSError:
+            entry.mtime = None
+        return new
+
+    # ---------- Tk event loop ----------
+    @property
+    def running(self):
+        return self._widget is not None
+
+    def start(self, widget, on_new, interval_ms=DEFAULT_INTERVAL_MS):
+        """Poll every `interval_ms` with `widget`.after(), calling on_new(ready) when files settle."""
+        self.stop()
+        self._widget, self._callback, self.interval_ms = widget, on_new, interval_ms
+        self._job = widget.after(interval_ms, self._tick)
+
+    def stop(self):
+        if self._job is not None:
+            try:
+                self._widget.after_cancel(self._job)
+            except Exception:
+                pass    # widget already destroyed
+        self._widget = self._callback = self._job = None
+
+    def _tick(self):
+        self._job = None
+        try:
+            ready = self.poll()
+            if ready:
+                self._callback(ready)
+        finally:
+            # the callback may have stopped (or restarted) the watch
+            if self._widget is not None and self._job is None:
+                self._job = self._widget.after(self.interval_ms, self._tick)